@@ -1,290 +1,182 @@
 import streamlit as st
 import os
-import requests # Backend iletişimleri ve görsel indirme için
+import requests # Paylaşım linkleri ve HTTP istisnaları için
 import json
-import base64
-from PIL import Image
-from io import BytesIO
-from urllib.parse import urlparse, parse_qs # URL'leri ayrıştırmak için
-
-# AI API'leri için doğrudan import'lar
-import google.generativeai as genai
-from openai import OpenAI
-from dotenv import load_dotenv
-
-# --- API Anahtarlarını Yapılandırma ---
-# Streamlit Cloud'da 'Secrets' kullanarak veya yerel ortam değişkenleri (.env ile)
-# Önemli: Bu anahtarları doğrudan GitHub'a YÜKLEMEYİN!
+import functools
+import logging
+import uuid
+import time
+from datetime import datetime
+
+from streamlit.runtime.scriptrunner_utils.script_run_context import RunLocation, ThreadState
+
+from generation import (
+    LANGUAGE_OPTIONS, PLATFORM_OPTIONS, TEXT_MODEL_NAME, find_similar_generation,
+    format_text_for_all_platforms, format_text_for_social_media, generate_image_dalle,
+    generate_text_gemini_flash, generate_text_multilanguage, generate_youtube_idea_gemini,
+    get_asset_store, get_content_archive, get_generation_cache, get_model_registry, get_rendition_pipeline, get_text_router, get_token_usage_log,
+    interpret_prepared_image, prepare_image, warm_up_models, stream_format_text_for_social_media,
+    stream_text_gemini_flash, stream_youtube_idea_gemini,
+)
+from http_client import get_http_client
+from instrumentation import get_call_metrics, instrument, start_metrics_server
+from rate_limiter import all_rate_limiter_stats
+from stats_store import StatsRefresher, StatsStore, TRACKED_METRICS
+from video_jobs import VideoJobPoller, VideoJobRegistry, TERMINAL_STATUSES, FAILED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# --- İçerik Üretimi ---
+# Üretim fonksiyonları, model kaydı ve önbellek generation.py'dedir (Streamlit'ten bağımsız; toplu
+# üretim için bkz. batch_cli.py). Anahtarlar bir kez okunur; ortamda yoksa st.secrets denenir.
+# Sağlayıcı SDK'ları ve anahtar doğrulaması, ilgili bölüm ilk kez kullanıldığında yapılır.
 try:
-    # Yerel çalıştırmalar için .env dosyasını yükle
-    load_dotenv() 
-
-    # Ortam değişkenlerinden oku (hem yerel .env hem de sistem ortam değişkenleri)
-    GEMINI_API_KEY = os.environ.get("GOOGLE_API_KEY")
-    OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-    
-    # Eğer Streamlit Cloud'da çalışıyorsak ve ortam değişkenleri ayarlı değilse st.secrets'ı dene
-    if not GEMINI_API_KEY and "GOOGLE_API_KEY" in st.secrets:
-        GEMINI_API_KEY = st.secrets["GOOGLE_API_KEY"]
-    if not OPENAI_API_KEY and "OPENAI_API_KEY" in st.secrets:
-        OPENAI_API_KEY = st.secrets["OPENAI_API_KEY"]
-
-    if not GEMINI_API_KEY:
-        st.error("Gemini API anahtarı bulunamadı. Lütfen 'GOOGLE_API_KEY' ortam değişkenini veya Streamlit Secrets'ı ayarlayın.")
-        st.stop() # Anahtar yoksa uygulamayı durdur
-
-    if not OPENAI_API_KEY:
-        st.error("OpenAI API anahtarı bulunamadı. Lütfen 'OPENAI_API_KEY' ortam değişkenini veya Streamlit Secrets'ı ayarlayın.")
-        st.stop() # Anahtar yoksa uygulamayı durdur
-            
-    genai.configure(api_key=GEMINI_API_KEY)
-    openai_client = OpenAI(api_key=OPENAI_API_KEY)
-    
+    model_registry = get_model_registry(secrets=st.secrets)
 except Exception as e:
-    st.error(f"API anahtarları yapılandırılamadı: {e}. Lütfen anahtarlarınızı kontrol edin.")
-    st.stop()
-
-# --- Şirket Bilgileri (AI'ya sürekli anımsatılacak) ---
-COMPANY_INFO_CONTEXT = """
-Şirket Adı: Premium Home
-Ana Faaliyet Alanları: Metal evler, prefabrik yapılar, Tiny House üretimi ve inşaatı, nanoteknoloji zemin ısıtma sistemleri. Anahtar teslim çözümler sunar.
-Misyon: Yenilikçi, sürdürülebilir, modern ve uygun fiyatlı yaşam/çalışma alanları sunmak.
-Hedef Kitle: Metal ev ve prefabrik yapılarla ilgilenen, Tiny House kültürünü benimsemek isteyen, Avrupa bölgelerinde bulunan kişiler ve profesyoneller.
-"""
-
-COMPANY_SOCIAL_PRESENCE_CONTEXT = """
-Web Sitesi: https://www.premiumpluscy.eu
-Katalog Sitesi: https://linktr.ee/premiumplushome
-Instagram Hesabı: https://www.instagram.com/premiumplushome
-Facebook Sayfası: https://www.facebook.com/PremiumPlusHomeCyprus
-LinkedIn Sayfası: https://www.linkedin.com/company/premium-home-ltd
-"""
+    # secrets.toml yoksa veya okunamıyorsa yalnızca ortam değişkenleri kullanılır
+    logger.warning("Streamlit Secrets okunamadı: %s", e)
+    model_registry = get_model_registry()
 
-# --- Backend API URL'si ---
-BACKEND_API_URL = "https://premium-home-social-api.onrender.com" # KENDİ RENDER URL'NİZİ BURAYA YAPIŞTIRIN!
-
-# --- AI Metin Üretme Fonksiyonu (Gemini Flash) ---
-@st.cache_data # Bu dekoratör fonksiyon çıktısını önbelleğe alır
-def generate_text_gemini_flash(prompt_text, target_language="Türkçe"):
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    # Şirket bilgilerini prompt'a ekle
-    full_prompt = (
-        f"{COMPANY_INFO_CONTEXT}\n\n"
-        f"Yukarıdaki şirket bilgilerini ve faaliyet alanlarını göz önünde bulundurarak, şu içerik isteğini tamamla: "
-        f"'{prompt_text}'. Lütfen çıktıyı {target_language} dilinde oluştur."
-    )
-    try:
-        response = model.generate_content(full_prompt)
-        if response and response.text:
-            return response.text
-        else:
-            return "Yanıt alınamadı veya boş. Lütfen prompt'u kontrol edin."
-    except Exception as e:
-        error_msg = str(e)
-        if "quota" in error_msg.lower() or "429" in error_msg or "TooManyRequests" in error_msg:
-            return f"Hata: Kota aşımı! Lütfen daha sonra tekrar deneyin veya kota durumunuzu kontrol edin. Detay: {e}"
-        elif "api key not valid" in error_msg.lower() or "authentication error" in error_msg.lower():
-            return "Hata: Gemini API anahtarı geçersiz veya yetkilendirme hatası. Lütfen anahtarınızı kontrol edin."
-        else:
-            return f"Hata: API Hatası: {e}"
-
-# --- AI Görsel Yorumlama Fonksiyonu (Gemini Vision) ---
-@st.cache_data(hash_funcs={Image.Image: lambda _: None}) # PIL Image objesi için özel hash fonksiyonu
-def interpret_image_gemini_vision(pil_image_object, prompt_text="Bu resimde ne görüyorsun?"):
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    try:
-        contents = [prompt_text, pil_image_object]
-        response = model.generate_content(contents)
-        if response and response.text:
-            return response.text
-        else:
-            return "Görsel yorumu alınamadı veya boş."
-    except Exception as e:
-        error_msg = str(e)
-        if "quota" in error_msg.lower() or "429" in error_msg or "TooManyRequests" in error_msg:
-            return f"Hata: Görsel yorumlama kota aşımı! Lütfen daha sonra tekrar deneyin. Detay: {e}"
-        elif "api key not valid" in error_msg.lower() or "authentication error" in error_msg.lower():
-            return "Hata: Gemini API anahtarı geçersiz veya yetkilendirme hatası. Lütfen anahtarınızı kontrol edin."
-        else:
-            return f"Hata: Görsel yorumlama hatası: {e}"
-
-# --- AI Görsel Oluşturma Fonksiyonu (DALL-E 3) ---
-def generate_image_dalle(image_prompt_text):
-    global openai_client
-    if not openai_client:
-        return "Hata: OpenAI istemcisi başlatılamadı."
-    
-    full_image_prompt = (
-        f"{COMPANY_INFO_CONTEXT}\n\n"
-        f"Yukarıdaki şirket bilgilerini ve faaliyet alanlarını göz önünde bulundurarak, şu görseli oluştur: "
-        f"'{image_prompt_text}'. Lütfen modern, profesyonel ve yüksek çözünürlüklü bir stil kullan."
-    )
-    try:
-        response = openai_client.images.generate(
-            model="dall-e-3",
-            prompt=full_image_prompt,
-            n=1,
-            size="1024x1024"
-        )
-        if response and response.data and response.data[0].url:
-            image_url = response.data[0].url
-            img_data = requests.get(image_url).content
-            return base64.b64encode(img_data).decode('utf-8')
-        else:
-            return "Görsel oluşturulamadı veya URL bulunamadı."
-    except Exception as e:
-        error_msg = str(e)
-        if "quota" in error_msg.lower() or "429" in error_msg or "TooManyRequests" in error_msg or "billing_not_active" in error_msg.lower() or "insufficient_quota" in error_msg.lower():
-            return f"Hata: Görsel oluşturma kota/ödeme hatası! Lütfen OpenAI hesabınızdaki DALL-E faturalandırmasını kontrol edin. Detay: {e}"
-        elif "authentication error" in error_msg.lower():
-            return "Hata: OpenAI API anahtarı geçersiz. Lütfen anahtarınızı kontrol edin."
-        else:
-            return f"Hata: Görsel oluşturma hatası: {e}"
-
-# --- AI ile Metin Formatlama Fonksiyonu ---
-@st.cache_data
-def format_text_for_social_media(text, platform, target_language="Türkçe"):
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
-    format_prompt_base = f"{COMPANY_INFO_CONTEXT}\n{COMPANY_SOCIAL_PRESENCE_CONTEXT}\n\n"
-
-    if platform == "Instagram":
-        format_prompt = (
-            f"{format_prompt_base}"
-            f"Yukarıdaki şirket bilgilerini ve sosyal medya hesaplarını göz önünde bulundurarak, aşağıdaki metni görsel odaklı ve direkt paylaşılmaya hazır bir Instagram gönderisine dönüştür. "
-            f"Verilen örnekteki gibi kısa paragraflar, emoji ve trend hashtagler kullan. '📞 Contact Us' ve '🔗 Website' gibi net CTA'lar ekle. "
-            f"Metni orijinal anlamını koruyarak, Instagram'ın karakter sınırlamalarına uygun ama bilgilendirici olacak şekilde {target_language} dilinde düzenle. "
-            f"Örnek İçerik Tarzı:\n"
-            f"🏡 Countryside 72m² – Modern, Modular, and Comfortable Living!\n\n"
-            f"Looking for a stylish, energy-efficient home?\n"
-            f"✅ Spacious Design: 3 bedrooms, 1 kitchen, 1 bathroom\n"
-            f"✅ Durability & Quality: Premium+ materials, insulated walls, and aluminum windows\n"
-            f"✅ Fast Installation: Average 8 weeks delivery time\n"
-            f"✅ Turnkey Price: Starting from €59,900 (excluding VAT)\n\n"
-            f"📞 Contact Us:\n"
-            f"📍 Address: Iasonos 1082, Nicosia, Cyprus\n"
-            f"🌐 Web: www.premiumpluscy.eu\n"
-            f"📩 Email: seller@premiumpluscy.eu\n"
-            f"📲 Phone: +357 97550946 | +357 22584081\n\n"
-            f"📩 Send us a DM or visit our website for more details!\n"
-            f"🔗 www.premiumpluscy.eu\n\n"
-            f"#ModularHome #PrefabHouse #EcoFriendlyLiving #SmartLiving #minimalisthome\n\n"
-            f"Metin: \n\n{text}"
-        )
-    elif platform == "Facebook":
-        format_prompt = (
-            f"{format_prompt_base}"
-            f"Yukarıdaki şirket bilgilerini ve sosyal medya hesaplarını göz önünde bulundurarak, aşağıdaki metni Facebook topluluğu için samimi, bilgilendirici ve direkt paylaşılmaya hazır bir gönderiye dönüştür. "
-            f"Paylaşımı teşvik eden sorular, topluluk odaklı ifadeler ve uygun hashtagler kullan. "
-            f"Metni video veya görsel içeriğe eşlik edebilecek, sohbeti başlatacak şekilde {target_language} dilinde yaz. "
-            f"Şirket web sitesi ve katalog linklerini uygun yerlerde belirterek, kişisel hesap yerine işletme sayfası üzerinden paylaşılacak bir dil kullan. Metin: \n\n{text}"
-            )
-    elif platform == "LinkedIn":
-        format_prompt = (
-            f"{format_prompt_base}"
-            f"Yukarıdaki şirket bilgilerini ve sosyal medya hesaplarını göz önünde bulundurarak, aşağıdaki metni LinkedIn profesyonel ağı için bilgilendirici, otoriter ve direkt paylaşılmaya hazır bir gönderiye dönüştür. "
-            f"Sektörel içgörüler, profesyonel terimler ve konuyla ilgili hashtagler kullan. "
-            f"Değer katan bilgiler sun ve tartışmayı teşvik et. "
-            f"Şirket web sitesi ve katalog linklerini uygun yerlerde belirterek, kurumsal bir dil kullan. Metin: \n\n{text}"
-            )
-    elif platform == "Genel Blog Yazısı":
-        format_prompt = (
-            f"{format_prompt_base}"
-            f"Yukarıdaki şirket bilgilerini göz önünde bulundurarak, aşağıdaki metni bir blog yazısı formatına dönüştür. Blogun ana başlığını, alt başlıklarını ve paragraflarını açıkça belirt. "
-            f"Okunabililiği artırmak için giriş, gelişme (alt başlıklar kullanarak) ve sonuç bölümleri oluştur. "
-            f"Anahtar kelimelerle zenginleştirilmiş, bilgilendirici ve SEO dostu bir yapı kur. "
-            f"Web sitesi ve katalog linklerini uygun yerlerde belirt. Çıktıyı {target_language} dilinde ver. Metin: \n\n{text}"
-            )
-    elif platform == "E-posta Bülteni":
-        format_prompt = (
-            f"{format_prompt_base}"
-            f"Yukarıdaki şirket bilgilerini göz önünde bulundurarak, aşağıdaki metni kısa, öz ve okuyucuyu harekete geçiren bir e-posta bülteni içeriğine dönüştür. "
-            f"Net bir konu başlığı (subject line) öner, kısa giriş, ana faydaları vurgulayan maddeler veya kısa paragraflar ve net bir harekete geçirici mesaj (CTA) içer. "
-            f"Web sitesi ve katalog linklerini uygun yerlerde belirt. Çıktıyı {target_language} dilinde ver. Metin: \n\n{text}"
-            )
-    elif platform == "Bazaraki.com İlanı": # Yeni eklenen formatlama seçeneği
-        format_prompt = (
-            f"{format_prompt_base}"
-            f"Yukarıdaki şirket bilgilerini ve faaliyet alanlarını göz önünde bulundurarak, aşağıdaki metni Kıbrıs'taki Bazaraki.com emlak sitesi için uygun, kısa ve çekici bir ilan metnine dönüştür. "
-            f"İlanın ilk paragrafı kısa ve vurucu olmalı, ardından madde işaretleriyle temel özellikleri (metrekare, oda sayısı, malzeme, kurulum süresi, fiyat aralığı) belirtilmelidir. "
-            f"Müşteriyi web sitesi veya katalog sitesine yönlendiren net bir harekete geçirici mesaj (CTA) içermelidir. "
-            f"Konum olarak Kıbrıs'a odaklan. Çıktıyı {target_language} dilinde ver. Metin: \n\n{text}"
-            )
-    else: # Varsayılan veya bilinmeyen platformlar için
-        format_prompt = (
-            f"{format_prompt_base}"
-            f"Yukarıdaki şirket bilgilerini göz önünde bulundurarak, aşağıdaki metni genel bir sosyal medya platformu için uygun, ilgi çekici ve etkileşim artırıcı bir gönderi formatında yeniden yaz. "
-            f"Gerektiğinde emoji ve uygun hashtagler ekle. Metni orijinal anlamını koruyarak düzenle. "
-            f"Çıktıyı {target_language} dilinde ver. "
-            f"Metin: \n\n{text}"
-            )
+# Çağrı metrikleri METRICS_PORT ayarlıysa Prometheus için /metrics üzerinden sunulur
+start_metrics_server()
 
-    try:
-        response = model.generate_content(format_prompt)
-        return response.text
-    except Exception as e:
-        error_msg = str(e)
-        if "api key not valid" in error_msg.lower() or "authentication error" in error_msg.lower():
-            return "Hata: Gemini API anahtarı geçersiz veya yetkilendirme hatası. Lütfen anahtarınızı kontrol edin."
-        return f"Hata: Metin formatlama hatası (AI): {e}"
-
-# --- YouTube Video Fikri Oluşturma Fonksiyonu (Gemini Flash) ---
-@st.cache_data
-def generate_youtube_idea_gemini(prompt_text, target_language="Türkçe"):
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    # Şirket bilgilerini prompt'a ekle
-    full_prompt = (
-        f"{COMPANY_INFO_CONTEXT}\n{COMPANY_SOCIAL_PRESENCE_CONTEXT}\n\n"
-        f"Yukarıdaki şirket bilgilerini ve faaliyet alanlarını göz önünde bulundurarak, "
-        f"'{prompt_text}' konusunda bir YouTube videosu fikri oluştur. "
-        f"Başlık önerileri, anahtar noktalar (video içeriği), kısa bir senaryo taslağı (giriş, gelişme, sonuç) ve potansiyel görsel/çekim fikirleri içermeli. "
-        f"Hazırlanan metin ve video fikri Premium Home'un web sitesi ve sosyal medya kanallarına uygun olmalıdır. "
-        f"Çıktıyı {target_language} dilinde ver."
-    )
-    try:
-        response = model.generate_content(full_prompt)
-        return response.text
-    except Exception as e:
-        error_msg = str(e)
-        if "api key not valid" in error_msg.lower() or "authentication error" in error_msg.lower():
-            return "Hata: Gemini API anahtarı geçersiz veya yetkilendirme hatası. Lütfen anahtarınızı kontrol edin."
-        return f"Hata: YouTube video fikri oluşturma hatası (AI): {e}"
+# --- Backend API URL'si ---
+BACKEND_API_URL = os.environ.get("BACKEND_API_URL", "https://premium-home-social-api.onrender.com") # KENDİ RENDER URL'NİZİ BURAYA YAPIŞTIRIN!
+
+# --- Yüklenen Görsel Önizlemesi ---
+@st.cache_data(max_entries=32, show_spinner=False)
+def prepare_uploaded_image(image_bytes):
+    """Yüklenen görseli küçültüp JPEG'e çevirir; (içerik_özeti, jpeg_baytları, boyut) döndürür."""
+    return prepare_image(image_bytes)
+
+# --- Akışlı Çıktı ---
+def render_streamed(stream_func, *args):
+    """Akışlı üretimi sayfada bir yer tutucuya canlı olarak çizer ve süre bilgisini gösterir."""
+    placeholder = st.empty()
+    result, metrics = stream_func(*args, lambda partial: placeholder.code(partial, language='markdown'))
+    placeholder.code(result, language='markdown')
+    source = "önbellek" if metrics["cached"] else "model"
+    # Yanıt akıştan gelmediyse (hata veya yedek rotanın tek parça yanıtı) ilk token süresi yoktur
+    ttft_text = "-" if metrics["ttft_seconds"] is None else f"{metrics['ttft_seconds']:.2f} sn"
+    st.caption(f"İlk token: {ttft_text} · Toplam: {metrics['total_seconds']:.2f} sn · Kaynak: {source}")
+    return result
 
 # --- Frontend Yardımcı Fonksiyonları (Backend ile İletişim Kurar) ---
 def call_backend_api(endpoint, method="GET", payload=None):
     """Genel backend API çağrı fonksiyonu."""
     url = f"{BACKEND_API_URL}{endpoint}"
-    try:
-        if method == "POST":
-            response = requests.post(url, json=payload)
-        else: # GET
-            response = requests.get(url)
-        response.raise_for_status() # HTTP hata kodları için istisna fırlatır
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Backend API'ye bağlanırken hata oluştu: {e}")
-        return {"error": f"API Bağlantı Hatası: {e}"}
-    except json.JSONDecodeError as e:
-        st.error(f"Backend'den geçersiz JSON yanıtı alındı: {e}. Yanıt: {response.text}")
-        return {"error": f"JSON Çözümleme Hatası: {e}"}
+    client = get_http_client() # Paylaşılan, zaman aşımlı ve yeniden denemeli istemci
+    with instrument("backend", endpoint) as call:
+        try:
+            if method == "POST":
+                response = client.post(url, json=payload, on_retry=call.add_retry)
+            else: # GET
+                response = client.get(url, on_retry=call.add_retry)
+            return response.json()
+        except requests.exceptions.HTTPError as e:
+            call.fail(e)
+            # Backend 4xx/5xx yanıtlarında hatayı {"error": ...} gövdesinde döndürür; varsa o gösterilir
+            try:
+                backend_error = e.response.json().get("error")
+            except (ValueError, AttributeError):
+                backend_error = None
+            if backend_error:
+                st.error(f"Backend hatası: {backend_error}")
+                return {"error": backend_error}
+            st.error(f"Backend API'ye bağlanırken hata oluştu: {e}")
+            return {"error": f"API Bağlantı Hatası: {e}"}
+        except requests.exceptions.RequestException as e:
+            call.fail(e)
+            st.error(f"Backend API'ye bağlanırken hata oluştu: {e}")
+            return {"error": f"API Bağlantı Hatası: {e}"}
+        except json.JSONDecodeError as e:
+            call.fail(e)
+            st.error(f"Backend'den geçersiz JSON yanıtı alındı: {e}. Yanıt: {response.text}")
+            return {"error": f"JSON Çözümleme Hatası: {e}"}
+
+# --- Video İş Takibi ---
+# İşler yerel kayıt defterinde tutulur; status_url'ler arka planda uyarlamalı aralıklarla yoklanır.
+VIDEO_PANEL_REFRESH_SECONDS = float(os.environ.get("VIDEO_PANEL_REFRESH_SECONDS", "3"))
+VIDEO_POLL_TIMEOUT = (float(os.environ.get("VIDEO_POLL_CONNECT_TIMEOUT", "3")), float(os.environ.get("VIDEO_POLL_READ_TIMEOUT", "5")))
+
+def fetch_video_status(status_url):
+    # Yoklayıcı hatada kendi geri çekilmesini uyguladığı için tek, kısa süreli deneme yeterlidir
+    with instrument("backend", "/api/video_status"):
+        return get_http_client().get(status_url, retry=False, timeout=VIDEO_POLL_TIMEOUT).json()
+
+@st.cache_resource
+def get_video_job_registry():
+    registry = VideoJobRegistry()
+    VideoJobPoller(registry, fetch_video_status, base_url=BACKEND_API_URL).start()
+    return registry
 
 # Backend'den video oluşturma isteği gönderme
 def generate_video_from_backend(video_prompt_text, target_language="Türkçe"):
+    """Video isteğini gönderir ve işi takip kaydına ekler; başarıda iş kaydını (dict) döndürür."""
     endpoint = "/api/generate_video"
     payload = {"video_prompt_text": video_prompt_text, "target_language": target_language}
     response = call_backend_api(endpoint, method="POST", payload=payload)
     # Backend'den gelen hata mesajlarını kontrol et
     if "error" in response:
         return f"Hata: Video oluşturma isteği başarısız oldu. Detay: {response['error']}"
-    return response.get("message", "Video oluşturma isteği gönderilemedi.") + " " + \
-           response.get("status_url", "Durum URL'si yok.") + " " + \
-           response.get("estimated_time", "") + " Video ID: " + str(response.get("video_id", "Yok"))
+    return get_video_job_registry().add(
+        video_id=response.get("video_id") or f"local-{uuid.uuid4().hex[:12]}",
+        prompt=video_prompt_text,
+        status_url=response.get("status_url"),
+        message=response.get("message", ""),
+        estimated_time=str(response.get("estimated_time", "")),
+    )
+
+def has_active_video_jobs(jobs):
+    """Yoklanmaya devam eden (bitmemiş ve durum URL'si olan) bir iş var mı?"""
+    return any(job['status'] not in TERMINAL_STATUSES and job['status_url'] for job in jobs)
+
+def render_video_jobs_panel():
+    """Video işlerinin canlı ilerleme panelini çizer (yalnızca kayıt defterini okur, backend'i beklemez)."""
+    jobs = get_video_job_registry().list(limit=20)
+    if not has_active_video_jobs(jobs) and st.session_state.pop('video_panel_live', False):
+        # Tüm işler bitti: bölüm yeniden çalışıp paneli zamanlayıcısız çizer (bkz. video_section).
+        rerun_parent_fragment("video_section")
+    if not jobs:
+        st.caption("Henüz takip edilen video işi yok.")
+        return
+    for job in jobs:
+        label = f"**{job['video_id']}** · {job['status']}"
+        if job['estimated_time']:
+            label += f" · Tahmini süre: {job['estimated_time']}"
+        st.markdown(label)
+        st.progress(min(int(job['progress'] or 0), 100) / 100, text=job['prompt'][:80])
+        if job['video_url']:
+            st.markdown(f"[Videoyu Aç]({job['video_url']})")
+        if job['status'] in FAILED_STATUSES:
+            st.error(job['message'] or "Video oluşturma başarısız oldu.")
+        elif job['message']:
+            st.caption(job['message'])
+        elif not job['status_url']:
+            st.caption("Backend durum URL'si döndürmedi; ilerleme takip edilemiyor.")
 
 def get_social_stats_from_backend():
     endpoint = "/api/social_stats" # Backend'deki mevcut endpoint
     return call_backend_api(endpoint, method="GET")
 
+# --- İstatistik Deposu ve Arka Plan Yenileme ---
+# Son anlık görüntü hemen gösterilir, yenisi arka planda çekilir (stale-while-revalidate).
+STATS_MAX_AGE_SECONDS = float(os.environ.get("STATS_MAX_AGE_SECONDS", "900"))
+STATS_PANEL_REFRESH_SECONDS = float(os.environ.get("STATS_PANEL_REFRESH_SECONDS", "2"))
+# Başarısız yenilemeden sonra otomatik yeniden deneme için beklenecek süre
+STATS_RETRY_SECONDS = float(os.environ.get("STATS_RETRY_SECONDS", "60"))
+
+def fetch_social_stats():
+    """Arka plan thread'i için: Streamlit'e yazmadan istatistikleri çeker, hata durumunda istisna fırlatır."""
+    with instrument("backend", "/api/social_stats") as call:
+        return get_http_client().get(f"{BACKEND_API_URL}/api/social_stats", on_retry=call.add_retry).json()
+
+@st.cache_resource
+def get_stats_refresher():
+    return StatsRefresher(StatsStore(), fetch_social_stats, retry_seconds=STATS_RETRY_SECONDS)
+
 # --- Streamlit Uygulama Arayüzü ---
+SCRIPT_STARTED = time.perf_counter()
 st.set_page_config(layout="wide")
 st.title("Premium Home AI Sosyal Medya Asistanı 🚀")
 st.markdown(f"<p style='font-size:12px; color:#888; text-align: right;'>Sürüm: v3 Beta</p>", unsafe_allow_html=True) # Sürüm bilgisi
@@ -295,197 +187,404 @@ st.markdown("""
     ---
 """)
 
-# --- Sosyal Medya Yetkilendirme Bölümü ---
-st.header("Sosyal Medya Hesaplarını Yetkilendir")
-st.markdown("""
-    İstatistikleri çekebilmek ve diğer sosyal medya özelliklerini kullanabilmek için hesaplarınızı bağlamalısınız.
-    Bu işlem sizi backend servisimize yönlendirecektir.
-""")
-
-col_auth1, col_auth2 = st.columns(2)
-with col_auth1:
-    if st.button("Facebook/Instagram'ı Yetkilendir", type="primary", key="auth_facebook_button"):
-        st.markdown(f"[Facebook/Instagram Yetkilendirme Başlat]({BACKEND_API_URL}/auth/facebook)", unsafe_allow_html=True)
-        st.info("Yukarıdaki linke tıklayın ve Facebook yetkilendirmesini tamamlayın. Ardından bu uygulamaya geri dönün.")
-
-with col_auth2:
-    if st.button("Google/YouTube'u Yetkilendir", type="primary", key="auth_google_button"):
-        st.markdown(f"[Google/YouTube Yetkilendirme Başlat]({BACKEND_API_URL}/auth/google)", unsafe_allow_html=True)
-        st.info("Yukarıdaki linke tıklayın ve Google yetkilendirmesini tamamlayın. Ardından bu uygulamaya geri dönün.")
+# Eksik anahtar sayfayı durdurmaz; yalnızca o sağlayıcıyı kullanan bölümler hata gösterir
+for missing_key_message in model_registry.missing_keys():
+    st.warning(missing_key_message)
+
+# --- Bölüm Süre Ölçümü ---
+# Her bölüm (fragment) ve tam sayfa çalıştırmasının süresi loglanır ve kenar çubuğunda gösterilir;
+# fragment öncesi/sonrası etkileşim başına script süresini karşılaştırmak için kullanılır.
+def timed_section(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                st.session_state.setdefault('section_timings', {})[name] = elapsed_ms
+                logger.info("Bölüm süresi: %s %.1f ms", name, elapsed_ms)
+        return wrapper
+    return decorator
+
+# --- Canlı Paneller ---
+# Bir bölümün içindeki run_every'li panelin zamanlayıcısı, panelin kendi yeniden çalışmasıyla durmaz;
+# yalnızca ebeveyn bölüm yeniden çalışıp paneli fragment olarak yeniden kaydetmediğinde durur.
+def rerun_parent_fragment(key):
+    """Canlı panelin gövdesinden anahtarı `key` olan bölüm fragment'ını yeniden çalıştırır.
+
+    st.rerun(key) yalnızca widget callback'lerinde kabul edildiğinden çağrı callback bağlamında yapılır.
+    """
+    with ThreadState.scoped(run_location=RunLocation.CALLBACK):
+        st.rerun(key)
 
-st.markdown("---")
+# --- Sosyal Medya Yetkilendirme Bölümü ---
+@st.fragment
+@timed_section("auth")
+def auth_section():
+    st.header("Sosyal Medya Hesaplarını Yetkilendir")
+    st.markdown("""
+        İstatistikleri çekebilmek ve diğer sosyal medya özelliklerini kullanabilmek için hesaplarınızı bağlamalısınız.
+        Bu işlem sizi backend servisimize yönlendirecektir.
+    """)
+
+    col_auth1, col_auth2 = st.columns(2)
+    with col_auth1:
+        if st.button("Facebook/Instagram'ı Yetkilendir", type="primary", key="auth_facebook_button"):
+            st.markdown(f"[Facebook/Instagram Yetkilendirme Başlat]({BACKEND_API_URL}/auth/facebook)", unsafe_allow_html=True)
+            st.info("Yukarıdaki linke tıklayın ve Facebook yetkilendirmesini tamamlayın. Ardından bu uygulamaya geri dönün.")
+
+    with col_auth2:
+        if st.button("Google/YouTube'u Yetkilendir", type="primary", key="auth_google_button"):
+            st.markdown(f"[Google/YouTube Yetkilendirme Başlat]({BACKEND_API_URL}/auth/google)", unsafe_allow_html=True)
+            st.info("Yukarıdaki linke tıklayın ve Google yetkilendirmesini tamamlayın. Ardından bu uygulamaya geri dönün.")
 
 # --- Metin Oluşturucu Bölümü ---
-st.header("Metin Oluştur")
-prompt_text = st.text_area(
-    'İçerik İsteği:',
-    placeholder='Örn: Kıbrıs\'taki Tiny House projelerinin avantajlarını anlatan bir sosyal medya metni yaz.',
-    height=150,
-    key='prompt_input'
-)
+@st.fragment
+@timed_section("text")
+def text_section():
+    st.header("Metin Oluştur")
+    prompt_text = st.text_area(
+        'İçerik İsteği:',
+        placeholder='Örn: Kıbrıs\'taki Tiny House projelerinin avantajlarını anlatan bir sosyal medya metni yaz.',
+        height=150,
+        key='prompt_input'
+    )
 
-col1, col2 = st.columns(2)
-with col1:
-    language_options = ['Türkçe', 'English', 'Ελληνικά']
-    selected_language = st.selectbox('Çıktı Dili:', language_options, key='lang_selector')
-with col2:
-    if st.button('Metin Oluştur', type="primary", key='generate_text_button'):
-        with st.spinner(f"'{selected_language}' dilinde içerik oluşturuluyor..."):
-            generated_content = generate_text_gemini_flash(prompt_text, selected_language)
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_language = st.selectbox('Çıktı Dili:', LANGUAGE_OPTIONS, key='lang_selector')
+    def generate_and_show():
+        if st.session_state.get('streaming_toggle', True):
+            st.markdown("### Oluşturulan Metin:")
+            generated_content = render_streamed(stream_text_gemini_flash, prompt_text, selected_language)
+        else:
+            with st.spinner(f"'{selected_language}' dilinde içerik oluşturuluyor..."):
+                generated_content = generate_text_gemini_flash(prompt_text, selected_language)
+            st.markdown("### Oluşturulan Metin:")
+            st.code(generated_content, language='markdown')
         st.session_state.last_generated_text = generated_content
         st.session_state.last_selected_language = selected_language
-        st.markdown("### Oluşturulan Metin:")
-        st.code(generated_content, language='markdown')
 
-# --- Sosyal Medya Metnini Formatla ve Paylaş Bölümü ---
-st.header("Sosyal Medya Metnini Formatla ve Paylaş")
-st.markdown("<p style='font-size:13px; color:#555;'>*Yukarıdaki 'Metin Oluştur' bölümünde üretilen son metni kullanır.</p>", unsafe_allow_html=True)
+    with col2:
+        if st.button('Metin Oluştur', type="primary", key='generate_text_button'):
+            # Benzer (ama aynı kelimelerden oluşmayan) önceki bir istek varsa önce o önerilir;
+            # aynı kelimelerden oluşan istekler üretim fonksiyonunda zaten yeniden kullanılır
+            similar = find_similar_generation("text", prompt_text, TEXT_MODEL_NAME, selected_language) if prompt_text.strip() else None
+            if similar and not similar["same_words"]:
+                st.session_state.text_similar_offer = dict(similar, prompt_text=prompt_text, language=selected_language)
+            else:
+                st.session_state.pop('text_similar_offer', None)
+                generate_and_show()
+
+    # --- Benzer İstek Önerisi ---
+    similar_offer = st.session_state.get('text_similar_offer')
+    if similar_offer and similar_offer["prompt_text"] == prompt_text and similar_offer["language"] == selected_language:
+        st.info(
+            f"Benzer bir istek için daha önce üretilmiş metin bulundu (benzerlik %{similar_offer['similarity'] * 100:.0f}): "
+            f"\"{similar_offer['prompt'][:120]}\""
+        )
+        st.code(similar_offer["result"], language='markdown')
+        col_reuse, col_regenerate = st.columns(2)
+        with col_reuse:
+            if st.button('Bu Metni Kullan', key='reuse_similar_text_button'):
+                st.session_state.pop('text_similar_offer', None)
+                st.session_state.last_generated_text = similar_offer["result"]
+                st.session_state.last_selected_language = selected_language
+                st.success("Önceki metin kullanılıyor; formatlama ve diğer bölümler bu metni kullanacak.")
+        with col_regenerate:
+            regenerate = st.button('Yine de Yeni Üret', key='regenerate_text_button')
+        if regenerate:
+            st.session_state.pop('text_similar_offer', None)
+            generate_and_show()
+
+    # --- Çoklu Dil Modu ---
+    with st.expander("Çoklu Dil Modu (TR/EN/EL)"):
+        col_ml1, col_ml2 = st.columns(2)
+        with col_ml1:
+            selected_languages = st.multiselect('Çıktı Dilleri:', LANGUAGE_OPTIONS, default=LANGUAGE_OPTIONS, key='multi_lang_selector')
+        with col_ml2:
+            multi_lang_mode = st.radio(
+                'Yöntem:', ['parallel', 'single'], horizontal=True, key='multi_lang_mode',
+                format_func=lambda mode: "Eşzamanlı İstekler" if mode == "parallel" else "Tek İstek (JSON)",
+            )
+        if st.button('Seçili Dillerde Oluştur', type="primary", key='generate_multi_lang_button'):
+            if not selected_languages:
+                st.error("Lütfen en az bir dil seçin.")
+            else:
+                with st.spinner(f"{len(selected_languages)} dilde içerik oluşturuluyor..."):
+                    multi_results, multi_report = generate_text_multilanguage(prompt_text, selected_languages, multi_lang_mode)
+                st.session_state.last_generated_texts_by_language = multi_results
+                st.session_state.last_generated_text = multi_results[selected_languages[0]]
+                st.session_state.last_selected_language = selected_languages[0]
+                for language, tab in zip(selected_languages, st.tabs(selected_languages)):
+                    with tab:
+                        st.code(multi_results[language], language='markdown')
+                report_line = f"Toplam süre: {multi_report['wall_seconds']:.2f} sn"
+                if multi_report["sequential_seconds"] is not None:
+                    saved_seconds = multi_report["sequential_seconds"] - multi_report["wall_seconds"]
+                    report_line += (
+                        f" · Ardışık eşdeğer: {multi_report['sequential_seconds']:.2f} sn · Kazanç: {max(saved_seconds, 0):.2f} sn"
+                    )
+                report_line += f" · Önbellek isabeti: {multi_report['cache_hits']}/{multi_report['languages']}"
+                if multi_report["prompt_tokens"] and multi_report["sequential_prompt_tokens"]:
+                    report_line += (
+                        f" · Girdi token: {multi_report['prompt_tokens']} (ardışık tahmini: {multi_report['sequential_prompt_tokens']}, "
+                        f"tasarruf: {multi_report['sequential_prompt_tokens'] - multi_report['prompt_tokens']})"
+                    )
+                st.caption(report_line)
 
-if 'last_generated_text' in st.session_state and st.session_state.last_generated_text:
+# --- Sosyal Medya Metnini Formatla ve Paylaş Bölümü ---
+def render_share_buttons(formatted_text):
+    """Formatlanmış metin için manuel paylaşım butonlarını çizer."""
+    encoded_formatted_text_share = requests.utils.quote(formatted_text)
+    website_url = "https://www.premiumpluscy.eu"
+    linkedin_share_url = f"https://www.linkedin.com/feed/?shareActive=true&text={encoded_formatted_text_share}"
+    facebook_share_url = f"https://www.facebook.com/sharer/sharer.php?quote={encoded_formatted_text_share}"
+    instagram_placeholder_url = "https://www.instagram.com/" # Instagram için doğrudan paylaşım URL'si olmadığı için placeholder
+
+    st.markdown(f"""
+    <div class="social-media-buttons-container">
+        <a href="{website_url}" target='_blank' class='social-button website'>Web Sitesine Git</a>
+        <a href="{linkedin_share_url}" target='_blank' class='social-button linkedin'>LinkedIn'de Paylaş</a>
+        <a href="{instagram_placeholder_url}" target='_blank' class='social-button instagram'>Instagram'da Paylaş</a>
+        <a href="{facebook_share_url}" target='_blank' class='social-button facebook'>Facebook'ta Paylaş</a>
+        <p style="font-size:12px; color:#666; margin-top:10px;"><i>Not: Bu butonlar manuel paylaşıma yönlendirir, API entegrasyonu backend'de yapılır.</i></p>
+    </div>
+    """, unsafe_allow_html=True)
+
+@st.fragment
+@timed_section("format")
+def format_section():
+    st.header("Sosyal Medya Metnini Formatla ve Paylaş")
+    st.markdown("<p style='font-size:13px; color:#555;'>*Yukarıdaki 'Metin Oluştur' bölümünde üretilen son metni kullanır.</p>", unsafe_allow_html=True)
+
+    # Metin başka bir bölümde üretildiği için kontroller her zaman çizilir; metin tıklama anında okunur
     col3, col4 = st.columns(2)
     with col3:
-        platform_options = ['Instagram', 'Facebook', 'LinkedIn', 'Genel Blog Yazısı', 'E-posta Bülteni', 'Bazaraki.com İlanı'] # Bazaraki eklendi
-        selected_platform = st.selectbox('Formatla:', platform_options, key='platform_selector')
+        selected_platform = st.selectbox('Formatla:', PLATFORM_OPTIONS, key='platform_selector')
     with col4:
-        if st.button('Formatla ve Paylaş (AI)', type="secondary", key='format_share_button'):
+        format_single = st.button('Formatla ve Paylaş (AI)', type="secondary", key='format_share_button')
+        format_all = st.button('Tüm Platformlar İçin Formatla (AI)', type="secondary", key='format_all_platforms_button')
+
+    if not (format_single or format_all):
+        return
+    if not st.session_state.get('last_generated_text'):
+        st.info("Önce 'Metin Oluştur' bölümünden bir metin oluşturun.")
+        return
+
+    if format_single:
+        if st.session_state.get('streaming_toggle', True):
+            st.markdown("### Oluşturulan Metin:")
+            formatted_text = render_streamed(stream_format_text_for_social_media, st.session_state.last_generated_text, selected_platform, st.session_state.last_selected_language)
+        else:
             with st.spinner(f"Metin '{selected_platform}' için formatlanıyor..."):
                 formatted_text = format_text_for_social_media(st.session_state.last_generated_text, selected_platform, st.session_state.last_selected_language)
             st.markdown("### Oluşturulan Metin:")
             st.code(formatted_text, language='markdown')
-
-            encoded_formatted_text_share = requests.utils.quote(formatted_text)
-            website_url = "https://www.premiumpluscy.eu"
-            linkedin_share_url = f"https://www.linkedin.com/feed/?shareActive=true&text={encoded_formatted_text_share}"
-            facebook_share_url = f"https://www.facebook.com/sharer/sharer.php?quote={encoded_formatted_text_share}"
-            instagram_placeholder_url = "https://www.instagram.com/" # Instagram için doğrudan paylaşım URL'si olmadığı için placeholder
-
-            st.markdown(f"""
-            <div class="social-media-buttons-container">
-                <a href="{website_url}" target='_blank' class='social-button website'>Web Sitesine Git</a>
-                <a href="{linkedin_share_url}" target='_blank' class='social-button linkedin'>LinkedIn'de Paylaş</a>
-                <a href="{instagram_placeholder_url}" target='_blank' class='social-button instagram'>Instagram'da Paylaş</a>
-                <a href="{facebook_share_url}" target='_blank' class='social-button facebook'>Facebook'ta Paylaş</a>
-                <p style="font-size:12px; color:#666; margin-top:10px;"><i>Not: Bu butonlar manuel paylaşıma yönlendirir, API entegrasyonu backend'de yapılır.</i></p>
-            </div>
-            """, unsafe_allow_html=True)
-else:
-    st.info("Önce 'Metin Oluştur' bölümünden bir metin oluşturun.")
+        render_share_buttons(formatted_text)
+
+    if format_all:
+        st.markdown("### Tüm Platformlar İçin Oluşturulan Metinler:")
+        platform_tabs = dict(zip(PLATFORM_OPTIONS, st.tabs(PLATFORM_OPTIONS)))
+        placeholders = {}
+        for platform, tab in platform_tabs.items():
+            with tab:
+                placeholders[platform] = st.empty()
+                placeholders[platform].info(f"'{platform}' için formatlanıyor...")
+        with st.spinner("Metin tüm platformlar için eşzamanlı formatlanıyor..."):
+            # Sonuçlar tamamlandıkça ilgili sekmeye yazılır
+            for platform, formatted_text in format_text_for_all_platforms(st.session_state.last_generated_text, st.session_state.last_selected_language):
+                with placeholders[platform].container():
+                    st.code(formatted_text, language='markdown')
+                    render_share_buttons(formatted_text)
+
+# --- Platform Görsel Sürümleri ---
+# Sayfada tam çözünürlüklü görsel yerine küçük WebP önizleme gösterilir; platform boyutları
+# istek üzerine paralel üretilir ve kaynak görselin özetiyle önbelleğe alınır.
+def render_image_thumbnail(source_digest, load_source, caption):
+    thumbnail = get_rendition_pipeline().renditions(source_digest, load_source, ["thumbnail"])["thumbnail"]
+    st.image(thumbnail["path"], caption=caption)
+
+def render_image_renditions(source_digest, load_source, key_prefix):
+    pipeline = get_rendition_pipeline()
+    platform_names = [name for name in pipeline.specs if name != "thumbnail"]
+    ready = pipeline.cached(source_digest, platform_names)
+    if len(ready) < len(platform_names):
+        if not st.button("Platform Boyutlarını Hazırla", key=f"{key_prefix}_renditions_button"):
+            return
+        with st.spinner("Instagram, Facebook, LinkedIn, Bazaraki ve web boyutları hazırlanıyor..."):
+            ready = pipeline.renditions(source_digest, load_source, platform_names)
+    st.markdown("#### Platform Boyutları")
+    rendition_columns = st.columns(3)
+    for index, rendition in enumerate(ready.values()):
+        with rendition_columns[index % 3]:
+            st.caption(f"{rendition['label']} · {rendition['dimensions']} · {rendition['format']} · {rendition['size'] / 1024:.0f} KB")
+            with open(rendition["path"], "rb") as rendition_file:
+                st.download_button(
+                    label=f"{rendition['label']} İndir",
+                    data=rendition_file,
+                    file_name=f"premiumhome_{rendition['name']}_{source_digest[:12]}.{rendition['path'].rsplit('.', 1)[-1]}",
+                    mime=rendition["mime"],
+                    key=f"{key_prefix}_{rendition['name']}_download",
+                )
 
 # --- Görsel Yükle ve Yorumla Bölümü ---
-st.header("Görsel Yükle ve Yorumla")
-uploaded_file = st.file_uploader("Yorumlamak için bir görsel yükleyin", type=['png', 'jpg', 'jpeg'], key="image_uploader")
+@st.fragment
+@timed_section("image_upload")
+def image_upload_section():
+    st.header("Görsel Yükle ve Yorumla")
+    uploaded_file = st.file_uploader("Yorumlamak için bir görsel yükleyin", type=['png', 'jpg', 'jpeg'], key="image_uploader")
+    if uploaded_file is None:
+        return
+
+    # Önizleme dosya başına bir kez hazırlanır; sonraki çalıştırmalar büyük dosyayı yeniden işlemez
+    if st.session_state.get('uploaded_image_file_id') != uploaded_file.file_id:
+        st.session_state.uploaded_image_file_id = uploaded_file.file_id
+        st.session_state.uploaded_image_preview = prepare_uploaded_image(uploaded_file.getvalue())
+    image_hash, preview_bytes, preview_size = st.session_state.uploaded_image_preview
+    render_image_thumbnail(image_hash, uploaded_file.getvalue, f'Yüklenen Görsel ({preview_size[0]}×{preview_size[1]})')
+    render_image_renditions(image_hash, uploaded_file.getvalue, "uploaded_image")
 
-if uploaded_file is not None:
-    image = Image.open(uploaded_file)
-    st.image(image, caption='Yüklenen Görsel', use_container_width=True) 
-    
     if st.button('Görseli Yorumla', type="secondary", key='interpret_image_button'):
         with st.spinner("Görsel yorumlanıyor..."):
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            img_b64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
-            interpretation = interpret_image_gemini_vision(image)
+            interpretation = interpret_prepared_image(image_hash, preview_bytes)
         st.markdown("### Görsel Yorumu:")
         st.code(interpretation, language='markdown')
 
 # --- Yapay Zeka ile Görsel Oluştur Bölümü ---
-st.header("Yapay Zeka ile Görsel Oluştur (DALL-E 3)")
-image_prompt = st.text_area(
-    'Görsel Açıklaması:',
-    placeholder='Örn: Kıbrıs\'ta modern bir Tiny House\'un gün batımındaki panoramik görüntüsü.',
-    height=100,
-    key='image_prompt_input'
-)
+@st.fragment
+@timed_section("image_generation")
+def image_generation_section():
+    st.header("Yapay Zeka ile Görsel Oluştur (DALL-E 3)")
+    image_prompt = st.text_area(
+        'Görsel Açıklaması:',
+        placeholder='Örn: Kıbrıs\'ta modern bir Tiny House\'un gün batımındaki panoramik görüntüsü.',
+        height=100,
+        key='image_prompt_input'
+    )
+
+    if st.button('Görsel Oluştur', type="primary", key='generate_image_button'):
+        source_text = None
+        if not image_prompt.strip():
+            if 'last_generated_text' in st.session_state and st.session_state.last_generated_text:
+                source_text = st.session_state.last_generated_text
+                image_prompt = f"{source_text} Sosyal medya gönderisi için akılda kalıcı, profesyonel ve modern bir görsel olsun."
+                st.warning("Görsel açıklaması boştu, son oluşturulan metin kullanıldı. İstem kutusunu düzenleyip tekrar 'Görsel Oluştur' butonuna tıklayınız.")
+            else:
+                st.error("Lütfen görsel için bir açıklama girin veya metin oluşturun.")
+                return
 
-if st.button('Görsel Oluştur', type="primary", key='generate_image_button'):
-    if not image_prompt.strip():
-        if 'last_generated_text' in st.session_state and st.session_state.last_generated_text:
-            image_prompt = f"{st.session_state.last_generated_text} Sosyal medya gönderisi için akılda kalıcı, profesyonel ve modern bir görsel olsun."
-            st.warning("Görsel açıklaması boştu, son oluşturulan metin kullanıldı. İstem kutusunu düzenleyip tekrar 'Görsel Oluştur' butonuna tıklayınız.")
+        with st.spinner(f"Görsel oluşturuluyor: '{image_prompt[:50]}...'"):
+            generated_image_digest = generate_image_dalle(image_prompt)
+
+        if get_asset_store().info(generated_image_digest):
+            st.session_state.last_generated_image_digest = generated_image_digest
+            if source_text:
+                # Görsel son metinden üretildiyse arşivdeki metin kaydına bağlanır
+                get_content_archive().attach_image(source_text, generated_image_digest)
         else:
-            st.error("Lütfen görsel için bir açıklama girin veya metin oluşturun.")
-            st.stop()
-    
-    with st.spinner(f"Görsel oluşturuluyor: '{image_prompt[:50]}...'"):
-        generated_image_b64 = generate_image_dalle(image_prompt)
+            st.error(f"Görsel oluşturma başarısız oldu: {generated_image_digest}")
 
-    if generated_image_b64 and not "Hata:" in generated_image_b64:
+    # Son üretilen görsel depodan sunulur; sayfa yeniden çalıştığında kaybolmaz
+    last_image_info = get_asset_store().info(st.session_state.get('last_generated_image_digest', ''))
+    if last_image_info:
         st.markdown("### Oluşturulan Görsel:")
-        st.image(base64.b64decode(generated_image_b64), caption='Oluşturulan Görsel', use_container_width=True)
-        st.download_button(
-            label="Görseli İndir",
-            data=base64.b64decode(generated_image_b64),
-            file_name="ai_generated_image.png",
-            mime="image/png"
-        )
-    else:
-        st.error(f"Görsel oluşturma başarısız oldu: {generated_image_b64}")
+        load_generated_image = functools.partial(get_asset_store().get_bytes, last_image_info["digest"])
+        render_image_thumbnail(last_image_info["digest"], load_generated_image, 'Oluşturulan Görsel')
+        with open(last_image_info["path"], "rb") as image_file:
+            st.download_button(
+                label="Görseli İndir",
+                data=image_file,
+                file_name=f"ai_generated_image_{last_image_info['digest'][:12]}.png",
+                mime=last_image_info["mime"]
+            )
+        render_image_renditions(last_image_info["digest"], load_generated_image, "generated_image")
 
 # --- YouTube Video Fikri Oluştur Bölümü ---
-st.header("YouTube Video Fikri Oluştur")
-youtube_prompt = st.text_area(
-    'Video Fikri İsteği:',
-    placeholder='Örn: Tiny House inşaat sürecini anlatan bir YouTube videosu fikri.',
-    height=150,
-    key='youtube_prompt_input'
-)
+@st.fragment
+@timed_section("youtube")
+def youtube_section():
+    st.header("YouTube Video Fikri Oluştur")
+    youtube_prompt = st.text_area(
+        'Video Fikri İsteği:',
+        placeholder='Örn: Tiny House inşaat sürecini anlatan bir YouTube videosu fikri.',
+        height=150,
+        key='youtube_prompt_input'
+    )
 
-col5, col6 = st.columns(2)
-with col5:
-    if st.button('YouTube Fikri Oluştur', type="primary", key='generate_youtube_idea_button'):
-        if not youtube_prompt.strip():
-            if 'last_generated_text' in st.session_state and st.session_state.last_generated_text:
-                youtube_prompt = st.session_state.last_generated_text
-                st.warning("YouTube fikri açıklaması boştu, son oluşturulan metin önerildi. İstem kutusunu düzenleyip tekrar 'YouTube Fikri Oluştur' butonuna tıklayınız.")
+    col5, col6 = st.columns(2)
+    with col5:
+        if st.button('YouTube Fikri Oluştur', type="primary", key='generate_youtube_idea_button'):
+            if not youtube_prompt.strip():
+                if 'last_generated_text' in st.session_state and st.session_state.last_generated_text:
+                    youtube_prompt = st.session_state.last_generated_text
+                    st.warning("YouTube fikri açıklaması boştu, son oluşturulan metin önerildi. İstem kutusunu düzenleyip tekrar 'YouTube Fikri Oluştur' butonuna tıklayınız.")
+                else:
+                    st.error("Lütfen YouTube video fikri için bir açıklama girin veya metin oluşturun.")
+                    return
+
+            if st.session_state.get('streaming_toggle', True):
+                st.markdown("### Oluşturulan YouTube Video Fikri:")
+                youtube_idea = render_streamed(stream_youtube_idea_gemini, youtube_prompt, "Türkçe")
             else:
-                st.error("Lütfen YouTube video fikri için bir açıklama girin veya metin oluşturun.")
-                st.stop()
-        
-        with st.spinner(f"YouTube video fikri oluşturuluyor: '{youtube_prompt[:50]}...'"):
-            youtube_idea = generate_youtube_idea_gemini(youtube_prompt, "Türkçe")
-        st.session_state.last_youtube_idea = youtube_idea
-        st.markdown("### Oluşturulan YouTube Video Fikri:")
-        st.code(youtube_idea, language='markdown')
-    
-with col6:
-    if st.button('YouTube Fikrini Video İçin Kullan', type="secondary", key='use_for_video_creation_button'):
-        if 'last_youtube_idea' in st.session_state and st.session_state.last_youtube_idea:
-            st.session_state.video_creation_prompt_input_value = st.session_state.last_youtube_idea
+                with st.spinner(f"YouTube video fikri oluşturuluyor: '{youtube_prompt[:50]}...'"):
+                    youtube_idea = generate_youtube_idea_gemini(youtube_prompt, "Türkçe")
+                st.markdown("### Oluşturulan YouTube Video Fikri:")
+                st.code(youtube_idea, language='markdown')
+            st.session_state.last_youtube_idea = youtube_idea
+
+    with col6:
+        if st.session_state.pop('youtube_to_video_notice', False):
             st.success("YouTube Fikri video istemine kopyalandı. Şimdi aşağıdan 'Video Oluştur' butonuna tıklayabilirsiniz.")
-        else:
-            st.error("Önce bir YouTube Fikri oluşturmanız gerekiyor.")
+        if st.button('YouTube Fikrini Video İçin Kullan', type="secondary", key='use_for_video_creation_button'):
+            if 'last_youtube_idea' in st.session_state and st.session_state.last_youtube_idea:
+                st.session_state.video_creation_prompt_input_value = st.session_state.last_youtube_idea
+                st.session_state.youtube_to_video_notice = True
+                # Video bölümü ayrı bir fragment olduğu için istemin görünmesi tam sayfa çalıştırması gerektirir
+                st.rerun()
+            else:
+                st.error("Önce bir YouTube Fikri oluşturmanız gerekiyor.")
 
 # --- AI ile Kısa Video Oluşturma (Backend'e yönlendirildi) Bölümü ---
-st.header("AI ile Kısa Video Oluştur")
-st.markdown("<p style='font-size:13px; color:#555;'>*Yukarıdaki 'YouTube Video Fikri Oluştur' bölümünde üretilen son fikri kullanır.</p>", unsafe_allow_html=True)
-
-video_creation_prompt_input = st.text_area(
-    'Video Oluşturma İstem:',
-    value=st.session_state.get('video_creation_prompt_input_value', ''),
-    placeholder='Video oluşturma istemi giriniz (Örn: Bir Tiny House\'un 15 saniyelik tanıtım videosu).',
-    height=150,
-    key='video_creation_prompt_input'
-)
+@st.fragment(key="video_section")
+@timed_section("video")
+def video_section():
+    st.header("AI ile Kısa Video Oluştur")
+    st.markdown("<p style='font-size:13px; color:#555;'>*Yukarıdaki 'YouTube Video Fikri Oluştur' bölümünde üretilen son fikri kullanır.</p>", unsafe_allow_html=True)
+
+    video_creation_prompt_input = st.text_area(
+        'Video Oluşturma İstem:',
+        value=st.session_state.get('video_creation_prompt_input_value', ''),
+        placeholder='Video oluşturma istemi giriniz (Örn: Bir Tiny House\'un 15 saniyelik tanıtım videosu).',
+        height=150,
+        key='video_creation_prompt_input'
+    )
 
-if st.button('Video Oluştur (API Gerekli)', type="secondary", key='generate_short_video_button'):
-    if not video_creation_prompt_input.strip():
-        st.error("Lütfen video oluşturmak için bir istem girin veya YouTube fikri oluşturun.")
-        st.stop()
-    
-    with st.spinner(f"Video oluşturma isteği: '{video_creation_prompt_input[:50]}...'"):
-        generated_video_info = generate_video_from_backend(video_creation_prompt_input, "Türkçe")
-    st.markdown("### Oluşturulan Video Bilgisi:")
-    st.code(generated_video_info, language='markdown')
+    if st.button('Video Oluştur (API Gerekli)', type="secondary", key='generate_short_video_button'):
+        if not video_creation_prompt_input.strip():
+            st.error("Lütfen video oluşturmak için bir istem girin veya YouTube fikri oluşturun.")
+        else:
+            with st.spinner(f"Video oluşturma isteği: '{video_creation_prompt_input[:50]}...'"):
+                generated_video_job = generate_video_from_backend(video_creation_prompt_input, "Türkçe")
+            if isinstance(generated_video_job, dict):
+                st.success(f"Video isteği alındı (ID: {generated_video_job['video_id']}). İlerleme aşağıda otomatik güncellenir.")
+            else:
+                st.error(generated_video_job)
+
+    # Aktif iş varken panel kendi başına periyodik olarak yenilenir; sayfanın geri kalanı yeniden çalışmaz
+    st.markdown("### Video İşleri:")
+    st.session_state.pop('video_panel_live', None)
+    if has_active_video_jobs(get_video_job_registry().list(limit=20)):
+        st.fragment(run_every=VIDEO_PANEL_REFRESH_SECONDS)(render_video_jobs_panel)()
+        st.session_state.video_panel_live = True
+    else:
+        render_video_jobs_panel()
 
 # --- Sosyal Medya İstatistikleri Bölümü ---
-st.header("Sosyal Medya İstatistikleri")
-st.markdown("<p style='font-size:13px; color:#555;'>*Hesaplarınızı yetkilendirdikten sonra buradan istatistikleri çekebilirsiniz.</p>", unsafe_allow_html=True)
-
-if st.button('İstatistikleri Çek', type="primary", key='fetch_stats_button'):
-    with st.spinner("İstatistikler çekiliyor..."):
-        stats_data = get_social_stats_from_backend()
-    
-    st.markdown("### Toplam Sosyal Medya İstatistikleri:")
+def render_social_stats(stats_data):
+    """Backend istatistik yanıtını çizer."""
     if stats_data and not stats_data.get("error"):
         # Facebook/Instagram Stats
         fb_ig_stats = stats_data.get("facebook_instagram_stats", {})
@@ -500,7 +599,7 @@ if st.button('İstatistikleri Çek', type="primary", key='fetch_stats_button'):
                 st.write(f"- **Sayfa Adı:** {fb_page.get('page_name', 'Bilinmiyor')}")
                 st.write(f"- **Sayfa Beğenileri:** {fb_page.get('page_likes', 'Yok')}")
                 st.write(f"- **Sayfa Takipçileri:** {fb_page.get('page_followers', 'Yok')}")
-            
+
             ig_profile = fb_ig_stats.get("instagram_profile", {})
             if ig_profile:
                 st.write(f"- **Instagram Kullanıcı Adı:** {ig_profile.get('username', 'Bilinmiyor')}")
@@ -529,5 +628,232 @@ if st.button('İstatistikleri Çek', type="primary", key='fetch_stats_button'):
     else:
         st.error(f"İstatistikler çekilirken genel bir hata oluştu: {stats_data.get('error', 'Bilinmeyen hata.')}")
 
+def render_stats_trends(stats_store):
+    """Depodaki metriklerden trend grafiğini çizer (backend'e gitmez)."""
+    selected_metrics = st.multiselect(
+        'Trend Metrikleri:', list(TRACKED_METRICS), default=['instagram_followers', 'youtube_views'], key='stats_trend_metrics'
+    )
+    if not selected_metrics:
+        return
+    series = stats_store.trend(selected_metrics)
+    timestamps = sorted({ts for points in series.values() for ts, _value in points})
+    if len(timestamps) < 2:
+        st.caption("Trend grafiği için en az iki anlık görüntü gerekli.")
+        return
+    by_metric = {metric: dict(points) for metric, points in series.items()}
+    chart_data = {"Zaman": [datetime.fromtimestamp(ts) for ts in timestamps]}
+    for metric in selected_metrics:
+        chart_data[metric] = [by_metric[metric].get(ts) for ts in timestamps]
+    st.line_chart(chart_data, x="Zaman", y=selected_metrics)
+
+def render_stats_panel():
+    """Son anlık görüntüyü hemen gösterir; yenileme bitince paneli günceller."""
+    refresher = get_stats_refresher()
+    snapshot_ts, stats_data = refresher.store.latest_snapshot()
+    if refresher.is_refreshing:
+        st.caption("İstatistikler arka planda güncelleniyor...")
+    elif st.session_state.pop('stats_panel_live', False):
+        # Yenileme bitti (başarılı ya da değil): bölüm yeniden çalışıp paneli zamanlayıcısız çizer.
+        # Bayrak yalnızca panelin kendi zamanlayıcı turlarında görülür (bkz. stats_section).
+        rerun_parent_fragment("stats_section")
+    if refresher.last_error:
+        st.warning(f"Son yenileme başarısız oldu, kayıtlı veriler gösteriliyor: {refresher.last_error}")
+    if stats_data is None:
+        st.info("Henüz kayıtlı istatistik yok. 'İstatistikleri Çek' butonuna tıklayın.")
+        return
+    st.markdown("### Toplam Sosyal Medya İstatistikleri:")
+    st.caption(f"Son güncelleme: {datetime.fromtimestamp(snapshot_ts):%d.%m.%Y %H:%M}")
+    render_social_stats(stats_data)
+    with st.expander("Trendler"):
+        render_stats_trends(refresher.store)
+
+@st.fragment(key="stats_section")
+@timed_section("stats")
+def stats_section():
+    st.header("Sosyal Medya İstatistikleri")
+    st.markdown("<p style='font-size:13px; color:#555;'>*Hesaplarınızı yetkilendirdikten sonra buradan istatistikleri çekebilirsiniz.</p>", unsafe_allow_html=True)
+
+    stats_refresher = get_stats_refresher()
+    if st.button('İstatistikleri Çek', type="primary", key='fetch_stats_button'):
+        stats_refresher.refresh()
+    else:
+        stats_refresher.refresh_if_stale(STATS_MAX_AGE_SECONDS)
+    # Yenileme sürerken panel kendi zamanlayıcısıyla yenilenir; yoksa satır içi çizilir ki önceki
+    # turdan kalan zamanlayıcı iptal edilsin. Bayrak, panelin satır içi çiziminde görünmemesi için
+    # fragment çağrısından sonra konur (bölüm yalnızca zamanlayıcı turlarında yeniden çalıştırılabilir).
+    st.session_state.pop('stats_panel_live', None)
+    if stats_refresher.is_refreshing:
+        st.fragment(run_every=STATS_PANEL_REFRESH_SECONDS)(render_stats_panel)()
+        st.session_state.stats_panel_live = True
+    else:
+        render_stats_panel()
+
+# --- İçerik Arşivi Bölümü ---
+# Üretilen tüm içerikler oturumdan bağımsız olarak arşivlenir; eski bir Bazaraki ilanı veya
+# Instagram metni yeniden üretilmeden bulunur.
+ARCHIVE_KIND_LABELS = {"text": "Metin", "format": "Platform Metni", "youtube": "YouTube Fikri", "vision": "Görsel Yorumu", "image": "Görsel"}
+ARCHIVE_PERIODS = {"Tümü": None, "Son 24 saat": 24 * 3600, "Son 7 gün": 7 * 24 * 3600, "Son 30 gün": 30 * 24 * 3600}
+
+def change_archive_page(step):
+    st.session_state.archive_page = st.session_state.get('archive_page', 1) + step
+
+@st.fragment
+@timed_section("archive")
+def archive_section():
+    st.header("İçerik Arşivi")
+    archive = get_content_archive()
+    facets = archive.facets()
+    archive_query = st.text_input('Arşivde Ara:', placeholder='Örn: Limasol villa havuz', key='archive_query')
+    col_kind, col_platform, col_language, col_period = st.columns(4)
+    with col_kind:
+        archive_kind = st.selectbox('Tür', [""] + facets["kind"], key='archive_kind',
+                                    format_func=lambda kind: ARCHIVE_KIND_LABELS.get(kind, kind) if kind else "Tümü")
+    with col_platform:
+        archive_platform = st.selectbox('Platform', [""] + facets["platform"], key='archive_platform',
+                                        format_func=lambda platform: platform or "Tümü")
+    with col_language:
+        archive_language = st.selectbox('Dil', [""] + facets["language"], key='archive_language',
+                                        format_func=lambda language: language or "Tümü")
+    with col_period:
+        archive_period = st.selectbox('Zaman', list(ARCHIVE_PERIODS), key='archive_period')
+
+    # Arama veya filtre değişince ilk sayfaya dönülür
+    archive_filters = (archive_query, archive_kind, archive_platform, archive_language, archive_period)
+    if st.session_state.get('archive_filters') != archive_filters:
+        st.session_state.archive_filters = archive_filters
+        st.session_state.archive_page = 1
+    period_seconds = ARCHIVE_PERIODS[archive_period]
+    results = archive.search(
+        archive_query, kind=archive_kind or None, platform=archive_platform or None, language=archive_language or None,
+        since=time.time() - period_seconds if period_seconds else None, page=st.session_state.archive_page,
+    )
+    st.session_state.archive_page = results["page"]
+    if not results["total"]:
+        st.caption("Eşleşen arşiv kaydı bulunamadı.")
+        return
+
+    st.caption(f"{results['total']} kayıt · Sayfa {results['page']}/{results['pages']}")
+    for item in results["items"]:
+        item_meta = " · ".join(value for value in (
+            ARCHIVE_KIND_LABELS.get(item["kind"], item["kind"]), item["platform"], item["language"], item["model"],
+            f"{datetime.fromtimestamp(item['created_at']):%d.%m.%Y %H:%M}",
+        ) if value)
+        st.markdown(f"**{item_meta}**  \n{item['snippet'] or item['prompt'][:200]}")
+        with st.expander("Tamamını Göster"):
+            st.caption(f"Prompt: {item['prompt']}")
+            if item["content"]:
+                st.code(item["content"], language='markdown')
+            if get_asset_store().info(item["image_digest"] or ""):
+                render_image_thumbnail(item["image_digest"], functools.partial(get_asset_store().get_bytes, item["image_digest"]),
+                                       "Bağlı Görsel")
+
+    col_prev, col_next = st.columns(2)
+    with col_prev:
+        st.button("◀ Önceki", key='archive_prev_button', disabled=results["page"] <= 1,
+                  on_click=change_archive_page, args=(-1,))
+    with col_next:
+        st.button("Sonraki ▶", key='archive_next_button', disabled=results["page"] >= results["pages"],
+                  on_click=change_archive_page, args=(1,))
+
+# --- Sayfa Düzeni ---
+# Her bölüm bağımsız bir fragment'tır: bir bölümdeki buton veya widget yalnızca o bölümü
+# yeniden çalıştırır (ör. 'Görseli Yorumla' istatistik veya metin bölümlerini yeniden çizmez).
+with st.sidebar:
+    st.toggle("Akışlı çıktı (streaming)", value=True, key="streaming_toggle",
+              help="Metin modelden geldikçe parça parça gösterilir.")
+
+auth_section()
+st.markdown("---")
+text_section()
+format_section()
+image_upload_section()
+image_generation_section()
+youtube_section()
+video_section()
+stats_section()
+archive_section()
+
+# --- Önbellek Durumu (Kenar Çubuğu) ---
+with st.sidebar:
+    with st.expander("Önbellek Durumu"):
+        cache_stats = get_generation_cache().stats.as_dict()
+        st.write(f"- **İsabet:** {cache_stats['hits']}")
+        st.write(f"- **Iskalama:** {cache_stats['misses']}")
+        st.write(f"- **İsabet Oranı:** {cache_stats['hit_ratio']:.0%}")
+        st.write(f"- **Kayıt Sayısı:** {len(get_generation_cache())}")
+    with st.expander("Token Kullanımı"):
+        token_usage = list(get_token_usage_log())
+        if not token_usage:
+            st.caption("Henüz token kullanımı kaydedilmedi.")
+        else:
+            last_usage = token_usage[-1]
+            st.write(f"- **Son çağrı:** {last_usage['prompt_tokens']} girdi / {last_usage['output_tokens']} çıktı token ({last_usage['model']})")
+            st.write(f"- **Ortalama girdi:** {sum(u['prompt_tokens'] for u in token_usage) / len(token_usage):.0f} token ({len(token_usage)} çağrı)")
+            st.write(f"- **Toplam:** {sum(u['prompt_tokens'] for u in token_usage)} girdi / {sum(u['output_tokens'] for u in token_usage)} çıktı token")
+    with st.expander("Çağrı Metrikleri"):
+        # İşlem başına toplamlar, toplam süreye göre sıralı: gecikmeye ve maliyete en çok katkı yapanlar üstte
+        call_summary = get_call_metrics().summary()
+        if not call_summary:
+            st.caption("Henüz sağlayıcı veya backend çağrısı yapılmadı.")
+        else:
+            st.write(f"- **Toplam tahmini maliyet:** ${sum(row['cost'] for row in call_summary):.4f}")
+            st.dataframe(
+                [{
+                    "Çağrı": f"{row['provider']}/{row['operation']}",
+                    "Model": row["model"],
+                    "Adet": row["calls"],
+                    "Önbellek": row["cache_hits"],
+                    "Hata": row["errors"],
+                    "Yeniden Deneme": row["retries"],
+                    "Toplam sn": round(row["duration_seconds"], 2),
+                    "Ort. sn": round(row["avg_seconds"], 2),
+                    "Girdi Token": row["input_tokens"],
+                    "Çıktı Token": row["output_tokens"],
+                    "Maliyet $": round(row["cost"], 4),
+                } for row in call_summary],
+                hide_index=True,
+            )
+            failed_calls = [call for call in get_call_metrics().recent(limit=200) if call["error_class"]]
+            for failed_call in failed_calls[-5:]:
+                st.caption(f"❌ {failed_call['provider']}/{failed_call['operation']}: {failed_call['error_class']}")
+    with st.expander("Model Sağlığı"):
+        model_health = get_model_registry().health_snapshot()
+        if not model_health:
+            st.caption("Modeller ısıtılıyor...")
+        for health_name, health in model_health.items():
+            status_icon = "✅" if health["ok"] else "❌"
+            st.write(f"- {status_icon} **{health_name}:** {health['latency_seconds']:.2f} sn {health['error'][:120]}")
+    with st.expander("Metin Yönlendirme"):
+        # Birincil rota p95 süresinde yanıt vermezse yedek rotaya hedged istek gönderilir
+        router_stats = get_text_router().stats()
+        st.write(f"- **İstek:** {router_stats['requests']} · **Hedged:** {router_stats['hedges']} · **Yedeğe geçiş:** {router_stats['fallbacks']}")
+        for route_stat in router_stats["routes"]:
+            state_icon = {"closed": "✅", "half_open": "⚠️"}.get(route_stat["state"], "❌")
+            p95_text = "-" if route_stat["p95_seconds"] is None else f"{route_stat['p95_seconds']:.2f} sn"
+            st.write(
+                f"- {state_icon} **{route_stat['name']}:** {route_stat['wins']} yanıt · {route_stat['errors']} hata "
+                f"· p95 {p95_text} · hedge eşiği {route_stat['hedge_delay_seconds']:.1f} sn"
+            )
+    with st.expander("Çalışma Süreleri"):
+        # Bölüm süreleri son çalıştırmalarındandır; fragment yeniden çalıştırmaları kenar çubuğunu güncellemez
+        for section_name, section_ms in st.session_state.get('section_timings', {}).items():
+            st.write(f"- **{section_name}:** {section_ms:.1f} ms")
+        full_run_ms = (time.perf_counter() - SCRIPT_STARTED) * 1000
+        logger.info("Tam sayfa çalıştırma süresi: %.1f ms", full_run_ms)
+        st.write(f"- **Tam sayfa (kenar çubuğuna kadar):** {full_run_ms:.1f} ms")
+    with st.expander("Hız Sınırlayıcı"):
+        limiter_stats = all_rate_limiter_stats()
+        if not limiter_stats:
+            st.caption("Henüz model çağrısı yapılmadı.")
+        for limiter_name, limiter_stat in limiter_stats.items():
+            st.write(
+                f"- **{limiter_name}:** kuyruk {limiter_stat['queue_depth']} · ort. bekleme {limiter_stat['avg_wait_seconds']:.2f} sn "
+                f"· en uzun {limiter_stat['max_wait_seconds']:.2f} sn · 429 {limiter_stat['rate_limit_errors']} · yeniden deneme {limiter_stat['retries']}"
+            )
+
 st.markdown("---")
-st.markdown("Developed with ❤️ by Premium Home AI Assistant")
\ No newline at end of file
+st.markdown("Developed with ❤️ by Premium Home AI Assistant")
+
+# Sayfa çizildikten sonra modeller arka planda ısıtılır (süreç başına bir kez); SDK import'ları
+# ilk sayfa çizimini geciktirmez
+warm_up_models()
\ No newline at end of file
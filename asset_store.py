@@ -0,0 +1,106 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# --- İçerik Adresli Yerel Varlık Deposu ---
+# Üretilen görseller baytlarının SHA-256 özetiyle tek bir kez diske yazılır
+# (.assets/ab/abcdef....png). Sayfa ve indirme butonu doğrudan bu dosyadan beslenir.
+# Ayrıca (prompt anahtarı -> özet) eşlemesi tutulur; aynı prompt tekrar geldiğinde
+# görsel yeniden üretilmez.
+
+DEFAULT_ASSET_DIR = os.environ.get("ASSET_STORE_DIR", ".assets")
+
+MIME_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+}
+
+
+class AssetStore:
+    """Dosya sistemi üzerinde içerik adresli varlık deposu."""
+
+    def __init__(self, root=DEFAULT_ASSET_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS assets (
+                digest TEXT PRIMARY KEY,
+                mime TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS asset_aliases (
+                alias TEXT PRIMARY KEY,
+                digest TEXT NOT NULL REFERENCES assets(digest),
+                created_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def path_for(self, digest, mime="image/png"):
+        """Özete karşılık gelen dosya yolunu döndürür."""
+        extension = MIME_EXTENSIONS.get(mime, "bin")
+        return os.path.join(self.root, digest[:2], f"{digest}.{extension}")
+
+    def put(self, data, mime="image/png", alias=None):
+        """
+        Baytları depoya yazar (zaten varsa yeniden yazmaz) ve özeti döndürür.
+        alias verilirse (ör. prompt anahtarı) bu özete bağlanır.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest, mime)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Yarım yazılmış dosya okunmasın diye önce geçici dosyaya yaz, sonra taşı
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO assets (digest, mime, size, created_at) VALUES (?, ?, ?, ?)",
+                (digest, mime, len(data), now),
+            )
+            if alias:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO asset_aliases (alias, digest, created_at) VALUES (?, ?, ?)",
+                    (alias, digest, now),
+                )
+            self._conn.commit()
+        return digest
+
+    def info(self, digest):
+        """Varlık bilgisini (mime, boyut, yol) döndürür; yoksa veya dosya silinmişse None."""
+        with self._lock:
+            row = self._conn.execute("SELECT mime, size FROM assets WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+        mime, size = row
+        path = self.path_for(digest, mime)
+        if not os.path.exists(path):
+            return None
+        return {"digest": digest, "mime": mime, "size": size, "path": path}
+
+    def get_bytes(self, digest):
+        info = self.info(digest)
+        if info is None:
+            return None
+        with open(info["path"], "rb") as f:
+            return f.read()
+
+    def lookup_alias(self, alias):
+        """alias'a bağlı ve diskte hâlâ bulunan varlığın özetini döndürür."""
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM asset_aliases WHERE alias = ?", (alias,)).fetchone()
+        if row is None or self.info(row[0]) is None:
+            return None
+        return row[0]
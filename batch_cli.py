@@ -0,0 +1,295 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from generation import (
+    LANGUAGE_OPTIONS, PLATFORM_OPTIONS, format_text_for_social_media, generate_image_dalle,
+    generate_text_gemini_flash, generate_youtube_idea_gemini, get_asset_store, get_content_archive, get_model_registry,
+    is_cacheable_result,
+)
+from instrumentation import get_call_metrics
+from model_registry import OPENAI_KEY_MISSING
+
+# --- Toplu İçerik Takvimi Üretimi (Streamlit'siz) ---
+# CSV veya JSONL içerik takvimindeki her satır için metin (dil başına), platform formatları,
+# isteğe bağlı YouTube fikri ve görsel üretir. Satırlar sınırlı bir worker havuzunda işlenir,
+# her biten satır hemen çıktı JSONL dosyasına yazılır. Yeniden başlatıldığında çıktıda bulunan
+# satırlar atlanır (--retry-failed ile yalnızca hatalı satırlar yeniden denenir).
+#
+# Takvim sütunları: prompt (zorunlu), id, languages, platforms, youtube, image, image_prompt.
+# Liste sütunlarında ayraç olarak ';', '|' veya ',' kullanılabilir; JSONL'de liste de verilebilir.
+#
+#   python batch_cli.py takvim.csv -o sonuclar.jsonl --workers 4
+
+DEFAULT_WORKERS = int(os.environ.get("BATCH_WORKERS", "4"))
+LIST_SEPARATOR = re.compile(r"[;|,]")
+TRUE_VALUES = {"1", "true", "yes", "y", "evet", "e", "x"}
+IMAGE_PROMPT_SUFFIX = " Sosyal medya gönderisi için akılda kalıcı, profesyonel ve modern bir görsel olsun."
+
+
+def parse_list(value, default):
+    """Sütun değerini listeye çevirir; boşsa varsayılanı döndürür."""
+    if isinstance(value, list):
+        items = [str(item).strip() for item in value]
+    else:
+        items = [item.strip() for item in LIST_SEPARATOR.split(str(value or ""))]
+    items = [item for item in items if item]
+    return list(dict.fromkeys(items)) or list(default)
+
+
+def parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+
+def read_calendar(path):
+    """Takvim dosyasını (.jsonl/.json satır başına bir nesne, aksi halde CSV) ham satırlar olarak okur."""
+    if path.lower().endswith((".jsonl", ".json")):
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        raw = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"{line_no}. satır geçerli JSON değil: {e}") from e
+                    yield line_no, raw
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for line_no, raw in enumerate(csv.DictReader(f), start=2):
+                yield line_no, raw
+
+
+def normalize_row(raw, line_no, default_languages, default_platforms):
+    """Ham takvim satırını işlenecek biçime çevirir; satır nesne değilse veya prompt yoksa ValueError fırlatır."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"{line_no}. satır bir JSON nesnesi değil ({type(raw).__name__}).")
+    raw = {str(key).strip().lower(): value for key, value in raw.items() if key is not None}
+    prompt = str(raw.get("prompt") or "").strip()
+    if not prompt:
+        raise ValueError(f"{line_no}. satırda 'prompt' boş.")
+    row = {
+        "prompt": prompt,
+        "languages": parse_list(raw.get("languages"), default_languages),
+        "platforms": parse_list(raw.get("platforms"), default_platforms),
+        "youtube": parse_flag(raw.get("youtube")),
+        "image": parse_flag(raw.get("image")) or bool(str(raw.get("image_prompt") or "").strip()),
+        "image_prompt": str(raw.get("image_prompt") or "").strip(),
+    }
+    # Açık id yoksa satır içeriğinden türetilir; takvim yeniden sıralansa da devam etme çalışır
+    row_id = str(raw.get("id") or "").strip()
+    if not row_id:
+        row_id = hashlib.sha256(json.dumps(row, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    row["row_id"] = row_id
+    return row
+
+
+def load_finished_row_ids(output_path, retry_failed=False):
+    """
+    Çıktı dosyasında tamamlanmış satırların id'lerini döndürür. retry_failed=True ise hatalı
+    satırlar tamamlanmış sayılmaz. Yarım yazılmış son satır (çökme) yok sayılır.
+    """
+    finished = {}
+    if not os.path.exists(output_path):
+        return set()
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and record.get("row_id"):
+                # Aynı satır birden çok kez yazıldıysa son kayıt geçerlidir
+                finished[record["row_id"]] = record.get("status")
+    return {row_id for row_id, status in finished.items() if status == "ok" or not retry_failed}
+
+
+def process_row(row):
+    """Tek takvim satırı için tüm içerikleri üretir; çıktı kaydını (dict) döndürür."""
+    started = time.perf_counter()
+    record = {
+        "row_id": row["row_id"],
+        "prompt": row["prompt"],
+        "languages": row["languages"],
+        "platforms": row["platforms"],
+        "texts": {},
+        "formats": {},
+        "youtube_idea": None,
+        "image": None,
+        "errors": [],
+    }
+    for language in row["languages"]:
+        text = generate_text_gemini_flash(row["prompt"], language)
+        record["texts"][language] = text
+        if not is_cacheable_result(text):
+            record["errors"].append(f"text/{language}: {text}")
+            continue
+        record["formats"][language] = {}
+        for platform in row["platforms"]:
+            formatted = format_text_for_social_media(text, platform, language)
+            record["formats"][language][platform] = formatted
+            if not is_cacheable_result(formatted):
+                record["errors"].append(f"format/{language}/{platform}: {formatted}")
+
+    if row["youtube"]:
+        idea = generate_youtube_idea_gemini(row["prompt"], row["languages"][0])
+        record["youtube_idea"] = idea
+        if not is_cacheable_result(idea):
+            record["errors"].append(f"youtube: {idea}")
+
+    if row["image"]:
+        image_prompt = row["image_prompt"]
+        if not image_prompt:
+            first_text = record["texts"].get(row["languages"][0])
+            image_prompt = f"{first_text}{IMAGE_PROMPT_SUFFIX}" if is_cacheable_result(first_text) else row["prompt"]
+        digest = generate_image_dalle(image_prompt)
+        info = get_asset_store().info(digest)
+        if info:
+            record["image"] = {"digest": info["digest"], "path": info["path"], "mime": info["mime"]}
+            # Satırın metinleri ve formatları arşivde bu görsele bağlanır
+            archive = get_content_archive()
+            for language, text in record["texts"].items():
+                archive.attach_image(text, digest)
+                for formatted in record["formats"].get(language, {}).values():
+                    archive.attach_image(formatted, digest)
+        else:
+            record["errors"].append(f"image: {digest}")
+
+    record["status"] = "error" if record["errors"] else "ok"
+    record["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+class JsonlWriter:
+    """Kayıtları satır satır ekler; her satır yazıldıktan sonra diske aktarılır."""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def run_batch(rows, output_path, workers=DEFAULT_WORKERS, log=None):
+    """
+    Satırları en fazla `workers` eşzamanlı işle üretir; biten her satırı hemen yazar.
+    Kuyrukta en fazla 2 × workers satır bekler, böylece büyük takvimler belleği şişirmez.
+    {"ok": n, "error": n, "seconds": s} özetini döndürür.
+    """
+    log = log or (lambda message: print(message, file=sys.stderr))
+    workers = max(1, workers)
+    total = len(rows)
+    summary = {"ok": 0, "error": 0}
+    started = time.perf_counter()
+    writer = JsonlWriter(output_path)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-worker") as executor:
+            pending = {}
+            row_iter = iter(rows)
+            done_count = 0
+            while True:
+                while len(pending) < workers * 2:
+                    row = next(row_iter, None)
+                    if row is None:
+                        break
+                    pending[executor.submit(process_row, row)] = row
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    row = pending.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        record = {"row_id": row["row_id"], "prompt": row["prompt"], "status": "error",
+                                  "errors": [f"{type(e).__name__}: {e}"]}
+                    record["completed_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                    writer.write(record)
+                    summary[record["status"]] += 1
+                    done_count += 1
+                    log(f"[{done_count}/{total}] {record['row_id']} {record['status']}"
+                        + (f" ({record['errors'][0][:120]})" if record["errors"] else ""))
+    finally:
+        writer.close()
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="İçerik takviminden toplu sosyal medya içeriği üretir.")
+    parser.add_argument("calendar", help="Takvim dosyası (.csv veya .jsonl)")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="Sonuçların ekleneceği JSONL dosyası")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="Eşzamanlı işlenecek satır sayısı")
+    parser.add_argument("--languages", default=LANGUAGE_OPTIONS[0],
+                        help="Satırda dil belirtilmediğinde kullanılacak diller (ör. 'Türkçe;English')")
+    parser.add_argument("--platforms", default="",
+                        help=f"Satırda platform belirtilmediğinde kullanılacak platformlar (ör. '{PLATFORM_OPTIONS[0]};{PLATFORM_OPTIONS[2]}')")
+    parser.add_argument("--retry-failed", action="store_true", help="Çıktıda hatalı görünen satırları yeniden üret")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    default_languages = parse_list(args.languages, LANGUAGE_OPTIONS[:1])
+    default_platforms = parse_list(args.platforms, [])
+
+    rows, seen = [], {}
+    try:
+        for line_no, raw in read_calendar(args.calendar):
+            row = normalize_row(raw, line_no, default_languages, default_platforms)
+            if row["row_id"] not in seen:
+                seen[row["row_id"]] = (line_no, row)
+                rows.append(row)
+            elif seen[row["row_id"]][1] != row:
+                # Aynı içerikli tekrar atlanır; aynı id ile farklı içerik sessizce üretilmeden kalmasın
+                raise ValueError(f"id '{row['row_id']}' {seen[row['row_id']][0]}. ve {line_no}. satırlarda farklı içerikle kullanılmış.")
+    except (OSError, ValueError) as e:
+        print(f"Hata: Takvim okunamadı: {e}", file=sys.stderr)
+        return 2
+
+    finished = load_finished_row_ids(args.output, retry_failed=args.retry_failed)
+    todo = [row for row in rows if row["row_id"] not in finished]
+    print(f"{len(rows)} satır, {len(rows) - len(todo)} tanesi zaten tamamlanmış, {len(todo)} işlenecek.", file=sys.stderr)
+    if not todo:
+        return 0
+
+    # Yalnızca işi baştan imkânsız kılan eksikler durdurur: görsel satırları OpenAI anahtarı ister,
+    # metin rotalarından biri için anahtar yeterlidir. Diğer eksikler ilgili satırda hata olarak kaydedilir.
+    missing_keys = get_model_registry().missing_keys()
+    blocking = list(missing_keys) if len(missing_keys) == 2 else []
+    if OPENAI_KEY_MISSING in missing_keys and not blocking and any(row["image"] for row in todo):
+        blocking.append(OPENAI_KEY_MISSING)
+    for message in blocking:
+        print(f"Hata: {message}", file=sys.stderr)
+    if blocking:
+        return 2
+
+    summary = run_batch(todo, args.output, workers=args.workers)
+    print(f"Bitti: {summary['ok']} başarılı, {summary['error']} hatalı, {summary['seconds']:.1f} sn.", file=sys.stderr)
+    for row in get_call_metrics().summary():
+        print(f"  {row['provider']}/{row['operation']} ({row['model'] or '-'}): {row['calls']} çağrı, "
+              f"{row['cache_hits']} önbellek, {row['errors']} hata, {row['duration_seconds']:.1f} sn, ${row['cost']:.4f}", file=sys.stderr)
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+# --- Benchmark İçin Yerel Sahte Sağlayıcılar ---
+# Gemini generate_content, OpenAI images.generate/chat.completions ve backend'in /api/generate_video,
+# /api/social_stats uçlarını taklit eder. Gecikme, 429 oranı ve soğuk başlangıç
+# LatencyProfile ile ayarlanır; gerçek kota harcanmadan benchmark.py bunları kullanır.
+
+# 1×1 şeffaf PNG (DALL-E b64_json yanıtı yerine)
+TINY_PNG_B64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+
+
+class LatencyProfile:
+    """
+    Sahte bir sağlayıcının gecikme davranışı: ortalama ± sapma, ilk `cold_start_calls` çağrıya
+    eklenen soğuk başlangıç süresi, `rate_limit_ratio` olasılıkla dönen 429 yanıtları ve
+    `tail_ratio` olasılıkla `tail_seconds` eklenen yavaş (kuyruk) yanıtlar.
+    """
+
+    def __init__(self, mean_seconds=0.05, jitter_seconds=0.01, rate_limit_ratio=0.0, retry_after_seconds=0.1,
+                 cold_start_seconds=0.0, cold_start_calls=1, output_chars=800, seed=None,
+                 tail_ratio=0.0, tail_seconds=0.0):
+        self.mean_seconds = mean_seconds
+        self.jitter_seconds = jitter_seconds
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after_seconds = retry_after_seconds
+        self.cold_start_seconds = cold_start_seconds
+        self.cold_start_calls = cold_start_calls
+        self.output_chars = output_chars
+        self.tail_ratio = tail_ratio
+        self.tail_seconds = tail_seconds
+        self.calls = 0
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next_call(self):
+        """Bir çağrıyı kaydeder; (gecikme_sn, 429_dönsün_mü) döndürür."""
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._random.gauss(self.mean_seconds, self.jitter_seconds))
+            if self.calls <= self.cold_start_calls:
+                delay += self.cold_start_seconds
+            if self._random.random() < self.tail_ratio:
+                delay += self.tail_seconds
+            rate_limited = self._random.random() < self.rate_limit_ratio
+            if rate_limited:
+                self.rate_limited += 1
+        return delay, rate_limited
+
+
+class FakeRateLimitError(Exception):
+    """Gemini/OpenAI 429 hatalarını taklit eder (rate_limiter.is_rate_limit_error tarafından tanınır)."""
+
+    status_code = 429
+
+    def __init__(self, retry_after_seconds):
+        super().__init__(f"429 Resource has been exhausted (retry_delay {retry_after_seconds}s)")
+
+
+def _fake_text(prompt, length):
+    seed_text = f"Premium Home · {prompt[:60]} · "
+    return (seed_text * (length // len(seed_text) + 1))[:length]
+
+
+class FakeGeminiResponse:
+    """generate_content yanıtı; stream=True için parça parça gezilebilir."""
+
+    def __init__(self, text, prompt_tokens, chunks=None, chunk_delay=0.0):
+        self.text = text
+        self.usage_metadata = SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=max(1, len(text) // 4))
+        self._chunks = chunks
+        self._chunk_delay = chunk_delay
+
+    def __iter__(self):
+        for chunk in self._chunks or [self.text]:
+            time.sleep(self._chunk_delay)
+            yield SimpleNamespace(text=chunk)
+
+
+class FakeGeminiModel:
+    def __init__(self, model_name, profile, system_instruction=None):
+        self.model_name = model_name
+        self.profile = profile
+        self.system_instruction = system_instruction or ""
+
+    def generate_content(self, contents, stream=False, generation_config=None, **kwargs):
+        parts = contents if isinstance(contents, list) else [contents]
+        prompt = " ".join(part for part in parts if isinstance(part, str))
+        delay, rate_limited = self.profile.next_call()
+        time.sleep(delay)
+        if rate_limited:
+            raise FakeRateLimitError(self.profile.retry_after_seconds)
+        prompt_tokens = max(1, (len(prompt) + len(self.system_instruction)) // 4)
+        if (generation_config or {}).get("response_mime_type") == "application/json":
+            # Çoklu dil isteği: prompt'taki JSON dil listesini anahtar olarak kullan
+            match = re.search(r"\[[^\[\]]*\]", prompt)
+            languages = json.loads(match.group(0)) if match else []
+            text = json.dumps({language: _fake_text(f"{language} {prompt}", self.profile.output_chars) for language in languages},
+                              ensure_ascii=False)
+            return FakeGeminiResponse(text, prompt_tokens)
+        text = _fake_text(prompt, self.profile.output_chars)
+        if stream:
+            chunks = [text[i:i + 80] for i in range(0, len(text), 80)]
+            return FakeGeminiResponse(text, prompt_tokens, chunks=chunks, chunk_delay=self.profile.mean_seconds / 20)
+        return FakeGeminiResponse(text, prompt_tokens)
+
+
+class FakeImages:
+    def __init__(self, profile):
+        self.profile = profile
+
+    def generate(self, model, prompt, n=1, size="1024x1024", response_format="url", **kwargs):
+        delay, rate_limited = self.profile.next_call()
+        time.sleep(delay)
+        if rate_limited:
+            raise FakeRateLimitError(self.profile.retry_after_seconds)
+        return SimpleNamespace(data=[SimpleNamespace(b64_json=TINY_PNG_B64, url=None) for _ in range(n)])
+
+
+class FakeChatCompletions:
+    """OpenAI chat.completions.create taklidi (metin rotası yedeği için)."""
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def create(self, model, messages, **kwargs):
+        prompt = " ".join(message["content"] for message in messages if message["role"] == "user")
+        delay, rate_limited = self.profile.next_call()
+        time.sleep(delay)
+        if rate_limited:
+            raise FakeRateLimitError(self.profile.retry_after_seconds)
+        text = _fake_text(prompt, self.profile.output_chars)
+        prompt_tokens = max(1, sum(len(message["content"]) for message in messages) // 4)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=max(1, len(text) // 4)),
+        )
+
+
+class FakeModelRegistry:
+    """ModelRegistry ile aynı arayüz; generation.use_model_registry() ile devreye alınır."""
+
+    def __init__(self, gemini_profile, openai_profile):
+        self.gemini_profile = gemini_profile
+        self.openai_profile = openai_profile
+        self.openai_client = SimpleNamespace(
+            images=FakeImages(openai_profile), chat=SimpleNamespace(completions=FakeChatCompletions(openai_profile)),
+        )
+        self.health = {}
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def gemini(self, model_name, system_instruction=None):
+        key = (model_name, system_instruction)
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = FakeGeminiModel(model_name, self.gemini_profile, system_instruction)
+            return self._models[key]
+
+    def missing_keys(self):
+        return []
+
+    def warm_up(self, gemini_models=(), openai_models=()):
+        return self.health_snapshot()
+
+    def health_snapshot(self):
+        return dict(self.health)
+
+    def warm_up_async(self, gemini_models=(), openai_models=()):
+        return None
+
+
+# --- Sahte Backend ---
+SAMPLE_SOCIAL_STATS = {
+    "facebook_instagram_stats": {
+        "facebook_page": {"page_likes": 1520, "page_followers": 1610},
+        "instagram_profile": {"followers_count": 2840, "media_count": 212},
+    },
+    "youtube_stats": {"channel": {"subscriber_count": 340, "view_count": 51200, "video_count": 48}},
+}
+
+
+class _StubBackendHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _delay_or_rate_limit(self):
+        """Profil gecikmesini uygular; 429 gönderildiyse True döndürür."""
+        delay, rate_limited = self.server.profile.next_call()
+        time.sleep(delay)
+        if rate_limited:
+            self._send_json({"error": "rate limited"}, status=429,
+                            headers={"Retry-After": str(self.server.profile.retry_after_seconds)})
+        return rate_limited
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        if self._delay_or_rate_limit():
+            return
+        if self.path != "/api/generate_video":
+            self._send_json({"error": "not found"}, status=404)
+            return
+        video_id = uuid.uuid4().hex[:12]
+        self.server.video_created_at[video_id] = time.time()
+        self._send_json({
+            "video_id": video_id,
+            "status_url": f"/api/video_status/{video_id}",
+            "message": "Video isteği alındı.",
+            "estimated_time": f"{self.server.video_seconds:.0f} sn",
+        })
+
+    def do_GET(self):
+        if self._delay_or_rate_limit():
+            return
+        if self.path == "/api/social_stats":
+            self._send_json(SAMPLE_SOCIAL_STATS)
+        elif self.path.startswith("/api/video_status/"):
+            video_id = self.path.rsplit("/", 1)[-1]
+            created_at = self.server.video_created_at.get(video_id)
+            if created_at is None:
+                self._send_json({"error": "unknown video"}, status=404)
+                return
+            progress = min(1.0, (time.time() - created_at) / max(self.server.video_seconds, 0.001))
+            status = "completed" if progress >= 1 else "processing"
+            self._send_json({"status": status, "progress_fraction": progress,
+                             "video_url": f"https://example.invalid/{video_id}.mp4" if status == "completed" else None})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+
+class StubBackend:
+    """127.0.0.1 üzerinde rastgele bir portta çalışan sahte backend."""
+
+    def __init__(self, profile, video_seconds=2.0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubBackendHandler)
+        self.server.daemon_threads = True
+        self.server.profile = profile
+        self.server.video_seconds = video_seconds
+        self.server.video_created_at = {}
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stub-backend", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,288 @@
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from bench_fakes import FakeModelRegistry, LatencyProfile, StubBackend
+
+# --- Çevrimdışı Benchmark ---
+# Uygulamanın üretim fonksiyonlarını (generation.py), HTTP istemcisini ve yerel depoları yerel
+# sahte sağlayıcılara karşı eşzamanlı yük altında çalıştırır. Senaryo başına p50/p95/p99 gecikme,
+# işlem hacmi, önbellek isabet oranı ve en yüksek bellek kullanımı raporlanır. --json ile sonuçlar
+# kaydedilir, --baseline ile önceki bir çalıştırmaya göre gerileme kontrol edilir.
+#
+#   python benchmark.py --requests 200 --concurrency 16 --rate-limit-ratio 0.05 --json sonuc.json
+#   python benchmark.py --baseline sonuc.json --tolerance 0.25
+#   python benchmark.py --scenarios text,format_all --tail-ratio 0.05 --tail-latency 2   # hedged istek etkisi
+
+# Uygulamanın kalıcı depoları (ortam değişkeni → benchmark dizinindeki ad). Benchmark hiçbir zaman
+# kullanıcının .cache/.assets dizinlerine yazmamalıdır; yeni bir depo eklendiğinde buraya da
+# eklenir (test_benchmark.py eksik kalanı yakalar).
+STORE_PATH_ENV = {
+    "GENERATION_CACHE_PATH": "generation_cache.sqlite3",
+    "ASSET_STORE_DIR": "assets",
+    "NEAR_DUPLICATE_INDEX_PATH": "prompt_index.sqlite3",
+    "CONTENT_ARCHIVE_PATH": "content_archive.sqlite3",
+    "STATS_STORE_PATH": "social_stats.sqlite3",
+    "VIDEO_JOBS_PATH": "video_jobs.sqlite3",
+}
+
+SCENARIOS = ("text", "text_stream", "multilang", "multilang_single", "format_all", "youtube", "vision", "image", "renditions",
+             "video", "stats")
+
+
+def percentile(sorted_values, fraction):
+    """Sıralı listede doğrusal aradeğerlemeli yüzdelik."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # Linux'ta ru_maxrss KB, macOS'ta bayt cinsindendir
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def prompt_for(scenario, index, unique_prompts):
+    return f"{scenario} benchmark isteği #{index % unique_prompts}"
+
+
+def is_error_result(result):
+    return isinstance(result, str) and result.startswith("Hata:")
+
+
+def build_scenarios(generation, backend_url, work_dir, unique_prompts):
+    """{senaryo: fn(prompt)} döndürür; her fn uygulamanın gerçek kod yolunu çalıştırır."""
+    from http_client import get_http_client
+    from image_pipeline import content_hash
+    from stats_store import StatsStore
+    from video_jobs import VideoJobRegistry
+
+    video_registry = VideoJobRegistry(os.path.join(work_dir, STORE_PATH_ENV["VIDEO_JOBS_PATH"]))
+    stats_store = StatsStore(os.path.join(work_dir, STORE_PATH_ENV["STATS_STORE_PATH"]))
+    images = {}
+
+    def sample_image(prompt):
+        # Yüklenen fotoğraf boyutunda, prompt başına farklı bir görsel (küçültme yolu da ölçülür);
+        # görseller ölçüm dışında, ilk kullanımdan önce üretilir
+        if prompt not in images:
+            from PIL import Image
+            color = tuple(zlib.crc32(prompt.encode("utf-8")) >> shift & 0xFF for shift in (0, 8, 16))
+            buffer = io.BytesIO()
+            Image.new("RGB", (3000, 2000), color).save(buffer, format="JPEG", quality=90)
+            images[prompt] = buffer.getvalue()
+        return images[prompt]
+
+    for index in range(unique_prompts):
+        sample_image(prompt_for("vision", index, unique_prompts))
+        sample_image(prompt_for("renditions", index, unique_prompts))
+
+    def video(prompt):
+        response = get_http_client().post(f"{backend_url}/api/generate_video",
+                                          json={"video_prompt_text": prompt, "target_language": "Türkçe"}).json()
+        return video_registry.add(response["video_id"], prompt, response.get("status_url"), response.get("message", ""))
+
+    def stats(_prompt):
+        return stats_store.record_snapshot(get_http_client().get(f"{backend_url}/api/social_stats").json())
+
+    def multilang(mode):
+        def run(prompt):
+            results, _report = generation.generate_text_multilanguage(prompt, generation.LANGUAGE_OPTIONS, mode)
+            return next((result for result in results.values() if is_error_result(result)), "")
+        return run
+
+    def renditions(prompt):
+        # Yüklenen fotoğrafın tüm platform sürümleri; tekrar eden prompt'lar önbellekten gelir
+        source = sample_image(prompt)
+        generation.get_rendition_pipeline().renditions(content_hash(source), lambda: source)
+        return ""
+
+    def image(prompt):
+        digest = generation.generate_image_dalle(prompt)
+        return digest if generation.get_asset_store().info(digest) else f"Hata: {digest}"
+
+    return {
+        "text": lambda prompt: generation.generate_text_gemini_flash(prompt, "Türkçe"),
+        "text_stream": lambda prompt: generation.stream_text_gemini_flash(prompt, "Türkçe", lambda partial: None)[0],
+        "multilang": multilang("parallel"),
+        "multilang_single": multilang("single"),
+        "format_all": lambda prompt: next((text for _platform, text in generation.format_text_for_all_platforms(prompt, "Türkçe")
+                                           if is_error_result(text)), ""),
+        "youtube": lambda prompt: generation.generate_youtube_idea_gemini(prompt, "Türkçe"),
+        "vision": lambda prompt: generation.interpret_image_gemini_vision(sample_image(prompt), prompt),
+        "image": image,
+        "renditions": renditions,
+        "video": video,
+        "stats": stats,
+    }
+
+
+def run_scenario(name, func, total_requests, concurrency, unique_prompts, cache):
+    """Senaryoyu eşzamanlı çalıştırır ve ölçümleri döndürür."""
+    prompts = [prompt_for(name, i, unique_prompts) for i in range(total_requests)]
+    before = cache.stats.as_dict()
+
+    def timed(prompt):
+        started = time.perf_counter()
+        try:
+            error = is_error_result(func(prompt))
+        except Exception:
+            error = True
+        return time.perf_counter() - started, error
+
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"bench-{name}") as executor:
+        outcomes = list(executor.map(timed, prompts))
+    wall = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+
+    after = cache.stats.as_dict()
+    hits = after["hits"] - before["hits"]
+    lookups = hits + after["misses"] - before["misses"]
+    latencies = sorted(latency for latency, _error in outcomes)
+    return {
+        "requests": total_requests,
+        "errors": sum(1 for _latency, error in outcomes if error),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "throughput_rps": total_requests / wall if wall else 0.0,
+        "cache_hit_ratio": hits / lookups if lookups else None,
+        "peak_traced_mb": peak / (1024 * 1024),
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """p95 artışı veya işlem hacmi düşüşü toleransı aşan senaryoları döndürür."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.1f} → {current['p95_ms']:.1f} ms")
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: işlem hacmi {previous['throughput_rps']:.1f} → {current['throughput_rps']:.1f} istek/sn")
+    return regressions
+
+
+def print_report(results):
+    print(f"{'senaryo':<17}{'istek':>6}{'hata':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'istek/sn':>10}{'önbellek':>10}{'bellek MB':>11}")
+    for name, row in results["scenarios"].items():
+        hit_ratio = "-" if row["cache_hit_ratio"] is None else f"{row['cache_hit_ratio']:.0%}"
+        print(f"{name:<17}{row['requests']:>6}{row['errors']:>6}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+              f"{row['throughput_rps']:>10.1f}{hit_ratio:>10}{row['peak_traced_mb']:>11.1f}")
+    print(f"Başlangıç (import + kurulum): {results['startup_seconds'] * 1000:.0f} ms · "
+          f"En yüksek RSS: {results['peak_rss_mb'] or 0:.0f} MB · 429 (sahte sağlayıcılar): {results['rate_limited']}")
+    router = results["text_router"]
+    print(f"Metin yönlendirici: {router['requests']} istek · {router['hedges']} hedged · {router['fallbacks']} yedeğe geçiş · "
+          + ", ".join(f"{route['name']} {route['wins']} yanıt" for route in router["routes"]))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Sahte sağlayıcılarla çevrimdışı gecikme/işlem hacmi benchmark'ı.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Virgülle ayrılmış senaryolar ({', '.join(SCENARIOS)})")
+    parser.add_argument("--requests", type=int, default=60, help="Senaryo başına istek sayısı")
+    parser.add_argument("--concurrency", type=int, default=8, help="Eşzamanlı istek sayısı")
+    parser.add_argument("--unique-prompts", type=int, default=20, help="Farklı prompt sayısı (kalanlar önbellekten gelir)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Sahte sağlayıcı ortalama gecikmesi (sn)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Gecikme standart sapması (sn)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429 dönen çağrı oranı (0-1)")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="429 yanıtlarındaki bekleme önerisi (sn)")
+    parser.add_argument("--cold-start", type=float, default=0.5, help="İlk çağrılara eklenen soğuk başlangıç süresi (sn)")
+    parser.add_argument("--cold-start-calls", type=int, default=3, help="Soğuk başlangıçtan etkilenen ilk çağrı sayısı")
+    parser.add_argument("--tail-ratio", type=float, default=0.0, help="Yavaş (kuyruk) yanıt oranı (0-1)")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="Yavaş yanıtlara eklenen süre (sn)")
+    parser.add_argument("--keep-rate-limits", action="store_true",
+                        help="Uygulamanın RPM/TPM sınırlarını koru (varsayılan: sınırlayıcı ölçümü bastırmasın diye yükseltilir)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki JSON sonucu")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="İzin verilen gerileme oranı (ör. 0.25 = %%25)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scenario_names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenario_names) - set(SCENARIOS)
+    if unknown:
+        print(f"Hata: Bilinmeyen senaryo: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    work_dir = tempfile.mkdtemp(prefix="premiumhome-bench-")
+    # Modüller yapılandırmayı import sırasında okuduğu için ortam, import'tan önce hazırlanır.
+    # Tüm depolar geçici dizine yönlendirilir; benchmark prompt'ları gerçek önbelleğe, yakın-kopya
+    # indeksine veya içerik arşivine girmez.
+    for env_name, file_name in STORE_PATH_ENV.items():
+        os.environ[env_name] = os.path.join(work_dir, file_name)
+    os.environ.setdefault("RATE_LIMIT_BACKOFF_BASE", str(args.retry_after))
+    if not args.keep_rate_limits:
+        os.environ["RATE_LIMITS"] = json.dumps({
+            name: {"rpm": 1_000_000, "tpm": None}
+            for name in ("gemini/gemini-2.0-flash", "gemini/gemini-1.5-flash", "openai/dall-e-3", "openai/gpt-4o-mini")
+        })
+
+    def profile(seed_offset):
+        return LatencyProfile(args.latency, args.jitter, args.rate_limit_ratio, args.retry_after,
+                              args.cold_start, args.cold_start_calls, seed=args.seed + seed_offset,
+                              tail_ratio=args.tail_ratio, tail_seconds=args.tail_latency)
+
+    gemini_profile, openai_profile, backend_profile = profile(0), profile(1), profile(2)
+    backend = StubBackend(backend_profile).start()
+    tracemalloc.start()
+    try:
+        startup_started = time.perf_counter()
+        import generation
+        generation.use_model_registry(FakeModelRegistry(gemini_profile, openai_profile))
+        cache = generation.get_generation_cache()
+        startup_seconds = time.perf_counter() - startup_started
+        scenarios = build_scenarios(generation, backend.base_url, work_dir, max(1, args.unique_prompts))
+
+        results = {"config": vars(args), "startup_seconds": startup_seconds, "scenarios": {}}
+        for name in scenario_names:
+            results["scenarios"][name] = run_scenario(
+                name, scenarios[name], args.requests, args.concurrency, max(1, args.unique_prompts), cache
+            )
+    finally:
+        tracemalloc.stop()
+        backend.stop()
+    results["peak_rss_mb"] = peak_rss_mb()
+    results["text_router"] = generation.get_text_router().stats()
+    results["rate_limited"] = gemini_profile.rate_limited + openai_profile.rate_limited + backend_profile.rate_limited
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"GERİLEME: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
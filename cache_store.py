@@ -0,0 +1,280 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# --- Üretim Önbelleği (AI çıktıları için kalıcı, paylaşılabilir önbellek) ---
+# st.cache_data yalnızca tek bir sürecin belleğinde yaşar ve her deploy'da silinir.
+# Bu modül, birden çok replika tarafından paylaşılabilen disk tabanlı (SQLite) bir
+# önbellek ve önünde küçük bir bellek içi LRU katmanı sağlar.
+
+DEFAULT_CACHE_PATH = os.environ.get("GENERATION_CACHE_PATH", os.path.join(".cache", "generation_cache.sqlite3"))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("GENERATION_CACHE_MAX_ENTRIES", "5000"))
+DEFAULT_TTL_SECONDS = int(os.environ.get("GENERATION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+DEFAULT_MEMORY_ENTRIES = int(os.environ.get("GENERATION_CACHE_MEMORY_ENTRIES", "256"))
+# Bellek katmanı isabetlerinin diskteki last_access'e en fazla bu aralıkla (sn) toplu yazılması
+DEFAULT_TOUCH_INTERVAL = float(os.environ.get("GENERATION_CACHE_TOUCH_INTERVAL", "30"))
+
+
+def normalize_prompt(prompt_text):
+    """Prompt'u anahtar için normalize eder (baş/son boşluklar, çoklu boşluklar, büyük/küçük harf)."""
+    return re.sub(r"\s+", " ", (prompt_text or "").strip()).casefold()
+
+
+def make_cache_key(kind, prompt_text, model_name, target_language="", platform="", extra=""):
+    """
+    (tür, normalize prompt, model, dil, platform) için kararlı bir anahtar üretir.
+    extra, prompt dışındaki girdileri (ör. görselin içerik özeti) anahtara katmak içindir.
+    """
+    raw = json.dumps(
+        [kind, normalize_prompt(prompt_text), model_name, target_language or "", platform or "", extra or ""],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    """Önbellek isabet/ıskalama sayaçları."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def record(self, field, amount=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def as_dict(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+
+class MemoryCache:
+    """Boyut sınırlı, TTL destekli bellek içi LRU önbellek."""
+
+    def __init__(self, max_entries=DEFAULT_MEMORY_ENTRIES, default_ttl=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.stats.record("misses")
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                self.stats.record("misses")
+                return None
+            self._data.move_to_end(key)
+            self.stats.record("hits")
+            return value
+
+    def set(self, key, value, ttl=None, expires_at=None):
+        if expires_at is None:
+            ttl = self.default_ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            self.stats.record("sets")
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.record("evictions")
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Disk üzerinde kalıcı önbellek. Aynı dosyayı paylaşan süreçler (ör. ortak bir volume
+    üzerindeki replikalar) aynı girdileri görür. Girdi sayısı sınırı aşıldığında en
+    uzun süredir erişilmeyen girdiler silinir (LRU); süresi dolan girdiler okunmaz.
+    Önünde bir MemoryCache katmanı bulunur ve açılışta en son erişilen girdiler
+    belleğe yüklenir (warm start). Bellek katmanı isabetleri de diskteki erişim zamanını
+    günceller (touch_interval aralığıyla toplu yazılır); böylece LRU silme sıcak girdileri atmaz.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 default_ttl=DEFAULT_TTL_SECONDS, memory_entries=DEFAULT_MEMORY_ENTRIES, warm_start=True,
+                 touch_interval=DEFAULT_TOUCH_INTERVAL):
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.touch_interval = touch_interval
+        self._pending_touches = {}
+        self._last_touch_flush = time.time()
+        self.stats = CacheStats()
+        self.memory = MemoryCache(max_entries=memory_entries, default_ttl=default_ttl)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS generation_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                expires_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_generation_cache_access ON generation_cache(last_access)")
+        self._conn.commit()
+        if warm_start:
+            self.warm_start()
+
+    def warm_start(self, limit=None):
+        """Diskteki en son erişilen girdileri bellek katmanına yükler."""
+        limit = limit or self.memory.max_entries
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, expires_at FROM generation_cache "
+                "WHERE expires_at IS NULL OR expires_at > ? ORDER BY last_access DESC LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        # En eskiden en yeniye eklenir; böylece bellek LRU sırası disktekiyle aynı olur
+        for key, value, expires_at in reversed(rows):
+            self.memory.set(key, json.loads(value), expires_at=expires_at)
+        return len(rows)
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            self._touch(key)
+            self.stats.record("hits")
+            return value
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM generation_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.record("misses")
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at < now:
+                self._conn.execute("DELETE FROM generation_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.record("misses")
+                return None
+            self._conn.execute("UPDATE generation_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        value = json.loads(value)
+        self.memory.set(key, value, expires_at=expires_at)
+        self.stats.record("hits")
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO generation_cache (key, value, created_at, last_access, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now, expires_at),
+            )
+            self._evict_locked()
+            self._conn.commit()
+        self.memory.set(key, value, expires_at=expires_at)
+        self.stats.record("sets")
+
+    def _touch(self, key):
+        """Bellek isabetini kaydeder; birikenler touch_interval dolduğunda diske tek seferde yazılır."""
+        now = time.time()
+        with self._lock:
+            self._pending_touches[key] = now
+            if now - self._last_touch_flush >= self.touch_interval:
+                self._flush_touches_locked()
+                self._conn.commit()
+
+    def _flush_touches_locked(self):
+        if self._pending_touches:
+            self._conn.executemany(
+                "UPDATE generation_cache SET last_access = MAX(last_access, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._pending_touches.items()],
+            )
+            self._pending_touches.clear()
+        self._last_touch_flush = time.time()
+
+    def _evict_locked(self):
+        # Silinecek girdiler seçilmeden önce bekleyen erişim zamanları yazılır
+        self._flush_touches_locked()
+        self._conn.execute(
+            "DELETE FROM generation_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+        )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM generation_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM generation_cache WHERE key IN "
+                "(SELECT key FROM generation_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.stats.record("evictions", overflow)
+
+    def delete(self, key):
+        self.memory.delete(key)
+        with self._lock:
+            self._conn.execute("DELETE FROM generation_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        self.memory.clear()
+        with self._lock:
+            self._conn.execute("DELETE FROM generation_cache")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM generation_cache").fetchone()
+        return count
+
+
+def create_cache_backend(backend=None, **kwargs):
+    """
+    Ortam değişkenine göre önbellek arka ucunu seçer.
+    GENERATION_CACHE_BACKEND: 'sqlite' (varsayılan) veya 'memory'.
+    """
+    backend = (backend or os.environ.get("GENERATION_CACHE_BACKEND", "sqlite")).lower()
+    if backend == "memory":
+        return MemoryCache(
+            max_entries=kwargs.get("max_entries", DEFAULT_MAX_ENTRIES),
+            default_ttl=kwargs.get("default_ttl", DEFAULT_TTL_SECONDS),
+        )
+    if backend == "sqlite":
+        return SQLiteCache(**kwargs)
+    raise ValueError(f"Bilinmeyen önbellek arka ucu: {backend}")
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# --- Üretilen İçerik Arşivi (SQLite FTS5) ---
+# Her üretim (metin, platform formatı, YouTube fikri, görsel yorumu, görsel) prompt, platform,
+# dil, model, zaman ve bağlı görsel varlığıyla birlikte kalıcı olarak saklanır. Prompt ve içerik
+# FTS5 tam metin indeksindedir; arama aksan/büyük-küçük harf duyarsızdır, kelimeler önek olarak
+# eşleşir ("villa" → "villalar"). Filtreler ve zaman sıralaması normal indekslerden gelir.
+# Türkçe noktasız "ı" aksan sayılmadığından indekslenirken ve aranırken "i"ye çevrilir; böylece
+# "kibris" araması "Kıbrıs" geçen kayıtları bulur (ayrı token oluşmadığı için vurgulama kaymaz).
+
+DEFAULT_ARCHIVE_PATH = os.environ.get("CONTENT_ARCHIVE_PATH", os.path.join(".cache", "content_archive.sqlite3"))
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+ENTRY_COLUMNS = ("id", "kind", "prompt", "content", "platform", "language", "model", "image_digest", "created_at")
+
+
+def content_hash(content):
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+
+def build_match_query(query):
+    """Kullanıcı aramasını güvenli bir FTS5 ifadesine çevirir (her kelime tırnaklı önek araması)."""
+    words = re.findall(r"\w+", (query or "").replace("ı", "i"))
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class ContentArchive:
+    """Üretilen içeriklerin aranabilir arşivi."""
+
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS archive_entries (
+                id INTEGER PRIMARY KEY,
+                dedupe_key TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                content TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                platform TEXT NOT NULL DEFAULT '',
+                language TEXT NOT NULL DEFAULT '',
+                model TEXT NOT NULL DEFAULT '',
+                image_digest TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS archive_entries_created ON archive_entries (created_at);
+            CREATE INDEX IF NOT EXISTS archive_entries_kind ON archive_entries (kind, created_at);
+            CREATE INDEX IF NOT EXISTS archive_entries_platform ON archive_entries (platform);
+            CREATE INDEX IF NOT EXISTS archive_entries_language ON archive_entries (language);
+            CREATE INDEX IF NOT EXISTS archive_entries_content_hash ON archive_entries (content_hash);
+            CREATE VIRTUAL TABLE IF NOT EXISTS archive_fts USING fts5(
+                prompt, content, content='archive_entries', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS archive_entries_ai AFTER INSERT ON archive_entries BEGIN
+                INSERT INTO archive_fts (rowid, prompt, content)
+                VALUES (new.id, replace(new.prompt, 'ı', 'i'), replace(new.content, 'ı', 'i'));
+            END;
+            CREATE TRIGGER IF NOT EXISTS archive_entries_ad AFTER DELETE ON archive_entries BEGIN
+                INSERT INTO archive_fts (archive_fts, rowid, prompt, content)
+                VALUES ('delete', old.id, replace(old.prompt, 'ı', 'i'), replace(old.content, 'ı', 'i'));
+            END;
+            """
+        )
+        self._conn.commit()
+
+    def add(self, kind, prompt, content, platform="", language="", model="", image_digest=None, created_at=None):
+        """
+        İçeriği arşive ekler ve kayıt id'sini döndürür. Aynı (tür, prompt, platform, dil, içerik)
+        zaten arşivdeyse yeni kayıt açılmaz, mevcut id döner.
+        """
+        dedupe_key = hashlib.sha256(
+            json.dumps([kind, prompt, platform or "", language or "", content], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO archive_entries "
+                "(dedupe_key, kind, prompt, content, content_hash, platform, language, model, image_digest, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (dedupe_key, kind, prompt, content, content_hash(content), platform or "", language or "", model or "",
+                 image_digest, created_at or time.time()),
+            )
+            self._conn.commit()
+            if cursor.rowcount:
+                return cursor.lastrowid
+            return self._conn.execute("SELECT id FROM archive_entries WHERE dedupe_key = ?", (dedupe_key,)).fetchone()[0]
+
+    def attach_image(self, content, image_digest):
+        """Bu içerikle arşivlenmiş, henüz görseli olmayan kayıtlara görsel varlığını bağlar."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE archive_entries SET image_digest = ? WHERE content_hash = ? AND image_digest IS NULL",
+                (image_digest, content_hash(content)),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def get(self, entry_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(ENTRY_COLUMNS)} FROM archive_entries WHERE id = ?", (entry_id,)
+            ).fetchone()
+        return dict(zip(ENTRY_COLUMNS, row)) if row else None
+
+    def delete(self, entry_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM archive_entries WHERE id = ?", (entry_id,))
+            self._conn.commit()
+
+    def search(self, query="", kind=None, platform=None, language=None, since=None, page=1, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Arşivde arar. query boşsa tüm kayıtlar en yeniden eskiye, doluysa önce en alakalı olanlar
+        gelir. {"items", "total", "page", "page_size", "pages"} döndürür; her öğede eşleşen
+        kelimeleri **kalın** gösteren "snippet" alanı bulunur. Son sayfadan büyük sayfa
+        numarası son sayfaya indirilir.
+        """
+        page_size = max(1, min(MAX_PAGE_SIZE, int(page_size)))
+        match = build_match_query(query)
+        conditions, params = [], []
+        for column, value in (("kind", kind), ("platform", platform), ("language", language)):
+            if value:
+                conditions.append(f"e.{column} = ?")
+                params.append(value)
+        if since:
+            conditions.append("e.created_at >= ?")
+            params.append(since)
+
+        columns = ", ".join(f"e.{column}" for column in ENTRY_COLUMNS)
+        if match:
+            # CROSS JOIN sırayı sabitler: önce FTS eşleşmeleri bulunur, filtreler sonra uygulanır.
+            # Aksi halde planlayıcı filtre indeksinden başlayıp her satır için MATCH çalıştırabilir.
+            source = "archive_fts CROSS JOIN archive_entries e ON e.id = archive_fts.rowid"
+            conditions.insert(0, "archive_fts MATCH ?")
+            params.insert(0, match)
+            snippet = "snippet(archive_fts, 1, '**', '**', ' … ', 24)"
+            order = "bm25(archive_fts, 2.0, 1.0), e.created_at DESC"
+        else:
+            source = "archive_entries e"
+            snippet = "substr(e.content, 1, 200)"
+            order = "e.created_at DESC"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+            pages = max(1, -(-total // page_size))
+            page = min(max(1, int(page)), pages)
+            rows = self._conn.execute(
+                f"SELECT {columns}, {snippet} FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [page_size, (page - 1) * page_size],
+            ).fetchall()
+        items = [dict(zip(ENTRY_COLUMNS + ("snippet",), row)) for row in rows]
+        return {"items": items, "total": total, "page": page, "page_size": page_size, "pages": pages}
+
+    def facets(self):
+        """Filtre seçenekleri için arşivdeki türler, platformlar ve diller."""
+        with self._lock:
+            return {
+                column: [value for (value,) in self._conn.execute(
+                    f"SELECT DISTINCT {column} FROM archive_entries WHERE {column} != '' ORDER BY {column}"
+                )]
+                for column in ("kind", "platform", "language")
+            }
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM archive_entries").fetchone()[0]
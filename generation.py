@@ -0,0 +1,674 @@
+import base64
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+from asset_store import AssetStore
+from cache_store import create_cache_backend, make_cache_key
+from content_archive import ContentArchive
+from http_client import get_http_client
+from image_pipeline import content_hash, prepare_image_for_upload
+from instrumentation import current_call, instrument, record_cache_hit
+from model_registry import GEMINI_KEY_MISSING, OPENAI_KEY_MISSING, ModelRegistry
+from prompts import SYSTEM_INSTRUCTION, format_template_name, render_prompt
+from rate_limiter import call_with_rate_limit, estimate_tokens
+from renditions import RenditionPipeline
+from similarity_index import AUTO_REUSE, OFFER_THRESHOLD, PromptIndex, make_scope, same_words
+from text_router import Route, TextRouter
+
+# --- İçerik Üretim Fonksiyonları ---
+# Metin, formatlama, YouTube fikri, görsel yorumlama ve görsel üretimi Streamlit'ten bağımsızdır;
+# hem app.py arayüzü hem de batch_cli.py toplu üretim aracı bu modülü kullanır.
+
+# --- Model Adları ---
+# Ortam değişkenleriyle değiştirilebilir (ör. GEMINI_TEXT_MODEL=gemini-2.0-flash-lite)
+TEXT_MODEL_NAME = os.environ.get("GEMINI_TEXT_MODEL", 'gemini-2.0-flash')
+VISION_MODEL_NAME = os.environ.get("GEMINI_VISION_MODEL", 'gemini-1.5-flash')
+IMAGE_MODEL_NAME = os.environ.get("OPENAI_IMAGE_MODEL", "dall-e-3")
+OPENAI_TEXT_MODEL_NAME = os.environ.get("OPENAI_TEXT_MODEL", "gpt-4o-mini")
+# Metin üretim rotaları (sağlayıcı/model), öncelik sırasıyla. İlk rota birincildir ve önbellek
+# anahtarları TEXT_MODEL_NAME ile oluşturulduğu için onunla aynı model olmalıdır.
+TEXT_ROUTES = [
+    route.strip()
+    for route in os.environ.get("TEXT_ROUTES", f"gemini/{TEXT_MODEL_NAME},openai/{OPENAI_TEXT_MODEL_NAME}").split(",")
+    if route.strip()
+]
+# Açılıştaki model ısıtması (MODEL_WARM_UP=0 ile kapatılır; ör. ağsız ölçümler)
+MODEL_WARM_UP_ENABLED = os.environ.get("MODEL_WARM_UP", "1") not in ("0", "false", "False")
+
+# --- API Anahtarlarını Yapılandırma ---
+# Yerel ortam değişkenleri (.env ile) veya çağıranın verdiği bir secrets eşlemesi (ör. st.secrets)
+# Önemli: Bu anahtarları doğrudan GitHub'a YÜKLEMEYİN!
+def load_api_keys(secrets=None):
+    """
+    (Gemini anahtarı, OpenAI anahtarı) döndürür; bulunamayan anahtar None olur. Eksik anahtar,
+    o sağlayıcı ilk kez kullanıldığında ValueError olarak bildirilir (bkz. ModelRegistry).
+    """
+    # Yerel çalıştırmalar için .env dosyasını yükle
+    load_dotenv()
+
+    # Ortam değişkenlerinden oku (hem yerel .env hem de sistem ortam değişkenleri)
+    gemini_api_key = os.environ.get("GOOGLE_API_KEY")
+    openai_api_key = os.environ.get("OPENAI_API_KEY")
+
+    # Ortam değişkenleri ayarlı değilse verilen secrets eşlemesini dene (Streamlit Cloud)
+    if secrets is not None:
+        if not gemini_api_key and "GOOGLE_API_KEY" in secrets:
+            gemini_api_key = secrets["GOOGLE_API_KEY"]
+        if not openai_api_key and "OPENAI_API_KEY" in secrets:
+            openai_api_key = secrets["OPENAI_API_KEY"]
+    return gemini_api_key or None, openai_api_key or None
+
+# --- Süreç Geneli Kaynaklar ---
+# Model kaydı, üretim önbelleği ve varlık deposu süreç başına bir kez kurulur (get_http_client
+# ile aynı desen). Streamlit yeniden çalıştırmaları ve CLI worker thread'leri aynı örnekleri paylaşır.
+_registry = None
+_generation_cache = None
+_asset_store = None
+_prompt_index = None
+_text_router = None
+_content_archive = None
+_rendition_pipeline = None
+_warm_up_started = False
+_resources_lock = threading.Lock()
+
+def get_model_registry(secrets=None):
+    """
+    Süreç genelindeki model kaydını döndürür; ilk çağrıda anahtarları okur. Sağlayıcı SDK'ları
+    ve anahtar doğrulaması ilk kullanıma kadar ertelenir.
+    """
+    global _registry
+    with _resources_lock:
+        if _registry is None:
+            _registry = ModelRegistry(*load_api_keys(secrets))
+        return _registry
+
+def warm_up_models():
+    """
+    Anahtarı bulunan sağlayıcıların modellerini süreç başına bir kez arka planda ısıtır (SDK
+    import'u dahil). Arayüz bunu ilk sayfa çizildikten sonra çağırır.
+    """
+    global _warm_up_started
+    if not MODEL_WARM_UP_ENABLED:
+        return
+    registry = get_model_registry()
+    with _resources_lock:
+        if _warm_up_started:
+            return
+        _warm_up_started = True
+    missing = registry.missing_keys()
+    registry.warm_up_async(
+        gemini_models=(TEXT_MODEL_NAME, VISION_MODEL_NAME) if GEMINI_KEY_MISSING not in missing else (),
+        openai_models=(IMAGE_MODEL_NAME,) if OPENAI_KEY_MISSING not in missing else (),
+    )
+
+def use_model_registry(registry):
+    """Süreç genelindeki model kaydını verilen nesneyle değiştirir (ör. benchmark.py'deki sahte sağlayıcılar)."""
+    global _registry
+    with _resources_lock:
+        _registry = registry
+
+# --- Kalıcı Üretim Önbelleği ---
+# st.cache_data yerine tüm replikalar ve yeniden başlatmalar arasında paylaşılan disk önbelleği.
+# Arka uç ve boyut/TTL ayarları GENERATION_CACHE_* ortam değişkenleriyle yapılandırılır.
+def get_generation_cache():
+    global _generation_cache
+    with _resources_lock:
+        if _generation_cache is None:
+            _generation_cache = create_cache_backend()
+        return _generation_cache
+
+def is_cacheable_result(result):
+    """Hata veya boş yanıt metinlerinin önbelleğe yazılmasını engeller."""
+    return bool(result) and isinstance(result, str) and not result.startswith(("Hata:", "Yanıt alınamadı", "Görsel yorumu alınamadı"))
+
+def cached_generation(kind, prompt_text, model_name, target_language, platform, produce, extra=""):
+    """
+    Önbellekte varsa sonucu döndürür, yoksa produce() ile üretip önbelleğe yazar. Tam eşleşme
+    yoksa yalnızca kelime sırası/noktalama farklı önceki bir prompt'un sonucu da kullanılır.
+    produce() (sonuç, üreten_model) döndürür; yedek rotanın ürettiği sonuç model_name'in değil
+    kendi modelinin anahtarıyla yazılır ve arşive o modelle eklenir.
+    """
+    cache = get_generation_cache()
+    key = make_cache_key(kind, prompt_text, model_name, target_language, platform, extra)
+    with instrument("gemini", kind, model_name) as call:
+        cached = cache.get(key)
+        if cached is None:
+            cached = reuse_same_words_generation(kind, prompt_text, model_name, target_language, platform, extra)
+        call.mark_cache(cached is not None)
+        if cached is not None:
+            return cached
+        result, produced_by = produce()
+    store_generation(kind, prompt_text, produced_by, target_language, platform, result, extra)
+    return result
+
+def uncached_generation(kind, prompt_text, model_name, target_language, platform, produce, extra=""):
+    """
+    Önbelleği çağıranın zaten sorguladığı (ör. çoklu dil ön denetimi) bir isteği üretip yazar;
+    önbelleğe ikinci kez bakılmaz, böylece aynı ıska iki kez sayılmaz.
+    """
+    with instrument("gemini", kind, model_name) as call:
+        call.mark_cache(False)
+        result, produced_by = produce()
+    store_generation(kind, prompt_text, produced_by, target_language, platform, result, extra)
+    return result
+
+# --- Benzer Prompt'lar İçin Önceki Üretimler ---
+# Her üretimin prompt'u similarity_index.PromptIndex'e eklenir (MinHash + LSH). Aynı kapsamda
+# (tür, model, dil, platform) benzer bir önceki prompt varsa sonucu API'ye gitmeden sunulabilir.
+def get_prompt_index():
+    global _prompt_index
+    with _resources_lock:
+        if _prompt_index is None:
+            _prompt_index = PromptIndex()
+        return _prompt_index
+
+def store_generation(kind, prompt_text, model_name, target_language, platform, result, extra=""):
+    """
+    Sonucu önbelleğe yazar, prompt'u benzerlik indeksine ve sonucu içerik arşivine ekler;
+    hatalı sonuçlar yazılmaz.
+    """
+    if not is_cacheable_result(result):
+        return
+    key = make_cache_key(kind, prompt_text, model_name, target_language, platform, extra)
+    get_generation_cache().set(key, result)
+    get_prompt_index().add(key, make_scope(kind, model_name, target_language, platform, extra), prompt_text)
+    get_content_archive().add(kind, prompt_text, result, platform, target_language, model_name)
+
+# --- Aranabilir İçerik Arşivi ---
+# Üretilen her içerik oturumdan bağımsız olarak content_archive.ContentArchive'da saklanır.
+def get_content_archive():
+    global _content_archive
+    with _resources_lock:
+        if _content_archive is None:
+            _content_archive = ContentArchive()
+        return _content_archive
+
+def find_similar_generation(kind, prompt_text, model_name, target_language="", platform="", extra="", threshold=OFFER_THRESHOLD):
+    """
+    Aynı kapsamdaki en benzer önceki üretimi {"prompt", "similarity", "same_words", "result"} olarak
+    döndürür; eşiğin üstünde yoksa None. Önbellekten düşmüş kayıtlar indeksten de silinir.
+    """
+    index = get_prompt_index()
+    cache = get_generation_cache()
+    scope = make_scope(kind, model_name, target_language, platform, extra)
+    for similarity, key, similar_prompt in index.query(scope, prompt_text, threshold):
+        result = cache.get(key)
+        if result is None:
+            index.remove(key)
+            continue
+        return {"prompt": similar_prompt, "similarity": similarity,
+                "same_words": same_words(prompt_text, similar_prompt), "result": result}
+    return None
+
+def reuse_same_words_generation(kind, prompt_text, model_name, target_language, platform, extra=""):
+    """Aynı kelimelerden oluşan önceki bir prompt'un sonucunu döndürür (AUTO_REUSE kapalıysa None)."""
+    if not AUTO_REUSE:
+        return None
+    # Aynı kelimeler aynı shingle kümesini, dolayısıyla 1.0 benzerliği verir
+    similar = find_similar_generation(kind, prompt_text, model_name, target_language, platform, extra, threshold=1.0)
+    return similar["result"] if similar and similar["same_words"] else None
+
+# --- Hız Sınırlı Model Çağrıları ---
+# Tüm Gemini/OpenAI çağrıları sağlayıcı/model başına paylaşılan RPM/TPM kovalarından geçer;
+# 429 hatalarında Retry-After'a uyularak yeniden denenir (bkz. rate_limiter.py). Yeniden denemeler,
+# token sayıları ve hata sınıfı etkin ölçüm kaydına (instrumentation.current_call) yazılır.
+def gemini_generate(model, model_name, contents, **kwargs):
+    parts = contents if isinstance(contents, list) else [contents]
+    call = current_call()
+    try:
+        response = call_with_rate_limit(
+            "gemini", model_name, lambda: model.generate_content(contents, **kwargs), estimate_tokens(*parts),
+            on_retry=call.add_retry if call is not None else None,
+        )
+    except Exception as e:
+        if call is not None:
+            call.fail(e)
+        raise
+    if not kwargs.get("stream"):
+        # Akışlı yanıtlarda kullanım bilgisi yanıt tamamen okunduktan sonra kaydedilir
+        record_token_usage(model_name, response)
+    return response
+
+# --- Çağrı Başına Token Kullanımı ---
+_token_usage_log = deque(maxlen=100)
+
+def get_token_usage_log():
+    return _token_usage_log
+
+def record_token_usage(model_name, response):
+    """Gemini yanıtındaki usage_metadata'dan girdi/çıktı token sayılarını kaydeder."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+    output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+    get_token_usage_log().append({
+        "model": model_name,
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "at": time.time(),
+    })
+    call = current_call()
+    if call is not None:
+        call.add_tokens(prompt_tokens, output_tokens)
+
+# --- Metin Üretimi Rotaları (Hedged İstek + Yedek Sağlayıcı) ---
+# Metin, formatlama ve YouTube fikri istekleri tek bir Gemini modeline bağlı kalmaz: birincil
+# rota p95 süresinde yanıt vermezse veya hata verirse sıradaki rota (varsayılan: OpenAI) devreye
+# girer (bkz. text_router.py). Her rota denemesi "<işlem>_route" olarak ayrıca ölçülür.
+def get_text_router():
+    global _text_router
+    with _resources_lock:
+        if _text_router is None:
+            _text_router = TextRouter([Route(name, _text_route_call(name), stream=_text_route_stream(name)) for name in TEXT_ROUTES])
+        return _text_router
+
+def route_model_name(route):
+    """Rota adındaki model ("gemini/gemini-2.0-flash" -> "gemini-2.0-flash")."""
+    return route.name.partition("/")[2]
+
+def _text_route_call(route_name):
+    provider, _, model_name = route_name.partition("/")
+    if provider == "gemini":
+        return lambda prompt, operation: _gemini_route_text(model_name, prompt, operation)
+    if provider == "openai":
+        return lambda prompt, operation: _openai_route_text(model_name, prompt, operation)
+    raise ValueError(f"Bilinmeyen metin üretim rotası: '{route_name}' (beklenen: gemini/<model> veya openai/<model>)")
+
+def _text_route_stream(route_name):
+    """Akışlı üretim destekleyen rotalar (Gemini) için parça üreten fonksiyon; diğerleri için None."""
+    provider, _, model_name = route_name.partition("/")
+    if provider == "gemini":
+        return lambda prompt, operation: _gemini_route_stream(model_name, prompt, operation)
+    return None
+
+def _gemini_route_stream(model_name, prompt, operation):
+    # Akış yönlendiricinin worker thread'inde okunur; token ve hata bu denemenin kaydına yazılır
+    with instrument("gemini", f"{operation}_route", model_name):
+        model = get_model_registry().gemini(model_name, SYSTEM_INSTRUCTION)
+        stream_response = gemini_generate(model, model_name, prompt, stream=True)
+        for chunk in stream_response:
+            yield getattr(chunk, "text", "") or ""
+        record_token_usage(model_name, stream_response)
+
+def _gemini_route_text(model_name, prompt, operation):
+    with instrument("gemini", f"{operation}_route", model_name):
+        model = get_model_registry().gemini(model_name, SYSTEM_INSTRUCTION)
+        return gemini_generate(model, model_name, prompt).text
+
+def _openai_route_text(model_name, prompt, operation):
+    with instrument("openai", f"{operation}_route", model_name) as call:
+        openai_client = get_model_registry().openai_client
+        response = call_with_rate_limit("openai", model_name, lambda: openai_client.chat.completions.create(
+            model=model_name,
+            messages=[
+                {"role": "system", "content": SYSTEM_INSTRUCTION},
+                {"role": "user", "content": prompt},
+            ],
+        ), estimate_tokens(SYSTEM_INSTRUCTION, prompt), on_retry=call.add_retry)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            call.add_tokens(getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0))
+        return response.choices[0].message.content
+
+def routed_text_generation(full_prompt, operation, error_label, skip=()):
+    """
+    Prompt'u metin rotaları üzerinden üretir; (metin, yanıtı_veren_model) döndürür. Hatalar
+    kullanıcıya gösterilecek metne çevrilir; bu durumda model birincil rotanınkidir.
+    """
+    router = get_text_router()
+    try:
+        text, route = router.generate(full_prompt, operation, skip=skip)
+    except Exception as e:
+        call = current_call()
+        if call is not None:
+            call.fail(e)
+        return describe_gemini_error(e, error_label), route_model_name(router.primary)
+    return text or "Yanıt alınamadı veya boş. Lütfen prompt'u kontrol edin.", route_model_name(route)
+
+# --- Eşzamanlı Çalıştırma Yardımcısı ---
+def run_concurrently(tasks, max_workers):
+    """
+    {anahtar: (fonksiyon, argümanlar)} görevlerini sınırlı bir thread havuzunda çalıştırır ve
+    (anahtar, sonuç, süre_sn) üçlülerini tamamlanma sırasına göre döndürür. Hata durumunda
+    sonuç olarak istisna nesnesi döner.
+    """
+    if not tasks:
+        return
+    def timed(func, args):
+        started = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception as e:
+            result = e
+        return result, time.perf_counter() - started
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as executor:
+        futures = {executor.submit(timed, func, args): key for key, (func, args) in tasks.items()}
+        for future in as_completed(futures):
+            result, elapsed = future.result()
+            yield futures[future], result, elapsed
+
+# --- AI Metin Üretme Fonksiyonu (Gemini Flash) ---
+def generate_text_gemini_flash(prompt_text, target_language="Türkçe"):
+    return cached_generation(
+        "text", prompt_text, TEXT_MODEL_NAME, target_language, "",
+        lambda: _generate_text_gemini_flash(prompt_text, target_language),
+    )
+
+def build_text_prompt(prompt_text, target_language):
+    return render_prompt("text", prompt_text=prompt_text, target_language=target_language)
+
+def _generate_text_gemini_flash(prompt_text, target_language):
+    return routed_text_generation(build_text_prompt(prompt_text, target_language), "text", "API Hatası")
+
+# --- Çoklu Dil Metin Üretimi ---
+LANGUAGE_OPTIONS = ['Türkçe', 'English', 'Ελληνικά']
+
+def generate_text_multilanguage(prompt_text, languages, mode="parallel"):
+    """
+    Aynı içerik isteğini seçilen tüm dillerde tek seferde üretir.
+    mode="parallel": her dil için eşzamanlı ayrı istek (dil başına önbellekli).
+    mode="single": tüm dilleri JSON olarak döndüren tek bir istek; şirket bağlamı yalnızca bir kez gönderilir.
+    (sonuçlar, rapor) döndürür. Rapor; toplam süre, ardışık eşdeğer süre, önbellek isabetleri ve
+    girdi token'larını içerir. Ardışık eşdeğer token, önbellekte olmayan her dil için ayrı
+    gönderilecek prompt'un tahminidir; eşzamanlı mod aynı istekleri gönderdiği için tasarrufu 0'dır.
+    Tek istek modunda dil başına süre ölçülemediği için ardışık eşdeğer süre None'dır.
+    """
+    languages = list(dict.fromkeys(languages))
+    started = time.perf_counter()
+    cache = get_generation_cache()
+    results = {}
+    report = {"mode": mode, "languages": len(languages), "cache_hits": 0, "sequential_seconds": 0.0,
+              "prompt_tokens": 0, "sequential_prompt_tokens": 0}
+
+    # Önbellekte bulunan diller için istek gönderilmez
+    pending = []
+    for language in languages:
+        cached = cache.get(make_cache_key("text", prompt_text, TEXT_MODEL_NAME, language, ""))
+        if cached is not None:
+            record_cache_hit("gemini", "text", TEXT_MODEL_NAME)
+            results[language] = cached
+            report["cache_hits"] += 1
+        else:
+            pending.append(language)
+    # Ardışık yolda her dil için şirket bağlamıyla birlikte ayrı bir prompt gönderilirdi
+    report["sequential_prompt_tokens"] = sum(
+        estimate_tokens(SYSTEM_INSTRUCTION, build_text_prompt(prompt_text, language)) for language in pending
+    )
+
+    if pending and mode == "single" and len(pending) > 1:
+        with instrument("gemini", "text_multilanguage", TEXT_MODEL_NAME) as call:
+            call.mark_cache(False)
+            generated, prompt_tokens = _generate_text_multilanguage_single_request(prompt_text, pending)
+        report["sequential_seconds"] = None
+        report["prompt_tokens"] = prompt_tokens
+        for language in pending:
+            result = generated.get(language) or f"Hata: '{language}' dili için yanıt alınamadı."
+            store_generation("text", prompt_text, TEXT_MODEL_NAME, language, "", result)
+            results[language] = result
+    elif pending:
+        report["prompt_tokens"] = report["sequential_prompt_tokens"]
+        tasks = {language: (_generate_text_uncached, (prompt_text, language)) for language in pending}
+        for language, result, elapsed in run_concurrently(tasks, len(tasks)):
+            if isinstance(result, Exception):
+                result = f"Hata: API Hatası: {result}"
+            results[language] = result
+            report["sequential_seconds"] += elapsed
+
+    report["wall_seconds"] = time.perf_counter() - started
+    return {language: results[language] for language in languages}, report
+
+def _generate_text_uncached(prompt_text, target_language):
+    return uncached_generation(
+        "text", prompt_text, TEXT_MODEL_NAME, target_language, "",
+        lambda: _generate_text_gemini_flash(prompt_text, target_language),
+    )
+
+def _generate_text_multilanguage_single_request(prompt_text, languages):
+    """Tüm diller için tek istek gönderir; ({dil: metin}, prompt_token_sayısı) döndürür."""
+    full_prompt = render_prompt(
+        "text_multilanguage", prompt_text=prompt_text, languages=", ".join(languages),
+        languages_json=json.dumps(languages, ensure_ascii=False),
+    )
+    try:
+        model = get_model_registry().gemini(TEXT_MODEL_NAME, SYSTEM_INSTRUCTION)
+        response = gemini_generate(model, TEXT_MODEL_NAME, full_prompt, generation_config={"response_mime_type": "application/json"})
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None)
+        data = json.loads(response.text) if response and response.text else {}
+        if not isinstance(data, dict):
+            data = {}
+        return {language: str(data[language]) for language in languages if data.get(language)}, prompt_tokens
+    except json.JSONDecodeError as e:
+        call = current_call()
+        if call is not None:
+            call.fail(e)
+        return {language: f"Hata: Çoklu dil yanıtı çözümlenemedi: {e}" for language in languages}, None
+    except Exception as e:
+        call = current_call()
+        if call is not None:
+            call.fail(e)
+        return {language: f"Hata: API Hatası: {e}" for language in languages}, None
+
+# --- AI Görsel Yorumlama Fonksiyonu (Gemini Vision) ---
+# Görsel, ham baytlarının içerik özetiyle anahtarlanır; yorum (özet, prompt) başına önbelleğe alınır.
+def prepare_image(image_bytes):
+    """Görseli küçültüp JPEG'e çevirir; (içerik_özeti, jpeg_baytları, boyut) döndürür."""
+    jpeg_bytes, size = prepare_image_for_upload(image_bytes)
+    return content_hash(image_bytes), jpeg_bytes, size
+
+def interpret_image_gemini_vision(image_bytes, prompt_text="Bu resimde ne görüyorsun?"):
+    image_hash, jpeg_bytes, _size = prepare_image(image_bytes)
+    return interpret_prepared_image(image_hash, jpeg_bytes, prompt_text)
+
+def interpret_prepared_image(image_hash, jpeg_bytes, prompt_text="Bu resimde ne görüyorsun?"):
+    """prepare_image() çıktısıyla yorumlar; arayüz önizleme için hazırlanmış görseli yeniden işlemez."""
+    return cached_generation(
+        "vision", prompt_text, VISION_MODEL_NAME, "", "",
+        lambda: (_interpret_image_gemini_vision(jpeg_bytes, prompt_text), VISION_MODEL_NAME),
+        extra=image_hash,
+    )
+
+def _interpret_image_gemini_vision(jpeg_bytes, prompt_text):
+    try:
+        model = get_model_registry().gemini(VISION_MODEL_NAME)
+        contents = [prompt_text, {"mime_type": "image/jpeg", "data": jpeg_bytes}]
+        response = gemini_generate(model, VISION_MODEL_NAME, contents)
+        if response and response.text:
+            return response.text
+        else:
+            return "Görsel yorumu alınamadı veya boş."
+    except Exception as e:
+        error_msg = str(e)
+        if "quota" in error_msg.lower() or "429" in error_msg or "TooManyRequests" in error_msg:
+            return f"Hata: Görsel yorumlama kota aşımı! Lütfen daha sonra tekrar deneyin. Detay: {e}"
+        elif "api key not valid" in error_msg.lower() or "authentication error" in error_msg.lower():
+            return "Hata: Gemini API anahtarı geçersiz veya yetkilendirme hatası. Lütfen anahtarınızı kontrol edin."
+        else:
+            return f"Hata: Görsel yorumlama hatası: {e}"
+
+# --- Yerel Varlık Deposu (Üretilen Görseller) ---
+IMAGE_SIZE = "1024x1024"
+
+def get_asset_store():
+    global _asset_store
+    with _resources_lock:
+        if _asset_store is None:
+            _asset_store = AssetStore()
+        return _asset_store
+
+# --- Platform Görsel Sürümleri ---
+# Üretilen ve yüklenen görsellerin platform boyutları ve küçük önizlemesi (bkz. renditions.py)
+def get_rendition_pipeline():
+    global _rendition_pipeline
+    asset_store = get_asset_store()  # _resources_lock yeniden girilemez; depo kilit dışında alınır
+    with _resources_lock:
+        if _rendition_pipeline is None:
+            _rendition_pipeline = RenditionPipeline(asset_store)
+        return _rendition_pipeline
+
+# --- AI Görsel Oluşturma Fonksiyonu (DALL-E 3) ---
+def generate_image_dalle(image_prompt_text):
+    """
+    Görseli üretir ve yerel varlık deposuna yazar; başarıda varlığın içerik özetini döndürür.
+    Aynı prompt için depoda görsel varsa yeniden üretmez.
+    """
+    with instrument("openai", "image", IMAGE_MODEL_NAME) as call:
+        return _generate_image_dalle(image_prompt_text, call)
+
+def _generate_image_dalle(image_prompt_text, call):
+    asset_store = get_asset_store()
+    prompt_alias = make_cache_key("image", image_prompt_text, IMAGE_MODEL_NAME, "", IMAGE_SIZE)
+    existing_digest = asset_store.lookup_alias(prompt_alias)
+    call.mark_cache(bool(existing_digest))
+    if existing_digest:
+        return existing_digest
+
+    full_image_prompt = render_prompt("image", image_prompt_text=image_prompt_text)
+    try:
+        # OpenAI SDK'sı ve anahtar kontrolü ilk görsel üretiminde yapılır
+        openai_client = get_model_registry().openai_client
+        # Görsel baytları yanıtın içinde gelir (b64_json); ikinci bir indirme isteği yapılmaz
+        response = call_with_rate_limit("openai", IMAGE_MODEL_NAME, lambda: openai_client.images.generate(
+            model=IMAGE_MODEL_NAME,
+            prompt=full_image_prompt,
+            n=1,
+            size=IMAGE_SIZE,
+            response_format="b64_json"
+        ), on_retry=call.add_retry)
+        if response and response.data and response.data[0].b64_json:
+            img_data = base64.b64decode(response.data[0].b64_json)
+        elif response and response.data and response.data[0].url:
+            # Yedek yol: URL döndüyse paylaşılan istemciyle akış halinde indir
+            download = get_http_client().get(response.data[0].url, stream=True)
+            img_data = b"".join(download.iter_content(chunk_size=64 * 1024))
+        else:
+            return "Hata: Görsel oluşturulamadı veya görsel verisi bulunamadı."
+        digest = asset_store.put(img_data, mime="image/png", alias=prompt_alias)
+        get_content_archive().add("image", image_prompt_text, "", model=IMAGE_MODEL_NAME, image_digest=digest)
+        return digest
+    except Exception as e:
+        call.fail(e)
+        error_msg = str(e)
+        if "quota" in error_msg.lower() or "429" in error_msg or "TooManyRequests" in error_msg or "billing_not_active" in error_msg.lower() or "insufficient_quota" in error_msg.lower():
+            return f"Hata: Görsel oluşturma kota/ödeme hatası! Lütfen OpenAI hesabınızdaki DALL-E faturalandırmasını kontrol edin. Detay: {e}"
+        elif "authentication error" in error_msg.lower():
+            return "Hata: OpenAI API anahtarı geçersiz. Lütfen anahtarınızı kontrol edin."
+        else:
+            return f"Hata: Görsel oluşturma hatası: {e}"
+
+# --- AI ile Metin Formatlama Fonksiyonu ---
+def format_text_for_social_media(text, platform, target_language="Türkçe"):
+    return cached_generation(
+        "format", text, TEXT_MODEL_NAME, target_language, platform,
+        lambda: _format_text_for_social_media(text, platform, target_language),
+    )
+
+def build_format_prompt(text, platform, target_language):
+    return render_prompt(format_template_name(platform), text=text, target_language=target_language)
+
+def _format_text_for_social_media(text, platform, target_language):
+    return routed_text_generation(build_format_prompt(text, platform, target_language), "format", "Metin formatlama hatası (AI)")
+
+# --- Tüm Platformlar İçin Eşzamanlı Formatlama ---
+PLATFORM_OPTIONS = ['Instagram', 'Facebook', 'LinkedIn', 'Genel Blog Yazısı', 'E-posta Bülteni', 'Bazaraki.com İlanı']
+FORMAT_FANOUT_MAX_WORKERS = int(os.environ.get("FORMAT_FANOUT_MAX_WORKERS", "6"))
+
+def format_text_for_all_platforms(text, target_language="Türkçe", platforms=None):
+    """
+    Metni seçilen tüm platformlar için aynı anda formatlar (sınırlı thread havuzu).
+    (platform, formatlanmış_metin) çiftlerini tamamlanma sırasına göre döndürür; toplam süre
+    en yavaş tek çağrıya yakındır.
+    """
+    platforms = list(platforms or PLATFORM_OPTIONS)
+    tasks = {platform: (format_text_for_social_media, (text, platform, target_language)) for platform in platforms}
+    for platform, result, _elapsed in run_concurrently(tasks, FORMAT_FANOUT_MAX_WORKERS):
+        if isinstance(result, Exception):
+            result = f"Hata: Metin formatlama hatası (AI): {result}"
+        yield platform, result
+
+# --- YouTube Video Fikri Oluşturma Fonksiyonu (Gemini Flash) ---
+def generate_youtube_idea_gemini(prompt_text, target_language="Türkçe"):
+    return cached_generation(
+        "youtube", prompt_text, TEXT_MODEL_NAME, target_language, "",
+        lambda: _generate_youtube_idea_gemini(prompt_text, target_language),
+    )
+
+def build_youtube_prompt(prompt_text, target_language):
+    return render_prompt("youtube", prompt_text=prompt_text, target_language=target_language)
+
+def _generate_youtube_idea_gemini(prompt_text, target_language):
+    return routed_text_generation(build_youtube_prompt(prompt_text, target_language), "youtube", "YouTube video fikri oluşturma hatası (AI)")
+
+# --- Akışlı (Streaming) Metin Üretimi ---
+# Yanıt parça parça geldikçe on_chunk(o ana kadarki_metin) çağrılır; tam metin yine önbelleğe yazılır.
+def describe_gemini_error(e, label):
+    """Gemini istisnasını kullanıcıya gösterilecek hata metnine çevirir."""
+    error_msg = str(e)
+    if "quota" in error_msg.lower() or "429" in error_msg or "TooManyRequests" in error_msg:
+        return f"Hata: Kota aşımı! Lütfen daha sonra tekrar deneyin veya kota durumunuzu kontrol edin. Detay: {e}"
+    elif "api key not valid" in error_msg.lower() or "authentication error" in error_msg.lower():
+        return "Hata: Gemini API anahtarı geçersiz veya yetkilendirme hatası. Lütfen anahtarınızı kontrol edin."
+    return f"Hata: {label}: {e}"
+
+def stream_cached_generation(kind, prompt_text, model_name, target_language, platform, full_prompt, on_chunk, error_label):
+    """
+    Önbellekte varsa sonucu tek parça olarak verir; yoksa metin yönlendiricisi üzerinden akışlı üretir.
+    (metin, ölçümler) döndürür. Ölçümler: ilk token süresi (ttft_seconds), toplam süre ve önbellek durumu.
+    Yanıt akıştan gelmediyse (akış ilk parçadan önce hata verdi veya yedek rota tek parça yanıt
+    verdi) ttft_seconds None'dır.
+    """
+    with instrument("gemini", kind, model_name) as call:
+        return _stream_cached_generation(kind, prompt_text, model_name, target_language, platform, full_prompt, on_chunk, error_label, call)
+
+def _stream_cached_generation(kind, prompt_text, model_name, target_language, platform, full_prompt, on_chunk, error_label, call):
+    started = time.perf_counter()
+    cache = get_generation_cache()
+    key = make_cache_key(kind, prompt_text, model_name, target_language, platform)
+    cached = cache.get(key)
+    if cached is None:
+        cached = reuse_same_words_generation(kind, prompt_text, model_name, target_language, platform)
+    call.mark_cache(cached is not None)
+    if cached is not None:
+        on_chunk(cached)
+        elapsed = time.perf_counter() - started
+        return cached, {"ttft_seconds": elapsed, "total_seconds": elapsed, "cached": True}
+
+    # Akış birincil rotadan yapılır. İlk parça rotanın hedge eşiğinde gelmezse, akış ilk parçadan önce
+    # hata verirse veya rotanın devre kesicisi açıksa yönlendirici sıradaki rotaya tek parça istek
+    # gönderir (bkz. TextRouter.generate_stream); süreler ve sayaçlar rota üzerinden kaydedilir.
+    try:
+        text, route, ttft = get_text_router().generate_stream(full_prompt, on_chunk, kind)
+        result = text or "Yanıt alınamadı veya boş. Lütfen prompt'u kontrol edin."
+        produced_by = route_model_name(route)
+    except Exception as e:
+        call.fail(e)
+        result, produced_by, ttft = describe_gemini_error(e, error_label), model_name, None
+        on_chunk(result)
+    store_generation(kind, prompt_text, produced_by, target_language, platform, result)
+    total = time.perf_counter() - started
+    return result, {"ttft_seconds": ttft, "total_seconds": total, "cached": False}
+
+def stream_text_gemini_flash(prompt_text, target_language, on_chunk):
+    return stream_cached_generation(
+        "text", prompt_text, TEXT_MODEL_NAME, target_language, "",
+        build_text_prompt(prompt_text, target_language), on_chunk, "API Hatası",
+    )
+
+def stream_format_text_for_social_media(text, platform, target_language, on_chunk):
+    return stream_cached_generation(
+        "format", text, TEXT_MODEL_NAME, target_language, platform,
+        build_format_prompt(text, platform, target_language), on_chunk, "Metin formatlama hatası (AI)",
+    )
+
+def stream_youtube_idea_gemini(prompt_text, target_language, on_chunk):
+    return stream_cached_generation(
+        "youtube", prompt_text, TEXT_MODEL_NAME, target_language, "",
+        build_youtube_prompt(prompt_text, target_language), on_chunk, "YouTube video fikri oluşturma hatası (AI)",
+    )
@@ -0,0 +1,197 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- Paylaşılan HTTP İstemcisi ---
+# Backend çağrıları ve görsel indirmeleri için süreç genelinde tek bir bağlantı havuzu.
+# Her isteğin bağlantı/okuma zaman aşımı vardır; idempotent istekler üstel geri çekilme ve
+# rastgele gecikme (jitter) ile yeniden denenir. Ardışık hatalardan sonra devre kesici açılır
+# ve ölü bir backend'e giden istekler beklemeden hata verir.
+
+CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "30"))
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.environ.get("HTTP_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.environ.get("HTTP_BACKOFF_MAX", "8"))
+POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "20"))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("HTTP_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.environ.get("HTTP_BREAKER_RESET_SECONDS", "30"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Devre kesici açıkken gönderilmeyen istekler için fırlatılır."""
+
+
+class CircuitBreaker:
+    """
+    Basit üç durumlu devre kesici (kapalı / açık / yarı açık).
+    failure_threshold ardışık hatadan sonra açılır, reset_seconds sonra tek bir deneme
+    isteğine izin verir; deneme başarılı olursa tekrar kapanır.
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self._half_open_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow_request(self):
+        with self._lock:
+            state = self._state_locked()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._half_open_in_flight:
+                self._half_open_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._half_open_in_flight = False
+
+    def release_probe(self):
+        """allow_request ile ayrılan yarı açık deneme hiç gönderilmediyse izni geri verir."""
+        with self._lock:
+            self._half_open_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._half_open_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class HttpClient:
+    """Bağlantı havuzlu, zaman aşımlı, yeniden denemeli ve devre kesicili HTTP istemcisi."""
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, pool_size=POOL_SIZE):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._breakers = {}
+        self._breakers_lock = threading.Lock()
+
+    def breaker_for(self, url):
+        host = urlparse(url).netloc
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Üstel geri çekilme + tam jitter; sunucu Retry-After verdiyse ona uyar."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, retry=None, timeout=None, on_retry=None, **kwargs):
+        """
+        İstek gönderir. retry belirtilmezse yalnızca idempotent yöntemler yeniden denenir.
+        Son denemede de başarısız olursa requests istisnası fırlatır (HTTP hata kodları dahil).
+        on_retry(deneme, hata) verilirse her yeniden denemeden önce çağrılır.
+        """
+        method = method.upper()
+        retry = (method in IDEMPOTENT_METHODS) if retry is None else retry
+        attempts = (self.max_retries + 1) if retry else 1
+        breaker = self.breaker_for(url)
+        timeout = timeout or self.timeout
+        last_error = None
+
+        for attempt in range(attempts):
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Devre kesici açık, istek gönderilmedi: {urlparse(url).netloc}")
+            retry_after = None
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+                if response.status_code in RETRY_STATUS_CODES:
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                response.raise_for_status()
+                breaker.record_success()
+                return response
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                breaker.record_failure()
+                last_error = e
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code in RETRY_STATUS_CODES:
+                    # 429 backend'in ayakta olduğunu gösterir; devre kesiciyi yalnızca 5xx etkiler
+                    if e.response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    last_error = e
+                else:
+                    breaker.record_success()
+                    raise
+            except requests.exceptions.RequestException:
+                # Yeniden denenmeyen diğer hatalar (ChunkedEncodingError, TooManyRedirects, InvalidURL...)
+                # da sonuçlandırılır; aksi halde yarı açık deneme izni hiç geri verilmez
+                breaker.record_failure()
+                raise
+            except Exception:
+                breaker.release_probe()
+                raise
+            if attempt + 1 < attempts:
+                if on_retry is not None:
+                    on_retry(attempt, last_error)
+                time.sleep(self.backoff_delay(attempt, retry_after))
+        raise last_error
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+def _parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Süreç genelinde paylaşılan HttpClient örneğini döndürür."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,107 @@
+import hashlib
+import os
+from io import BytesIO
+
+# --- Görsel Ön İşleme ---
+# Yüklenen görseller ham baytlarının içerik özetiyle (SHA-256) anahtarlanır, sınırlı bir
+# çözünürlüğe küçültülür ve JPEG olarak yeniden sıkıştırılır. Böylece büyük telefon
+# fotoğrafları modele gönderilmeden önce küçülür ve aynı görsel için yorum önbellekten gelir.
+# Pillow ilk görsel işleminde import edilir; görsel kullanmayan sayfa çizimlerini yavaşlatmaz.
+
+MAX_UPLOAD_SIDE = int(os.environ.get("IMAGE_MAX_UPLOAD_SIDE", "1536"))
+UPLOAD_JPEG_QUALITY = int(os.environ.get("IMAGE_UPLOAD_JPEG_QUALITY", "85"))
+
+
+def content_hash(data):
+    """Ham baytların SHA-256 özetini döndürür."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _pillow():
+    from PIL import Image, ImageOps
+    return Image, ImageOps
+
+
+def open_image(data, draft_size=None):
+    """
+    Baytları çözer, EXIF yönüne göre döndürür ve RGB'ye çevirir. draft_size verilirse JPEG'ler
+    bu boyuttan küçük olmamak üzere ölçekli çözülür (büyük fotoğraflarda çözme süresi düşer).
+    """
+    Image, ImageOps = _pillow()
+    image = Image.open(BytesIO(data))
+    if draft_size and image.format == "JPEG":
+        image.draft("RGB", draft_size)
+    image = ImageOps.exif_transpose(image)
+    if image.mode != "RGB":
+        # Şeffaf görselleri beyaz zemin üzerine yerleştir
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[-1])
+            image = background
+        else:
+            image = image.convert("RGB")
+    image.load()
+    return image
+
+
+def prepare_image_for_upload(data, max_side=MAX_UPLOAD_SIDE, quality=UPLOAD_JPEG_QUALITY):
+    """
+    Görseli EXIF yönüne göre döndürür, en uzun kenarı max_side olacak şekilde küçültür ve
+    JPEG olarak sıkıştırır. (jpeg_baytları, (genişlik, yükseklik)) döndürür.
+    """
+    Image, _ImageOps = _pillow()
+    image = open_image(data, draft_size=(max_side, max_side))
+    image.thumbnail((max_side, max_side), Image.LANCZOS)
+    buffered = BytesIO()
+    image.save(buffered, format="JPEG", quality=quality, optimize=True)
+    return buffered.getvalue(), image.size
+
+
+# --- Platform Görsel Sürümleri ---
+# Her platform için hedef boyut, kırpma biçimi (cover: ortadan kırparak doldur, contain: oranı
+# koruyarak sığdır), kodlama ve kalite. max_bytes aşılırsa kalite RENDITION_MIN_QUALITY'ye kadar
+# adım adım düşürülür.
+RENDITION_SPECS = {
+    "instagram_square": {"label": "Instagram Kare", "size": (1080, 1080), "fit": "cover", "format": "JPEG", "quality": 88, "max_bytes": 1_000_000},
+    "instagram_portrait": {"label": "Instagram Dikey", "size": (1080, 1350), "fit": "cover", "format": "JPEG", "quality": 88, "max_bytes": 1_000_000},
+    "facebook": {"label": "Facebook", "size": (1200, 630), "fit": "cover", "format": "JPEG", "quality": 85, "max_bytes": 800_000},
+    "linkedin": {"label": "LinkedIn", "size": (1200, 627), "fit": "cover", "format": "JPEG", "quality": 85, "max_bytes": 800_000},
+    "bazaraki": {"label": "Bazaraki İlanı", "size": (1280, 960), "fit": "cover", "format": "JPEG", "quality": 82, "max_bytes": 600_000},
+    "web": {"label": "Web / Blog", "size": (1600, 1600), "fit": "contain", "format": "WEBP", "quality": 80, "max_bytes": 400_000},
+    "thumbnail": {"label": "Küçük Önizleme", "size": (480, 480), "fit": "contain", "format": "WEBP", "quality": 75},
+}
+RENDITION_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+RENDITION_MIN_QUALITY = int(os.environ.get("RENDITION_MIN_QUALITY", "55"))
+
+
+def render_rendition(image, spec):
+    """
+    open_image() ile çözülmüş görselden tek bir sürüm üretir; (baytlar, (genişlik, yükseklik))
+    döndürür. Kaynak görsel değiştirilmez, aynı görsel birden çok thread'de kullanılabilir.
+    """
+    Image, _ImageOps = _pillow()
+    target_width, target_height = spec["size"]
+    if spec["fit"] == "cover":
+        # Hedef oranındaki orta bölge doğrudan hedef boyuta örneklenir (ara kopya oluşmaz)
+        scale = max(target_width / image.width, target_height / image.height)
+        crop_width, crop_height = target_width / scale, target_height / scale
+        left, top = (image.width - crop_width) / 2, (image.height - crop_height) / 2
+        rendered = image.resize((target_width, target_height), Image.LANCZOS,
+                                box=(left, top, left + crop_width, top + crop_height), reducing_gap=3.0)
+    else:
+        scale = min(1.0, target_width / image.width, target_height / image.height)
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        rendered = image if size == image.size else image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+    quality = spec["quality"]
+    while True:
+        buffered = BytesIO()
+        if spec["format"] == "WEBP":
+            rendered.save(buffered, format="WEBP", quality=quality, method=4)
+        else:
+            rendered.save(buffered, format="JPEG", quality=quality, optimize=True, progressive=True)
+        data = buffered.getvalue()
+        if not spec.get("max_bytes") or len(data) <= spec["max_bytes"] or quality <= RENDITION_MIN_QUALITY:
+            return data, rendered.size
+        quality = max(RENDITION_MIN_QUALITY, quality - 8)
@@ -0,0 +1,253 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Çağrı Başına Ölçüm (Süre, Token, Maliyet) ---
+# Her sağlayıcı (Gemini/OpenAI) ve backend çağrısı instrument() bağlamında çalışır; süre,
+# girdi/çıktı token, model, önbellek isabeti, yeniden deneme sayısı ve hata sınıfı kaydedilir.
+# Alt katmanlar (gemini_generate, HTTP istemcisi) etkin çağrıya current_call() ile ulaşır.
+# Toplamlar Prometheus metin biçiminde dışa verilir (METRICS_PORT ayarlıysa /metrics).
+
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))
+RECENT_CALLS = int(os.environ.get("METRICS_RECENT_CALLS", "500"))
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Tahmini birim fiyatlar (USD). MODEL_COSTS ortam değişkeniyle JSON olarak değiştirilebilir:
+# MODEL_COSTS='{"gemini/gemini-2.0-flash": {"input_per_million": 0.1, "output_per_million": 0.4}}'
+DEFAULT_MODEL_COSTS = {
+    "gemini/gemini-2.0-flash": {"input_per_million": 0.10, "output_per_million": 0.40},
+    "gemini/gemini-1.5-flash": {"input_per_million": 0.075, "output_per_million": 0.30},
+    "openai/dall-e-3": {"per_call": 0.040},
+    "openai/gpt-4o-mini": {"input_per_million": 0.15, "output_per_million": 0.60},
+}
+
+
+def _load_costs():
+    costs = dict(DEFAULT_MODEL_COSTS)
+    raw = os.environ.get("MODEL_COSTS")
+    if raw:
+        costs.update(json.loads(raw))
+    return costs
+
+
+_costs = _load_costs()
+
+
+def estimate_cost(provider, model, input_tokens, output_tokens):
+    """Çağrının tahmini maliyeti (USD); fiyatı bilinmeyen modeller için 0."""
+    price = _costs.get(f"{provider}/{model}")
+    if not price:
+        return 0.0
+    return (
+        price.get("per_call", 0.0)
+        + input_tokens * price.get("input_per_million", 0.0) / 1_000_000
+        + output_tokens * price.get("output_per_million", 0.0) / 1_000_000
+    )
+
+
+class CallRecord:
+    """Tek bir çağrının ölçümleri; çağrı sürerken alt katmanlar tarafından doldurulur."""
+
+    def __init__(self, provider, operation, model=""):
+        self.provider = provider
+        self.operation = operation
+        self.model = model
+        self.started_at = time.time()
+        self.duration_seconds = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache = "none"
+        self.retries = 0
+        self.error_class = ""
+        self.cost = 0.0
+
+    def add_retry(self, *_args):
+        self.retries += 1
+
+    def add_tokens(self, input_tokens, output_tokens):
+        self.input_tokens += input_tokens or 0
+        self.output_tokens += output_tokens or 0
+
+    def mark_cache(self, hit):
+        self.cache = "hit" if hit else "miss"
+
+    def fail(self, error):
+        self.error_class = type(error).__name__
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class CallMetrics:
+    """Süreç genelindeki çağrı ölçümleri: son çağrılar ve Prometheus için toplamlar."""
+
+    def __init__(self, recent_limit=RECENT_CALLS):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=recent_limit)
+        self._series = {}
+
+    def record(self, call):
+        key = (call.provider, call.operation, call.model)
+        with self._lock:
+            self._recent.append(call)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "calls": 0, "errors": 0, "cache_hits": 0, "retries": 0, "duration_seconds": 0.0,
+                    "input_tokens": 0, "output_tokens": 0, "cost": 0.0, "buckets": [0] * len(DURATION_BUCKETS),
+                    "error_classes": {},
+                }
+            series["calls"] += 1
+            series["retries"] += call.retries
+            series["duration_seconds"] += call.duration_seconds
+            series["input_tokens"] += call.input_tokens
+            series["output_tokens"] += call.output_tokens
+            series["cost"] += call.cost
+            if call.cache == "hit":
+                series["cache_hits"] += 1
+            if call.error_class:
+                series["errors"] += 1
+                series["error_classes"][call.error_class] = series["error_classes"].get(call.error_class, 0) + 1
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if call.duration_seconds <= bound:
+                    series["buckets"][index] += 1
+
+    def recent(self, limit=50):
+        with self._lock:
+            return [call.as_dict() for call in list(self._recent)[-limit:]]
+
+    def summary(self):
+        """(sağlayıcı, işlem, model) başına toplamlar; toplam süreye göre azalan sırada."""
+        with self._lock:
+            rows = [
+                {"provider": provider, "operation": operation, "model": model,
+                 **{name: value for name, value in series.items() if name != "buckets"}}
+                for (provider, operation, model), series in self._series.items()
+            ]
+        for row in rows:
+            row["avg_seconds"] = row["duration_seconds"] / row["calls"] if row["calls"] else 0.0
+        return sorted(rows, key=lambda row: row["duration_seconds"], reverse=True)
+
+    def render_prometheus(self):
+        """Toplamları Prometheus metin biçiminde döndürür."""
+        with self._lock:
+            items = [(key, dict(series, buckets=list(series["buckets"]), error_classes=dict(series["error_classes"])))
+                     for key, series in self._series.items()]
+        lines = [
+            "# HELP premiumhome_call_duration_seconds Sağlayıcı/backend çağrı süresi.",
+            "# TYPE premiumhome_call_duration_seconds histogram",
+        ]
+        for (provider, operation, model), series in items:
+            labels = _labels(provider=provider, operation=operation, model=model)
+            for bound, count in zip(DURATION_BUCKETS, series["buckets"]):
+                lines.append(f'premiumhome_call_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'premiumhome_call_duration_seconds_bucket{{{labels},le="+Inf"}} {series["calls"]}')
+            lines.append(f"premiumhome_call_duration_seconds_sum{{{labels}}} {series['duration_seconds']}")
+            lines.append(f"premiumhome_call_duration_seconds_count{{{labels}}} {series['calls']}")
+        counters = (
+            ("premiumhome_call_cache_hits_total", "Önbellekten karşılanan çağrılar.", "cache_hits"),
+            ("premiumhome_call_retries_total", "Hız sınırı/geçici hata nedeniyle yapılan yeniden denemeler.", "retries"),
+            ("premiumhome_call_input_tokens_total", "Girdi token sayısı.", "input_tokens"),
+            ("premiumhome_call_output_tokens_total", "Çıktı token sayısı.", "output_tokens"),
+            ("premiumhome_call_cost_usd_total", "Tahmini maliyet (USD).", "cost"),
+        )
+        for name, help_text, field in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (provider, operation, model), series in items:
+                lines.append(f"{name}{{{_labels(provider=provider, operation=operation, model=model)}}} {series[field]}")
+        lines += ["# HELP premiumhome_call_errors_total Hata sınıfına göre başarısız çağrılar.",
+                  "# TYPE premiumhome_call_errors_total counter"]
+        for (provider, operation, model), series in items:
+            for error_class, count in series["error_classes"].items():
+                labels = _labels(provider=provider, operation=operation, model=model, error_class=error_class)
+                lines.append(f"premiumhome_call_errors_total{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+_metrics = CallMetrics()
+_local = threading.local()
+
+
+def get_call_metrics():
+    return _metrics
+
+
+def current_call():
+    """Bu thread'de süren en içteki çağrı kaydı; yoksa None."""
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def instrument(provider, operation, model=""):
+    """
+    Bloğu tek bir çağrı olarak ölçer ve kaydeder. Bloktan çıkan istisnanın sınıfı kaydedilip
+    yeniden fırlatılır; hatayı metne çeviren kod call.fail(e) ile hata sınıfını bildirebilir.
+    """
+    call = CallRecord(provider, operation, model)
+    stack = _local.__dict__.setdefault("stack", [])
+    stack.append(call)
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception as e:
+        call.fail(e)
+        raise
+    finally:
+        stack.pop()
+        call.duration_seconds = time.perf_counter() - started
+        # Önbellek isabetleri ve başarısız çağrılar (ör. reddedilen DALL-E isteği) ücretlendirilmez
+        if call.cache != "hit" and not call.error_class:
+            call.cost = estimate_cost(provider, model, call.input_tokens, call.output_tokens)
+        _metrics.record(call)
+
+
+def record_cache_hit(provider, operation, model=""):
+    """Sağlayıcıya gitmeden önbellekten karşılanan bir çağrıyı kaydeder."""
+    with instrument(provider, operation, model) as call:
+        call.mark_cache(True)
+
+
+# --- /metrics Uç Noktası ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = _metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT, host="0.0.0.0"):
+    """/metrics uç noktasını arka planda bir kez başlatır; port 0 ise başlatmaz. Sunucuyu döndürür."""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            _server = server
+        return _server
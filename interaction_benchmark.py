@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from bench_fakes import LatencyProfile, StubBackend
+from startup_benchmark import run_python
+
+# --- Etkileşim Başına Script Süresi Benchmark'ı ---
+# Büyük bir görsel yüklüyken app.py'de tek bir widget değiştirildiğinde ne kadar script çalıştığını
+# ölçer. Her çalışma ağacı (--root, birden fazla verilebilir) yeni bir Python sürecinde Streamlit
+# AppTest ile çalıştırılır.
+#   tam sayfa: etkileşim sonrası tüm script'in süresi (fragment'sız sürümde her etkileşimde olan)
+#   bölüm:     etkileşimin olduğu bölümün timed_section süresi; fragment'lı sürümde etkileşim
+#              yalnızca bu bölümü yeniden çalıştırır (AppTest her zaman tam sayfa çalıştırdığı
+#              için fragment yeniden çalışmasının süresi bu kayıttan okunur)
+# Ağa çıkmayan etkileşimler seçilmiştir. Süreç startup_benchmark ile aynı çevrimdışı ortamda
+# çalışır: sahte API anahtarları, yerel sahte backend, kapalı model ısıtması ve diğer HTTP(S)
+# trafiği için kapalı bir yerel proxy; yerel depolar geçici bir dizine yazılır.
+#
+#   git worktree add /tmp/fragmentsiz <commit> && python interaction_benchmark.py --root /tmp/fragmentsiz --root .
+
+# (bölüm adı, widget türü, widget anahtarı, birbirini izleyen değerler)
+INTERACTIONS = (
+    ("text", "text_area", "prompt_input", ("Limasol'da modern villa", "Kıbrıs'ta Tiny House yaşamı")),
+    ("format", "selectbox", "platform_selector", ("LinkedIn", "Facebook")),
+    ("image_generation", "text_area", "image_prompt_input", ("Gün batımında prefabrik ev", "Kar altında metal ev")),
+    ("youtube", "text_area", "youtube_prompt_input", ("Tiny House turu", "Prefabrik ev montajı")),
+)
+
+MEASURE_SNIPPET = """
+import io, json, sys, time
+from PIL import Image
+from streamlit.testing.v1 import AppTest
+
+app_path, width, height, repeats, interactions = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4]), json.loads(sys.argv[5])
+image = Image.merge("RGB", [Image.effect_noise((width, height), 40 + 20 * i).convert("L") for i in range(3)])
+buffer = io.BytesIO()
+image.save(buffer, format="JPEG", quality=92)
+image_bytes = buffer.getvalue()
+
+at = AppTest.from_file(app_path, default_timeout=300).run()
+at.file_uploader(key="image_uploader").set_value(("buyuk.jpg", image_bytes, "image/jpeg"))
+at.run()
+if at.exception:
+    sys.exit("Uygulama hatası: " + str(at.exception[0].value))
+
+results = {"image_mb": len(image_bytes) / 1e6, "interactions": {}}
+for section, widget_type, key, values in interactions:
+    full_run_ms, section_ms = [], []
+    for repeat in range(repeats):
+        try:
+            widget = getattr(at, widget_type)(key=key)
+        except KeyError:
+            break  # Bu sürümde widget yalnızca belirli bir durumdan sonra çiziliyor
+        widget.set_value(values[repeat % len(values)])
+        started = time.perf_counter()
+        at.run()
+        full_run_ms.append((time.perf_counter() - started) * 1000)
+        if at.exception:
+            sys.exit("Uygulama hatası: " + str(at.exception[0].value))
+        timings = at.session_state["section_timings"] if "section_timings" in at.session_state else {}
+        if section in timings:
+            section_ms.append(timings[section])
+    if full_run_ms:
+        results["interactions"][section] = {"full_run_ms": full_run_ms, "section_ms": section_ms}
+print(json.dumps(results))
+"""
+
+
+def measure(root, work_dir, backend_url, width, height, repeats):
+    completed = run_python(
+        ["-c", MEASURE_SNIPPET, os.path.join(root, "app.py"), str(width), str(height), str(repeats),
+         json.dumps(INTERACTIONS)],
+        root, work_dir, backend_url,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_report(results):
+    for root, result in results.items():
+        print(f"Çalışma ağacı: {root} (görsel {result['image_mb']:.1f} MB)")
+        print(f"  {'bölüm':<20}{'tam sayfa ms':>14}{'bölüm ms':>12}")
+        for section, row in result["interactions"].items():
+            section_ms = f"{statistics.median(row['section_ms']):.1f}" if row["section_ms"] else "-"
+            print(f"  {section:<20}{statistics.median(row['full_run_ms']):>14.1f}{section_ms:>12}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Büyük görsel yüklüyken etkileşim başına script süresi.")
+    parser.add_argument("--root", action="append", help="Ölçülecek çalışma ağacı (birden fazla verilebilir)")
+    parser.add_argument("--width", type=int, default=6000, help="Yüklenen görselin genişliği (px)")
+    parser.add_argument("--height", type=int, default=4000, help="Yüklenen görselin yüksekliği (px)")
+    parser.add_argument("--repeats", type=int, default=5, help="Etkileşim başına tekrar (medyan raporlanır)")
+    parser.add_argument("--json", help="Sonuçların yazılacağı JSON dosyası")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    roots = [os.path.abspath(root) for root in (args.root or [os.path.dirname(os.path.abspath(__file__))])]
+    results = {}
+    backend = StubBackend(LatencyProfile(mean_seconds=0.01, jitter_seconds=0.0, seed=0)).start()
+    try:
+        for root in roots:
+            with tempfile.TemporaryDirectory(prefix="premiumhome-interaction-") as work_dir:
+                try:
+                    results[root] = measure(root, work_dir, backend.base_url, args.width, args.height, max(1, args.repeats))
+                except RuntimeError as e:
+                    print(f"Hata: Ölçüm başarısız ({root}): {e}", file=sys.stderr)
+                    return 1
+    finally:
+        backend.stop()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import threading
+import time
+
+# --- Model/İstemci Kaydı ---
+# API anahtarları, genai.configure ve OpenAI istemcisi süreç başına bir kez kurulur;
+# GenerativeModel nesneleri (model adı, sistem talimatı) başına bir kez oluşturulup yeniden
+# kullanılır. warm_up() modellerin erişilebilirliğini kontrol eder ve bağlantıları ısıtır.
+# Sağlayıcı SDK'ları (google.generativeai ~1 sn, openai ~0.5 sn) ilk kullanımda import edilir
+# ve anahtarlar o sağlayıcı ilk kez kullanılırken doğrulanır; böylece yalnızca istatistik
+# bölümünü açan bir kullanıcı için ilk sayfa çizimi SDK yüklemesini beklemez.
+
+GEMINI_KEY_MISSING = "Gemini API anahtarı bulunamadı. Lütfen 'GOOGLE_API_KEY' ortam değişkenini veya Streamlit Secrets'ı ayarlayın."
+OPENAI_KEY_MISSING = "OpenAI API anahtarı bulunamadı. Lütfen 'OPENAI_API_KEY' ortam değişkenini veya Streamlit Secrets'ı ayarlayın."
+
+
+class ModelRegistry:
+    """Gemini modellerini ve OpenAI istemcisini süreç genelinde tutan kayıt."""
+
+    def __init__(self, gemini_api_key, openai_api_key):
+        self._gemini_api_key = gemini_api_key
+        self._openai_api_key = openai_api_key
+        self._genai = None
+        self._openai_client = None
+        self.health = {}
+        self._models = {}
+        self._lock = threading.Lock()
+        self._sdk_lock = threading.Lock()
+
+    def missing_keys(self):
+        """Eksik anahtarların hata mesajlarını döndürür (SDK import etmez)."""
+        return [message for key, message in ((self._gemini_api_key, GEMINI_KEY_MISSING), (self._openai_api_key, OPENAI_KEY_MISSING))
+                if not key]
+
+    @property
+    def genai(self):
+        """google.generativeai modülü; ilk erişimde import edilip anahtarla yapılandırılır."""
+        with self._sdk_lock:
+            if self._genai is None:
+                if not self._gemini_api_key:
+                    raise ValueError(GEMINI_KEY_MISSING)
+                import google.generativeai as genai
+                genai.configure(api_key=self._gemini_api_key)
+                self._genai = genai
+            return self._genai
+
+    @property
+    def openai_client(self):
+        """OpenAI istemcisi; ilk erişimde import edilip kurulur."""
+        with self._sdk_lock:
+            if self._openai_client is None:
+                if not self._openai_api_key:
+                    raise ValueError(OPENAI_KEY_MISSING)
+                from openai import OpenAI
+                self._openai_client = OpenAI(api_key=self._openai_api_key)
+            return self._openai_client
+
+    def gemini(self, model_name, system_instruction=None):
+        """(model adı, sistem talimatı) için tek bir GenerativeModel örneği döndürür."""
+        key = (model_name, system_instruction)
+        with self._lock:
+            model = self._models.get(key)
+        if model is None:
+            genai = self.genai
+            with self._lock:
+                model = self._models.get(key)
+                if model is None:
+                    model = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+                    self._models[key] = model
+        return model
+
+    def warm_up(self, gemini_models=(), openai_models=()):
+        """
+        Model meta verisini çekerek anahtarları ve erişimi doğrular (üretim kotası harcamaz).
+        Sonuçlar {ad: {"ok": bool, "latency_seconds": float, "error": str}} olarak health'e yazılır;
+        arayüz okurken health_snapshot() kullanmalıdır (ısıtma arka planda sürerken yazılır).
+        """
+        checks = [(f"gemini/{name}", lambda name=name: self.genai.get_model(f"models/{name}")) for name in gemini_models]
+        checks += [(f"openai/{name}", lambda name=name: self.openai_client.models.retrieve(name)) for name in openai_models]
+        for name, check in checks:
+            started = time.perf_counter()
+            try:
+                check()
+                result = {"ok": True, "latency_seconds": time.perf_counter() - started, "error": ""}
+            except Exception as e:
+                result = {"ok": False, "latency_seconds": time.perf_counter() - started, "error": str(e)}
+            with self._lock:
+                self.health[name] = result
+        return self.health_snapshot()
+
+    def health_snapshot(self):
+        """health'in kopyası; ısıtma thread'i yazarken güvenle dolaşılabilir."""
+        with self._lock:
+            return dict(self.health)
+
+    def warm_up_async(self, gemini_models=(), openai_models=()):
+        """warm_up'ı arka planda çalıştırır; ilk sayfa çizimini bekletmez."""
+        thread = threading.Thread(
+            target=self.warm_up, args=(gemini_models, openai_models), name="model-warm-up", daemon=True
+        )
+        thread.start()
+        return thread
@@ -0,0 +1,124 @@
+from string import Template
+
+# --- Prompt Şablon Kaydı ---
+# Tüm prompt şablonları modül yüklenirken bir kez derlenir; çağrı başına yalnızca değişken
+# alanlar ($text, $prompt_text, $target_language ...) yerleştirilir. Statik şirket bağlamı
+# prompt'a eklenmez, modelin system_instruction'ı olarak bir kez verilir.
+
+# --- Şirket Bilgileri (AI'ya sürekli anımsatılacak) ---
+COMPANY_INFO_CONTEXT = """
+Şirket Adı: Premium Home
+Ana Faaliyet Alanları: Metal evler, prefabrik yapılar, Tiny House üretimi ve inşaatı, nanoteknoloji zemin ısıtma sistemleri. Anahtar teslim çözümler sunar.
+Misyon: Yenilikçi, sürdürülebilir, modern ve uygun fiyatlı yaşam/çalışma alanları sunmak.
+Hedef Kitle: Metal ev ve prefabrik yapılarla ilgilenen, Tiny House kültürünü benimsemek isteyen, Avrupa bölgelerinde bulunan kişiler ve profesyoneller.
+"""
+
+COMPANY_SOCIAL_PRESENCE_CONTEXT = """
+Web Sitesi: https://www.premiumpluscy.eu
+Katalog Sitesi: https://linktr.ee/premiumplushome
+Instagram Hesabı: https://www.instagram.com/premiumplushome
+Facebook Sayfası: https://www.facebook.com/PremiumPlusHomeCyprus
+LinkedIn Sayfası: https://www.linkedin.com/company/premium-home-ltd
+"""
+
+# Gemini metin modellerine bir kez verilen sistem talimatı
+SYSTEM_INSTRUCTION = (
+    "Sen Premium Home için içerik üreten bir sosyal medya asistanısın. "
+    "Tüm yanıtlarında aşağıdaki şirket bilgilerini, faaliyet alanlarını ve sosyal medya hesaplarını göz önünde bulundur.\n"
+    f"{COMPANY_INFO_CONTEXT}\n{COMPANY_SOCIAL_PRESENCE_CONTEXT}"
+)
+
+DEFAULT_FORMAT_TEMPLATE = "format:default"
+
+_TEMPLATE_SOURCES = {
+    "text": (
+        "Şu içerik isteğini tamamla: '$prompt_text'. Lütfen çıktıyı $target_language dilinde oluştur."
+    ),
+    "text_multilanguage": (
+        "Şu içerik isteğini tamamla: '$prompt_text'. Çıktıyı şu dillerin her biri için ayrı ayrı oluştur: $languages. "
+        "Yanıtı yalnızca anahtarları tam olarak $languages_json olan ve değerleri ilgili dildeki metin olan bir JSON nesnesi olarak ver."
+    ),
+    "youtube": (
+        "'$prompt_text' konusunda bir YouTube videosu fikri oluştur. "
+        "Başlık önerileri, anahtar noktalar (video içeriği), kısa bir senaryo taslağı (giriş, gelişme, sonuç) ve potansiyel görsel/çekim fikirleri içermeli. "
+        "Hazırlanan metin ve video fikri Premium Home'un web sitesi ve sosyal medya kanallarına uygun olmalıdır. "
+        "Çıktıyı $target_language dilinde ver."
+    ),
+    # DALL-E sistem talimatı desteklemediği için şirket bağlamı görsel prompt'unda kalır
+    "image": (
+        f"{COMPANY_INFO_CONTEXT}\n\n"
+        "Yukarıdaki şirket bilgilerini ve faaliyet alanlarını göz önünde bulundurarak, şu görseli oluştur: "
+        "'$image_prompt_text'. Lütfen modern, profesyonel ve yüksek çözünürlüklü bir stil kullan."
+    ),
+    "format:Instagram": (
+        "Aşağıdaki metni görsel odaklı ve direkt paylaşılmaya hazır bir Instagram gönderisine dönüştür. "
+        "Verilen örnekteki gibi kısa paragraflar, emoji ve trend hashtagler kullan. '📞 Contact Us' ve '🔗 Website' gibi net CTA'lar ekle. "
+        "Metni orijinal anlamını koruyarak, Instagram'ın karakter sınırlamalarına uygun ama bilgilendirici olacak şekilde $target_language dilinde düzenle. "
+        "Örnek İçerik Tarzı:\n"
+        "🏡 Countryside 72m² – Modern, Modular, and Comfortable Living!\n\n"
+        "Looking for a stylish, energy-efficient home?\n"
+        "✅ Spacious Design: 3 bedrooms, 1 kitchen, 1 bathroom\n"
+        "✅ Durability & Quality: Premium+ materials, insulated walls, and aluminum windows\n"
+        "✅ Fast Installation: Average 8 weeks delivery time\n"
+        "✅ Turnkey Price: Starting from €59,900 (excluding VAT)\n\n"
+        "📞 Contact Us:\n"
+        "📍 Address: Iasonos 1082, Nicosia, Cyprus\n"
+        "🌐 Web: www.premiumpluscy.eu\n"
+        "📩 Email: seller@premiumpluscy.eu\n"
+        "📲 Phone: +357 97550946 | +357 22584081\n\n"
+        "📩 Send us a DM or visit our website for more details!\n"
+        "🔗 www.premiumpluscy.eu\n\n"
+        "#ModularHome #PrefabHouse #EcoFriendlyLiving #SmartLiving #minimalisthome\n\n"
+        "Metin: \n\n$text"
+    ),
+    "format:Facebook": (
+        "Aşağıdaki metni Facebook topluluğu için samimi, bilgilendirici ve direkt paylaşılmaya hazır bir gönderiye dönüştür. "
+        "Paylaşımı teşvik eden sorular, topluluk odaklı ifadeler ve uygun hashtagler kullan. "
+        "Metni video veya görsel içeriğe eşlik edebilecek, sohbeti başlatacak şekilde $target_language dilinde yaz. "
+        "Şirket web sitesi ve katalog linklerini uygun yerlerde belirterek, kişisel hesap yerine işletme sayfası üzerinden paylaşılacak bir dil kullan. Metin: \n\n$text"
+    ),
+    "format:LinkedIn": (
+        "Aşağıdaki metni LinkedIn profesyonel ağı için bilgilendirici, otoriter ve direkt paylaşılmaya hazır bir gönderiye dönüştür. "
+        "Sektörel içgörüler, profesyonel terimler ve konuyla ilgili hashtagler kullan. "
+        "Değer katan bilgiler sun ve tartışmayı teşvik et. "
+        "Şirket web sitesi ve katalog linklerini uygun yerlerde belirterek, kurumsal bir dil kullan. "
+        "Çıktıyı $target_language dilinde ver. Metin: \n\n$text"
+    ),
+    "format:Genel Blog Yazısı": (
+        "Aşağıdaki metni bir blog yazısı formatına dönüştür. Blogun ana başlığını, alt başlıklarını ve paragraflarını açıkça belirt. "
+        "Okunabililiği artırmak için giriş, gelişme (alt başlıklar kullanarak) ve sonuç bölümleri oluştur. "
+        "Anahtar kelimelerle zenginleştirilmiş, bilgilendirici ve SEO dostu bir yapı kur. "
+        "Web sitesi ve katalog linklerini uygun yerlerde belirt. Çıktıyı $target_language dilinde ver. Metin: \n\n$text"
+    ),
+    "format:E-posta Bülteni": (
+        "Aşağıdaki metni kısa, öz ve okuyucuyu harekete geçiren bir e-posta bülteni içeriğine dönüştür. "
+        "Net bir konu başlığı (subject line) öner, kısa giriş, ana faydaları vurgulayan maddeler veya kısa paragraflar ve net bir harekete geçirici mesaj (CTA) içer. "
+        "Web sitesi ve katalog linklerini uygun yerlerde belirt. Çıktıyı $target_language dilinde ver. Metin: \n\n$text"
+    ),
+    "format:Bazaraki.com İlanı": (
+        "Aşağıdaki metni Kıbrıs'taki Bazaraki.com emlak sitesi için uygun, kısa ve çekici bir ilan metnine dönüştür. "
+        "İlanın ilk paragrafı kısa ve vurucu olmalı, ardından madde işaretleriyle temel özellikleri (metrekare, oda sayısı, malzeme, kurulum süresi, fiyat aralığı) belirtilmelidir. "
+        "Müşteriyi web sitesi veya katalog sitesine yönlendiren net bir harekete geçirici mesaj (CTA) içermelidir. "
+        "Konum olarak Kıbrıs'a odaklan. Çıktıyı $target_language dilinde ver. Metin: \n\n$text"
+    ),
+    # Varsayılan veya bilinmeyen platformlar için
+    DEFAULT_FORMAT_TEMPLATE: (
+        "Aşağıdaki metni genel bir sosyal medya platformu için uygun, ilgi çekici ve etkileşim artırıcı bir gönderi formatında yeniden yaz. "
+        "Gerektiğinde emoji ve uygun hashtagler ekle. Metni orijinal anlamını koruyarak düzenle. "
+        "Çıktıyı $target_language dilinde ver. "
+        "Metin: \n\n$text"
+    ),
+}
+
+PROMPT_TEMPLATES = {name: Template(source) for name, source in _TEMPLATE_SOURCES.items()}
+
+
+def render_prompt(name, **values):
+    """Derlenmiş şablonu verilen değerlerle doldurur."""
+    return PROMPT_TEMPLATES[name].substitute(values)
+
+
+def format_template_name(platform):
+    """Platform için şablon adını döndürür; bilinmeyen platformlar varsayılan şablona düşer."""
+    name = f"format:{platform}"
+    return name if name in PROMPT_TEMPLATES else DEFAULT_FORMAT_TEMPLATE
@@ -0,0 +1,218 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+
+# --- Kota Farkındalıklı Hız Sınırlayıcı ---
+# Her sağlayıcı/model çifti için dakikadaki istek (RPM) ve dakikadaki token (TPM) kovaları.
+# Çağrılar kovada yer açılana kadar sırada bekler; 429/kota hatalarında Retry-After'a uyarak
+# üstel geri çekilmeyle yeniden denenir. Birden çok kullanıcıdan gelen ani yükler böylece
+# hataya dönüşmek yerine gecikmeye dönüşür.
+
+# Varsayılan sınırlar (dakika başına). RATE_LIMITS ortam değişkeniyle JSON olarak değiştirilebilir:
+# RATE_LIMITS='{"gemini/gemini-2.0-flash": {"rpm": 15, "tpm": 1000000}}'
+DEFAULT_LIMITS = {
+    "gemini/gemini-2.0-flash": {"rpm": 60, "tpm": 1_000_000},
+    "gemini/gemini-1.5-flash": {"rpm": 60, "tpm": 1_000_000},
+    "openai/dall-e-3": {"rpm": 5, "tpm": None},
+    "openai/gpt-4o-mini": {"rpm": 500, "tpm": 200_000},
+}
+FALLBACK_LIMITS = {"rpm": 30, "tpm": None}
+MAX_WAIT_SECONDS = float(os.environ.get("RATE_LIMIT_MAX_WAIT_SECONDS", "60"))
+MAX_RETRIES = int(os.environ.get("RATE_LIMIT_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.environ.get("RATE_LIMIT_BACKOFF_BASE", "1"))
+BACKOFF_MAX = float(os.environ.get("RATE_LIMIT_BACKOFF_MAX", "30"))
+
+
+class RateLimitTimeout(Exception):
+    """İstek kovada yer açılmasını MAX_WAIT_SECONDS'tan uzun beklediğinde fırlatılır."""
+
+
+def is_rate_limit_error(error):
+    """429 / kota aşımı hatalarını tanır (Gemini ve OpenAI istisna mesajlarına göre)."""
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    error_msg = str(error)
+    return (
+        "429" in error_msg
+        or "TooManyRequests" in error_msg
+        or "rate limit" in error_msg.lower()
+        or "resource has been exhausted" in error_msg.lower()
+        or ("quota" in error_msg.lower() and "insufficient_quota" not in error_msg.lower())
+    )
+
+
+def retry_after_seconds(error):
+    """Hatadan sunucunun önerdiği bekleme süresini çıkarır (Retry-After başlığı veya mesaj içi retry_delay)."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+    match = re.search(r"retry[_ ]?(?:delay|in|after)\D{0,20}?(\d+(?:\.\d+)?)\s*s", str(error), re.IGNORECASE)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def estimate_tokens(*parts):
+    """Kaba token tahmini (~4 karakter = 1 token); TPM kovası için yeterli."""
+    return max(1, sum(len(part) for part in parts if isinstance(part, str)) // 4)
+
+
+class TokenBucket:
+    """Dakikalık kapasiteyle sürekli dolan klasik token kovası."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount, now):
+        """amount kadar token için beklenmesi gereken süre (0 ise hemen alınabilir)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class ModelRateLimiter:
+    """Tek bir sağlayıcı/model için RPM + TPM sınırlayıcı; kuyruk derinliği ve bekleme süresi tutar."""
+
+    def __init__(self, name, rpm, tpm=None):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._cond = threading.Condition()
+        self.queue_depth = 0
+        self.total_calls = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.retries = 0
+        self.rate_limit_errors = 0
+
+    def acquire(self, estimated_tokens=1, max_wait=MAX_WAIT_SECONDS):
+        """Kovalarda yer açılana kadar bekler; beklenen süreyi döndürür."""
+        started = time.monotonic()
+        deadline = started + max_wait
+        with self._cond:
+            self.queue_depth += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self.requests.wait_time(1, now)
+                    if self.tokens is not None:
+                        wait = max(wait, self.tokens.wait_time(estimated_tokens, now))
+                    if wait <= 0:
+                        self.requests.take(1)
+                        if self.tokens is not None:
+                            self.tokens.take(estimated_tokens)
+                        break
+                    if now + wait > deadline:
+                        raise RateLimitTimeout(f"{self.name} için hız sınırı kuyruğunda bekleme süresi aşıldı.")
+                    self._cond.wait(wait)
+            finally:
+                self.queue_depth -= 1
+            waited = time.monotonic() - started
+            self.total_calls += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            return waited
+
+    def penalize(self, seconds):
+        """
+        429 sonrası istek kovasını, bir sonraki izin ancak `seconds` sonra çıkacak şekilde boşaltır.
+        Böylece yalnızca yeniden denenen çağrı değil, sıradaki tüm çağrılar da bekler.
+        """
+        with self._cond:
+            self.requests._refill(time.monotonic())
+            self.requests.tokens = min(self.requests.tokens, 1 - seconds * self.requests.rate)
+            self._cond.notify_all()
+
+    def record_rate_limit_error(self, retrying):
+        with self._cond:
+            self.rate_limit_errors += 1
+            if retrying:
+                self.retries += 1
+
+    def stats(self):
+        with self._cond:
+            return {
+                "queue_depth": self.queue_depth,
+                "calls": self.total_calls,
+                "avg_wait_seconds": (self.total_wait_seconds / self.total_calls) if self.total_calls else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+                "retries": self.retries,
+                "rate_limit_errors": self.rate_limit_errors,
+            }
+
+
+def _load_limits():
+    limits = dict(DEFAULT_LIMITS)
+    raw = os.environ.get("RATE_LIMITS")
+    if raw:
+        limits.update(json.loads(raw))
+    return limits
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+_limits = _load_limits()
+
+
+def get_rate_limiter(provider, model_name):
+    """Süreç genelinde paylaşılan sağlayıcı/model sınırlayıcısını döndürür."""
+    name = f"{provider}/{model_name}"
+    with _limiters_lock:
+        if name not in _limiters:
+            config = _limits.get(name, FALLBACK_LIMITS)
+            _limiters[name] = ModelRateLimiter(name, config["rpm"], config.get("tpm"))
+        return _limiters[name]
+
+
+def all_rate_limiter_stats():
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
+
+
+def call_with_rate_limit(provider, model_name, func, estimated_tokens=1, max_retries=MAX_RETRIES, on_retry=None):
+    """
+    func()'u sağlayıcı/model sınırlayıcısından izin alarak çağırır. 429/kota hatasında
+    Retry-After'a (yoksa üstel geri çekilme + jitter) göre sırada bekletip yeniden dener; denemeler
+    tükenirse son hatayı fırlatır. Diğer hatalar doğrudan fırlatılır. on_retry(deneme, hata)
+    verilirse her yeniden denemeden önce çağrılır.
+    """
+    limiter = get_rate_limiter(provider, model_name)
+    for attempt in range(max_retries + 1):
+        limiter.acquire(estimated_tokens)
+        try:
+            return func()
+        except Exception as e:
+            if not is_rate_limit_error(e):
+                raise
+            retrying = attempt < max_retries
+            limiter.record_rate_limit_error(retrying)
+            if not retrying:
+                raise
+            if on_retry is not None:
+                on_retry(attempt, e)
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+            # Bekleme, bir sonraki acquire() çağrısında kova üzerinden gerçekleşir
+            limiter.penalize(delay)
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from image_pipeline import RENDITION_MIME_TYPES, RENDITION_SPECS, open_image, render_rendition
+
+# --- Platform Görsel Sürümleri Hattı ---
+# Üretilen veya yüklenen bir görselden tüm platform boyutları (Instagram, Facebook, LinkedIn,
+# Bazaraki, web) ve küçük önizleme paralel üretilir. Kaynak bir kez (gerekirse ölçekli) çözülür,
+# sürümler thread havuzunda kırpılıp kodlanır; Pillow yeniden örnekleme ve kodlama sırasında
+# GIL'i bıraktığından thread'ler çekirdekleri kullanır. Sonuçlar varlık deposunda
+# (kaynak özeti, sürüm adı, sürüm ayarları) takma adıyla önbelleğe alınır.
+
+RENDITION_WORKERS = int(os.environ.get("RENDITION_WORKERS", str(min(8, os.cpu_count() or 2))))
+
+
+class RenditionPipeline:
+    """Kaynak görselin platform sürümlerini üretir ve içerik özetiyle önbelleğe alır."""
+
+    def __init__(self, asset_store, specs=RENDITION_SPECS, max_workers=RENDITION_WORKERS):
+        self.asset_store = asset_store
+        self.specs = dict(specs)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="rendition")
+
+    def _alias(self, source_digest, name):
+        # Sürüm ayarları değişirse eski sürümler kullanılmaz
+        spec_hash = hashlib.sha256(json.dumps(self.specs[name], sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        return f"rendition:{source_digest}:{name}:{spec_hash}"
+
+    def _describe(self, name, digest):
+        spec = self.specs[name]
+        info = self.asset_store.info(digest)
+        if info is None:
+            return None
+        width, height = spec["size"]
+        dimensions = f"{width}×{height}" if spec["fit"] == "cover" else f"en fazla {width}×{height}"
+        return dict(info, name=name, label=spec["label"], format=spec["format"], dimensions=dimensions)
+
+    def cached(self, source_digest, names=None):
+        """Daha önce üretilmiş sürümleri {ad: bilgi} olarak döndürür; kaynak görsel gerekmez."""
+        result = {}
+        for name in names or self.specs:
+            digest = self.asset_store.lookup_alias(self._alias(source_digest, name))
+            info = self._describe(name, digest) if digest else None
+            if info:
+                result[name] = info
+        return result
+
+    def renditions(self, source_digest, load_source, names=None):
+        """
+        İstenen sürümleri (varsayılan: tümü) {ad: bilgi} olarak döndürür. Bilgi; digest, path, mime,
+        size (bayt), label, format ve dimensions alanlarını içerir. load_source() yalnızca
+        önbellekte eksik sürüm varsa çağrılır ve kaynak baytlarını döndürmelidir.
+        """
+        names = list(names or self.specs)
+        result = self.cached(source_digest, names)
+        missing = [name for name in names if name not in result]
+        if missing:
+            largest_side = max(max(self.specs[name]["size"]) for name in missing)
+            image = open_image(load_source(), draft_size=(largest_side, largest_side))
+            futures = {name: self._executor.submit(render_rendition, image, self.specs[name]) for name in missing}
+            for name, future in futures.items():
+                data, _size = future.result()
+                digest = self.asset_store.put(
+                    data, mime=RENDITION_MIME_TYPES[self.specs[name]["format"]], alias=self._alias(source_digest, name)
+                )
+                result[name] = self._describe(name, digest)
+        return {name: result[name] for name in names}
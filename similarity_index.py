@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# --- Benzer Prompt İndeksi (MinHash + LSH) ---
+# Yalnızca boşluk, noktalama, büyük/küçük harf veya kelime sırası farklı olan prompt'lar tam
+# eşleşmeli önbellek anahtarını ıskalar. Bu indeks her üretimin prompt'unu kelime ve karakter
+# 3-gram kümesine (shingle) çevirip MinHash imzasını tutar; LSH bantlarıyla aday bulunur ve
+# benzerlik imzalardan tahmin edilir. Kapsam (tür, model, dil, platform) aynı olmayan kayıtlar
+# hiçbir zaman eşleşmez.
+
+DEFAULT_INDEX_PATH = os.environ.get("NEAR_DUPLICATE_INDEX_PATH", os.path.join(".cache", "prompt_index.sqlite3"))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("NEAR_DUPLICATE_MAX_ENTRIES", "20000"))
+# Aynı kelimelerden oluşan (yalnızca sıra/noktalama/boşluk farklı) prompt'ların sonucu sorulmadan
+# yeniden kullanılır. Tek bir ek bile anlamı değiştirebildiği için ("avantaj"/"dezavantaj" ≈ 0.94)
+# bu karar benzerlik puanına bırakılmaz.
+AUTO_REUSE = os.environ.get("NEAR_DUPLICATE_AUTO_REUSE", "1") not in ("0", "false", "False")
+# Bu benzerliğin üstündeki önceki sonuçlar arayüzde kullanıcıya önerilir
+OFFER_THRESHOLD = float(os.environ.get("NEAR_DUPLICATE_OFFER_THRESHOLD", "0.6"))
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+_PRIME = (1 << 61) - 1
+_permutation_rng = random.Random(1729)  # Sabit tohum: imzalar yeniden başlatmalar arasında kararlı kalır
+_PERMUTATIONS = [(_permutation_rng.randrange(1, _PRIME), _permutation_rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+
+def tokenize(text):
+    """Metni küçük harfli, aksan işaretsiz kelimelere ayırır (noktalama ve boşluk farkları yok sayılır)."""
+    text = unicodedata.normalize("NFKD", unicodedata.normalize("NFKC", text or "").casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r"\w+", text)
+
+
+def shingles(text):
+    """Kelime kümesi + kelime içi karakter 3-gramları; kelime sırası ve ek farklarına dayanıklıdır."""
+    words = tokenize(text)
+    result = {f"w:{word}" for word in words}
+    for word in words:
+        result.update(f"g:{word[i:i + 3]}" for i in range(max(1, len(word) - 2)))
+    return result
+
+
+def same_words(first, second):
+    """İki prompt yalnızca kelime sırası, noktalama, boşluk veya büyük/küçük harfte mi farklı?"""
+    return sorted(tokenize(first)) == sorted(tokenize(second))
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash_signature(shingle_set):
+    hashes = [_hash64(shingle) for shingle in shingle_set] or [0]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def signature_similarity(first, second):
+    """İki imza arasındaki tahmini Jaccard benzerliği (0-1)."""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERMUTATIONS
+
+
+def make_scope(kind, model_name, target_language="", platform="", extra=""):
+    return json.dumps([kind, model_name, target_language or "", platform or "", extra or ""], ensure_ascii=False)
+
+
+def _band_buckets(scope, signature):
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        yield hashlib.blake2b(f"{scope}|{band}|{rows}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+class PromptIndex:
+    """
+    Önbellek anahtarı → (kapsam, prompt, imza) indeksi. Kayıtlar SQLite'ta kalıcıdır, açılışta
+    belleğe yüklenir; sorgular yalnızca bellekteki LSH kovalarını kullanır.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS prompt_index (
+                key TEXT PRIMARY KEY,
+                scope TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                signature TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT key, scope, prompt, signature FROM prompt_index ORDER BY created_at DESC LIMIT ?", (max_entries,)
+        ).fetchall()
+        for key, scope, prompt, signature in reversed(rows):
+            self._insert_locked(key, scope, prompt, json.loads(signature))
+
+    def _insert_locked(self, key, scope, prompt, signature):
+        buckets = list(_band_buckets(scope, signature))
+        self._entries[key] = (scope, prompt, signature, buckets)
+        self._entries.move_to_end(key)
+        for bucket in buckets:
+            self._buckets.setdefault(bucket, set()).add(key)
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket in entry[3]:
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def add(self, key, scope, prompt):
+        signature = minhash_signature(shingles(prompt))
+        with self._lock:
+            self._remove_locked(key)
+            self._insert_locked(key, scope, prompt, signature)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                evicted.append((oldest,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompt_index (key, scope, prompt, signature, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, scope, prompt, json.dumps(signature), time.time()),
+            )
+            if evicted:
+                self._conn.executemany("DELETE FROM prompt_index WHERE key = ?", evicted)
+            self._conn.commit()
+
+    def remove(self, key):
+        with self._lock:
+            self._remove_locked(key)
+            self._conn.execute("DELETE FROM prompt_index WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def query(self, scope, prompt, threshold=OFFER_THRESHOLD, limit=3):
+        """Kapsamı aynı ve benzerliği eşiğin üstünde olan kayıtları [(benzerlik, anahtar, prompt)] olarak döndürür."""
+        signature = minhash_signature(shingles(prompt))
+        matches = []
+        with self._lock:
+            candidates = set()
+            for bucket in _band_buckets(scope, signature):
+                candidates.update(self._buckets.get(bucket, ()))
+            for key in candidates:
+                entry_scope, entry_prompt, entry_signature, _buckets = self._entries[key]
+                if entry_scope != scope:
+                    continue
+                similarity = signature_similarity(signature, entry_signature)
+                if similarity >= threshold:
+                    matches.append((similarity, key, entry_prompt))
+        matches.sort(reverse=True)
+        return matches[:limit]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
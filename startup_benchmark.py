@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from bench_fakes import LatencyProfile, StubBackend
+
+# --- Başlangıç (Soğuk Açılış) Benchmark'ı ---
+# Her ölçüm yeni bir Python sürecinde yapılır; böylece modül önbelleği ölçümü etkilemez.
+#   import: "import generation" süresi (app.py ve batch_cli.py'nin ortak bağımlılığı)
+#   ilk çizim: app.py'nin Streamlit AppTest ile ilk tam çalıştırılması (streamlit zaten yüklü
+#              kabul edilir; sunucuda da öyledir)
+# Ayrıca "python -X importtime" çıktısından en pahalı paketler listelenir. --root ile
+# başka bir çalışma ağacı (ör. önceki commit'in git worktree'si) ölçülebilir; sonuçlar --json ile
+# kaydedilir. Sahte API anahtarları kullanılır, yerel depolar geçici bir dizine yazılır.
+# Ölçüm ağa çıkmaz: istatistik backend'i yerel sahte backend'e yönlendirilir, model ısıtması
+# kapatılır ve diğer tüm HTTP(S) trafiği kapalı bir yerel proxy'ye gönderilerek hemen başarısız
+# olur (BACKEND_API_URL/MODEL_WARM_UP'ı tanımayan eski sürümler ölçülürken de).
+#
+#   python startup_benchmark.py --runs 5
+#   git worktree add /tmp/onceki HEAD~1 && python startup_benchmark.py --root /tmp/onceki --json onceki.json
+
+# Kapalı bir yerel port; sağlayıcı SDK'ları ve requests proxy ayarına uyduğundan istekler makineden çıkmaz
+BLACKHOLE_PROXY = "http://127.0.0.1:9"
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+import generation
+print(time.perf_counter() - started)
+"""
+
+FIRST_PAINT_SNIPPET = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300).run()
+elapsed = time.perf_counter() - started
+if at.exception:
+    sys.exit("Uygulama hatası: " + str(at.exception[0].value))
+print(elapsed)
+"""
+
+
+def run_python(args, root, work_dir, backend_url):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    env["GOOGLE_API_KEY"] = "startup-benchmark"
+    env["OPENAI_API_KEY"] = "startup-benchmark"
+    env["BACKEND_API_URL"] = backend_url
+    env["MODEL_WARM_UP"] = "0"
+    for name in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        env[name] = BLACKHOLE_PROXY
+    env["NO_PROXY"] = env["no_proxy"] = "127.0.0.1,localhost"
+    # Varsayılan .cache/.assets yolları göreli olduğundan süreç geçici dizinde çalıştırılır
+    completed = subprocess.run(
+        [sys.executable, *args], cwd=work_dir, env=env, capture_output=True, text=True, check=False
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip() or completed.stdout.strip())
+    return completed
+
+
+def measure(snippet, root, work_dir, backend_url, runs, extra_args=()):
+    samples = [float(run_python(["-c", snippet, *extra_args], root, work_dir, backend_url).stdout.strip().splitlines()[-1])
+               for _ in range(runs)]
+    return {"median_ms": statistics.median(samples) * 1000, "min_ms": min(samples) * 1000, "runs": len(samples)}
+
+
+def top_imports(root, work_dir, backend_url, limit):
+    """"import generation" sırasında en uzun süren paketler (paketin ilk yüklenmesinin kümülatif süresi, ms)."""
+    stderr = run_python(["-X", "importtime", "-c", "import generation"], root, work_dir, backend_url).stderr
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        # generation'ın kendisi ve yorumlayıcı açılışındaki modüller listelenmez
+        if package not in ("generation", "site", "encodings"):
+            packages[package] = max(packages.get(package, 0), int(cumulative_us) / 1000)
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{"module": package, "cumulative_ms": cumulative_ms} for package, cumulative_ms in ranked]
+
+
+def print_report(results):
+    print(f"Çalışma ağacı: {results['root']}")
+    print(f"import generation: {results['import']['median_ms']:.0f} ms (en iyi {results['import']['min_ms']:.0f} ms)")
+    first_paint = results["first_paint"]
+    if first_paint:
+        print(f"İlk çizim (app.py): {first_paint['median_ms']:.0f} ms (en iyi {first_paint['min_ms']:.0f} ms)")
+    print("En pahalı import'lar:")
+    for row in results["top_imports"]:
+        print(f"  {row['module']:<30}{row['cumulative_ms']:>10.1f} ms")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Soğuk açılış: import ve ilk sayfa çizimi süreleri.")
+    parser.add_argument("--root", default=os.path.dirname(os.path.abspath(__file__)), help="Ölçülecek çalışma ağacı")
+    parser.add_argument("--runs", type=int, default=5, help="Ölçüm başına süreç sayısı (medyan raporlanır)")
+    parser.add_argument("--top", type=int, default=10, help="Listelenecek import sayısı")
+    parser.add_argument("--skip-first-paint", action="store_true", help="AppTest ile ilk çizim ölçümünü atla")
+    parser.add_argument("--json", help="Sonuçların yazılacağı JSON dosyası")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    root = os.path.abspath(args.root)
+    runs = max(1, args.runs)
+    backend = StubBackend(LatencyProfile(mean_seconds=0.01, jitter_seconds=0.0, seed=0)).start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="premiumhome-startup-") as work_dir:
+            results = {
+                "root": root,
+                "import": measure(IMPORT_SNIPPET, root, work_dir, backend.base_url, runs),
+                "first_paint": None if args.skip_first_paint else measure(
+                    FIRST_PAINT_SNIPPET, root, work_dir, backend.base_url, runs, extra_args=(os.path.join(root, "app.py"),)
+                ),
+                "top_imports": top_imports(root, work_dir, backend.base_url, args.top),
+            }
+    except RuntimeError as e:
+        print(f"Hata: Ölçüm başarısız: {e}", file=sys.stderr)
+        return 1
+    finally:
+        backend.stop()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
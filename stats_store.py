@@ -0,0 +1,158 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# --- Sosyal Medya İstatistikleri Zaman Serisi Deposu ---
+# Backend'den çekilen her istatistik anlık görüntüsü zaman damgasıyla SQLite'a yazılır.
+# Ham yanıt bir tabloda, sayısal metrikler ise (metrik, zaman) indeksli dar bir tabloda
+# tutulur; böylece takipçi/görüntülenme trendleri backend'e gitmeden hızlıca sorgulanır.
+
+DEFAULT_STATS_PATH = os.environ.get("STATS_STORE_PATH", os.path.join(".cache", "social_stats.sqlite3"))
+
+# (metrik adı, yanıt içindeki yol)
+TRACKED_METRICS = {
+    "facebook_page_likes": ("facebook_instagram_stats", "facebook_page", "page_likes"),
+    "facebook_page_followers": ("facebook_instagram_stats", "facebook_page", "page_followers"),
+    "instagram_followers": ("facebook_instagram_stats", "instagram_profile", "followers_count"),
+    "instagram_media_count": ("facebook_instagram_stats", "instagram_profile", "media_count"),
+    "youtube_subscribers": ("youtube_stats", "channel", "subscriber_count"),
+    "youtube_views": ("youtube_stats", "channel", "view_count"),
+    "youtube_video_count": ("youtube_stats", "channel", "video_count"),
+}
+
+
+def extract_metrics(payload):
+    """Yanıttan sayısal metrikleri çıkarır; bulunamayan veya sayısal olmayanları atlar."""
+    metrics = {}
+    for name, path in TRACKED_METRICS.items():
+        value = payload
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        try:
+            metrics[name] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return metrics
+
+
+class StatsStore:
+    """İstatistik anlık görüntüleri için zaman serisi deposu."""
+
+    def __init__(self, path=DEFAULT_STATS_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS stats_snapshots (
+                ts REAL PRIMARY KEY,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stats_metrics (
+                metric TEXT NOT NULL,
+                ts REAL NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (metric, ts)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def record_snapshot(self, payload, ts=None):
+        """Başarılı bir backend yanıtını ve içindeki metrikleri kaydeder; zaman damgasını döndürür."""
+        ts = ts or time.time()
+        metrics = extract_metrics(payload)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stats_snapshots (ts, payload) VALUES (?, ?)",
+                (ts, json.dumps(payload, ensure_ascii=False)),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stats_metrics (metric, ts, value) VALUES (?, ?, ?)",
+                [(name, ts, value) for name, value in metrics.items()],
+            )
+            self._conn.commit()
+        return ts
+
+    def latest_snapshot(self):
+        """(zaman_damgası, yanıt) döndürür; kayıt yoksa (None, None)."""
+        with self._lock:
+            row = self._conn.execute("SELECT ts, payload FROM stats_snapshots ORDER BY ts DESC LIMIT 1").fetchone()
+        if row is None:
+            return None, None
+        return row[0], json.loads(row[1])
+
+    def trend(self, metrics, since=None):
+        """
+        Verilen metrikler için {metrik: [(zaman, değer), ...]} döndürür (zamana göre artan).
+        since verilirse yalnızca o zamandan sonraki noktalar gelir.
+        """
+        since = since or 0
+        result = {metric: [] for metric in metrics}
+        with self._lock:
+            for metric in metrics:
+                result[metric] = self._conn.execute(
+                    "SELECT ts, value FROM stats_metrics WHERE metric = ? AND ts >= ? ORDER BY ts",
+                    (metric, since),
+                ).fetchall()
+        return result
+
+
+class StatsRefresher:
+    """
+    Eskiyken-yenile (stale-while-revalidate) için arka plan yenileyici. Sayfa son kaydı hemen
+    gösterir; refresh() çağrıldığında yanıt arka planda çekilip depoya yazılır. Aynı anda
+    yalnızca bir yenileme çalışır. Başarısız bir yenilemeden sonra refresh_if_stale,
+    retry_seconds dolana kadar yeni deneme başlatmaz.
+    """
+
+    def __init__(self, store, fetch_stats, retry_seconds=60):
+        self.store = store
+        self.fetch_stats = fetch_stats
+        self.retry_seconds = retry_seconds
+        self.last_error = None
+        self.last_error_at = None
+        self.last_started_at = None
+        self._running = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_refreshing(self):
+        return self._running.is_set()
+
+    def refresh(self):
+        """Arka planda yenileme başlatır; zaten çalışıyorsa False döndürür."""
+        with self._lock:
+            if self._running.is_set():
+                return False
+            self._running.set()
+            self.last_started_at = time.time()
+        threading.Thread(target=self._run, name="social-stats-refresh", daemon=True).start()
+        return True
+
+    def refresh_if_stale(self, max_age_seconds):
+        # Backend hata veriyorsa her sayfa çiziminde yeniden denenmez
+        if self.last_error and time.time() - self.last_error_at < self.retry_seconds:
+            return False
+        ts, _payload = self.store.latest_snapshot()
+        if ts is None or time.time() - ts > max_age_seconds:
+            return self.refresh()
+        return False
+
+    def _run(self):
+        try:
+            payload = self.fetch_stats()
+            if not isinstance(payload, dict) or payload.get("error"):
+                raise ValueError(payload.get("error") if isinstance(payload, dict) else "Geçersiz yanıt")
+            self.store.record_snapshot(payload)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            self.last_error_at = time.time()
+        finally:
+            self._running.clear()
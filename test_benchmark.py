@@ -0,0 +1,36 @@
+import glob
+import os
+import re
+import subprocess
+import sys
+
+from benchmark import STORE_PATH_ENV
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Kalıcı depo yolunu ortamdan okuyan tanımlar (ör. DEFAULT_ARCHIVE_PATH = os.environ.get("CONTENT_ARCHIVE_PATH", ...))
+STORE_ENV_PATTERN = re.compile(r'os\.environ\.get\(\s*"([A-Z0-9_]+_(?:PATH|DIR))"')
+
+
+def test_every_store_path_is_redirected():
+    """Uygulamanın ortamdan yol okuyan her deposu benchmark'ta geçici dizine yönlendirilmeli."""
+    store_envs = set()
+    for path in glob.glob(os.path.join(ROOT, "*.py")):
+        with open(path, encoding="utf-8") as f:
+            store_envs.update(STORE_ENV_PATTERN.findall(f.read()))
+    assert store_envs, "Depo yolu tanımı bulunamadı; STORE_ENV_PATTERN güncel mi?"
+    assert store_envs <= set(STORE_PATH_ENV), f"Benchmark'ta yönlendirilmeyen depolar: {sorted(store_envs - set(STORE_PATH_ENV))}"
+
+
+def test_benchmark_writes_nothing_to_working_directory(tmp_path):
+    """Benchmark çalıştığı dizinde .cache/.assets oluşturmamalı (varsayılan yollar göreli)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    for env_name in STORE_PATH_ENV:
+        env.pop(env_name, None)
+    completed = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "benchmark.py"), "--scenarios", "text,format_all,image,stats,video",
+         "--requests", "4", "--concurrency", "2", "--unique-prompts", "2", "--latency", "0.001", "--jitter", "0",
+         "--cold-start", "0"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=300, check=False,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert sorted(os.listdir(tmp_path)) == []
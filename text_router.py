@@ -0,0 +1,311 @@
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from http_client import CircuitBreaker
+
+# --- Metin Üretimi Yönlendirici (Hedged İstek + Sağlayıcı Yedekleme) ---
+# Metin üretimi sıralı rotalardan (sağlayıcı/model) geçer. Birincil rota kendi p95 gecikmesi
+# içinde yanıt vermezse sıradaki rotaya ikinci (hedged) bir istek gönderilir; ilk başarılı yanıt
+# kullanılır, diğer istek henüz başlamadıysa iptal edilir, başladıysa sonucu yok sayılır.
+# Hata veren rota hemen sıradakine devreder; ardışık hatalarda rotanın devre kesicisi açılır ve
+# rota reset süresi boyunca atlanır. Hedged istek yalnızca yavaş kuyrukta (~%5) gönderildiği için
+# ek maliyet sınırlıdır. Akışlı üretimde (generate_stream) aynı eşik ilk parça için uygulanır.
+
+HEDGE_ENABLED = os.environ.get("TEXT_HEDGE_ENABLED", "1") not in ("0", "false", "False")
+HEDGE_PERCENTILE = float(os.environ.get("TEXT_HEDGE_PERCENTILE", "95"))
+# Yeterli ölçüm birikene kadar kullanılacak bekleme ve bekleme sınırları (sn)
+HEDGE_MIN_SAMPLES = int(os.environ.get("TEXT_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_DEFAULT_DELAY = float(os.environ.get("TEXT_HEDGE_DEFAULT_DELAY", "8"))
+HEDGE_MIN_DELAY = float(os.environ.get("TEXT_HEDGE_MIN_DELAY", "1"))
+HEDGE_MAX_DELAY = float(os.environ.get("TEXT_HEDGE_MAX_DELAY", "30"))
+# Aynı istek için aynı anda en fazla kaç rotaya gidilir
+HEDGE_MAX_IN_FLIGHT = int(os.environ.get("TEXT_HEDGE_MAX_IN_FLIGHT", "2"))
+LATENCY_WINDOW = int(os.environ.get("TEXT_ROUTE_LATENCY_WINDOW", "200"))
+ROUTE_FAILURE_THRESHOLD = int(os.environ.get("TEXT_ROUTE_FAILURE_THRESHOLD", "3"))
+ROUTE_RESET_SECONDS = float(os.environ.get("TEXT_ROUTE_RESET_SECONDS", "30"))
+ROUTER_MAX_WORKERS = int(os.environ.get("TEXT_ROUTER_MAX_WORKERS", "32"))
+
+
+class NoRouteAvailableError(Exception):
+    """Tüm rotaların devre kesicisi açıkken fırlatılır."""
+
+
+class Route:
+    """
+    Tek bir metin üretim rotası. call(prompt, operation) metni döndürür veya istisna fırlatır;
+    varsa stream(prompt, operation) metin parçaları üretir. Başarılı çağrıların süreleri hedged
+    istek eşiği için tutulur.
+    """
+
+    def __init__(self, name, call, stream=None, failure_threshold=ROUTE_FAILURE_THRESHOLD,
+                 reset_seconds=ROUTE_RESET_SECONDS, latency_window=LATENCY_WINDOW):
+        self.name = name
+        self.call = call
+        self.stream = stream
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self.wins = 0
+        self.errors = 0
+        self.hedged = 0
+
+    def record_success(self, seconds):
+        self.breaker.record_success()
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def record_failure(self):
+        self.breaker.record_failure()
+        with self._lock:
+            self.errors += 1
+
+    def latency_percentile(self, percent=HEDGE_PERCENTILE):
+        """Son başarılı çağrıların yüzdelik gecikmesi (sn); ölçüm yoksa None."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, max(0, math.ceil(percent / 100 * len(samples)) - 1))]
+
+    def hedge_delay(self):
+        """Bu rotaya istek gönderildikten sonra sıradaki rotaya geçmeden önce beklenecek süre (sn)."""
+        with self._lock:
+            sample_count = len(self._latencies)
+        if sample_count < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, self.latency_percentile()))
+
+    def available(self):
+        """Devre kesici kapalı mı? (yarı açık denemeyi ayırmaz)"""
+        return self.breaker.state == "closed"
+
+
+class TextRouter:
+    """Rotaları sırayla, p95 eşiğinde hedged istekle ve hata durumunda yedeğe geçerek çalıştırır."""
+
+    def __init__(self, routes, max_workers=ROUTER_MAX_WORKERS):
+        if not routes:
+            raise ValueError("En az bir metin üretim rotası gerekli.")
+        self.routes = list(routes)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="text-route")
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.fallbacks = 0
+
+    @property
+    def primary(self):
+        return self.routes[0]
+
+    def route(self, name):
+        return next((route for route in self.routes if route.name == name), None)
+
+    def generate(self, prompt, operation="text", skip=()):
+        """
+        Prompt'u rotalar üzerinden üretir; ilk başarılı yanıtı (metin, kazanan_rota) olarak döndürür.
+        skip'teki rota adları denenmez. Tüm denemeler başarısız olursa son hata fırlatılır.
+        """
+        with self._lock:
+            self.requests += 1
+        remaining = [route for route in self.routes if route.name not in skip]
+        pending = {}
+        errors = []
+        hedge_at = None
+
+        def launch():
+            nonlocal hedge_at
+            while remaining:
+                route = remaining.pop(0)
+                # Açık devre kesicili rota atlanır; yarı açıksa tek bir deneme isteğine izin verilir
+                if route.breaker.allow_request():
+                    pending[self._executor.submit(self._attempt, route, prompt, operation)] = route
+                    hedge_at = time.monotonic() + route.hedge_delay()
+                    return route
+            return None
+
+        if launch() is None:
+            raise NoRouteAvailableError("Tüm metin üretim rotaları geçici olarak devre dışı (devre kesici açık).")
+        while pending:
+            timeout = None
+            if HEDGE_ENABLED and remaining and len(pending) < HEDGE_MAX_IN_FLIGHT:
+                timeout = max(0.0, hedge_at - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                route = launch()
+                if route is not None:
+                    with self._lock:
+                        route.hedged += 1
+                        self.hedges += 1
+                continue
+            for future in done:
+                route = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    if launch() is not None:
+                        with self._lock:
+                            self.fallbacks += 1
+                    continue
+                self._cancel(pending)
+                with self._lock:
+                    route.wins += 1
+                return text, route
+        raise errors[-1]
+
+    def generate_stream(self, prompt, on_chunk, operation="text"):
+        """
+        Prompt'u birincil rotadan akışlı üretir; on_chunk(o_ana_kadarki_metin) çağıran thread'de
+        çağrılır. İlk parça birincil rotanın hedge eşiğinde gelmezse veya akış ilk parçadan önce
+        hata verirse sıradaki rotaya tek parça istek gönderilir; önce ilk parçasını veren akış ya da
+        önce biten yedek yanıt kullanılır. (metin, kazanan_rota, ilk_parça_sn) döndürür; yanıt tek
+        parça geldiyse ilk parça süresi None'dır.
+        """
+        primary = self.primary
+        if primary.stream is None or not primary.breaker.allow_request():
+            # Birincil rota akış desteklemiyorsa doğrudan, devre kesicisi açıksa onu atlayarak üretilir
+            text, route = self.generate(prompt, operation, skip=() if primary.stream is None else (primary.name,))
+            on_chunk(text)
+            return text, route, None
+
+        with self._lock:
+            self.requests += 1
+        started = time.perf_counter()
+        events = queue.Queue()
+        abandoned = threading.Event()
+        self._executor.submit(self._attempt_stream, primary, prompt, operation, events, abandoned)
+        remaining = self.routes[1:]
+        pending = {}
+        errors = []
+        parts = []
+        ttft = None
+        streaming = True
+        hedge_at = time.monotonic() + primary.hedge_delay()
+
+        def launch():
+            while remaining:
+                route = remaining.pop(0)
+                if route.breaker.allow_request():
+                    future = self._executor.submit(self._attempt, route, prompt, operation)
+                    pending[future] = route
+                    future.add_done_callback(lambda done, route=route: events.put(("response", route, done)))
+                    return route
+            return None
+
+        try:
+            while streaming or pending:
+                timeout = None
+                if HEDGE_ENABLED and ttft is None and streaming and not pending and remaining:
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                try:
+                    event, payload, future = events.get(timeout=timeout)
+                except queue.Empty:
+                    route = launch()
+                    if route is not None:
+                        with self._lock:
+                            route.hedged += 1
+                            self.hedges += 1
+                    continue
+                if event == "chunk":
+                    if ttft is None:
+                        # Akış kazandı: yedek yanıt beklenmez, başlamadıysa iptal edilir
+                        ttft = time.perf_counter() - started
+                        self._cancel(pending)
+                        pending.clear()
+                    parts.append(payload)
+                    on_chunk("".join(parts))
+                elif event == "done":
+                    self._cancel(pending)
+                    with self._lock:
+                        primary.wins += 1
+                    return "".join(parts), primary, ttft
+                elif event == "error":
+                    streaming = False
+                    if parts:
+                        raise payload  # Kısmi metin yedek yanıtla birleştirilemez
+                    errors.append(payload)
+                    if not pending and launch() is not None:
+                        with self._lock:
+                            self.fallbacks += 1
+                elif future in pending:
+                    route = pending.pop(future)
+                    try:
+                        text = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        if not streaming and launch() is not None:
+                            with self._lock:
+                                self.fallbacks += 1
+                        continue
+                    with self._lock:
+                        route.wins += 1
+                    on_chunk(text)
+                    return text, route, None
+            raise errors[-1]
+        finally:
+            # Kazanan belli olduysa veya çağıran vazgeçtiyse (ör. on_chunk istisnası) akış okunmaya devam etmez
+            abandoned.set()
+
+    def _attempt_stream(self, route, prompt, operation, events, abandoned):
+        """Akışı worker thread'de okur; parçaları ve sonucu ("chunk"/"done"/"error") kuyruğa yazar."""
+        started = time.perf_counter()
+        try:
+            stream = route.stream(prompt, operation)
+            try:
+                for chunk in stream:
+                    if abandoned.is_set():
+                        break  # Yedek yanıt kullanıldı; akışın geri kalanı okunmaz
+                    if chunk:
+                        events.put(("chunk", chunk, None))
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+        except Exception as e:
+            route.record_failure()
+            events.put(("error", e, None))
+            return
+        # Yedeğe kaybeden akışın süresi de kaydedilir (generate'teki gibi p95 yalnızca hızlıları görmesin)
+        route.record_success(time.perf_counter() - started)
+        events.put(("done", None, None))
+
+    def _attempt(self, route, prompt, operation):
+        started = time.perf_counter()
+        try:
+            text = route.call(prompt, operation)
+        except Exception:
+            route.record_failure()
+            raise
+        # Kaybeden isteklerin süreleri de kaydedilir; aksi halde p95 yalnızca hızlı yanıtları görür
+        route.record_success(time.perf_counter() - started)
+        return text
+
+    @staticmethod
+    def _cancel(pending):
+        # Başlamış bir sağlayıcı çağrısı durdurulamaz; sonucu yok sayılır, ölçümleri yine kaydedilir
+        for future, route in pending.items():
+            if future.cancel() and route.breaker.state != "closed":
+                # Hiç gönderilmeyen yarı açık deneme isteği kesicinin kilitli kalmasına yol açmasın
+                route.breaker.release_probe()
+
+    def stats(self):
+        with self._lock:
+            totals = {"requests": self.requests, "hedges": self.hedges, "fallbacks": self.fallbacks}
+        totals["routes"] = [
+            {
+                "name": route.name,
+                "state": route.breaker.state,
+                "wins": route.wins,
+                "errors": route.errors,
+                "hedged": route.hedged,
+                "p95_seconds": route.latency_percentile(),
+                "hedge_delay_seconds": route.hedge_delay(),
+            }
+            for route in self.routes
+        ]
+        return totals
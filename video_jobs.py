@@ -0,0 +1,212 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+# --- Video İş Takibi ---
+# Backend'e gönderilen video oluşturma isteklerini yerel bir kayıt defterinde (SQLite) tutar
+# ve arka planda status_url'leri uyarlamalı geri çekilmeyle yoklar. Streamlit script
+# thread'i hiçbir zaman beklemez; arayüz yalnızca kayıt defterini okur.
+
+DEFAULT_JOBS_PATH = os.environ.get("VIDEO_JOBS_PATH", os.path.join(".cache", "video_jobs.sqlite3"))
+POLL_MIN_INTERVAL = float(os.environ.get("VIDEO_POLL_MIN_INTERVAL", "2"))
+POLL_MAX_INTERVAL = float(os.environ.get("VIDEO_POLL_MAX_INTERVAL", "60"))
+POLL_BACKOFF_FACTOR = float(os.environ.get("VIDEO_POLL_BACKOFF_FACTOR", "1.5"))
+MAX_POLL_ERRORS = int(os.environ.get("VIDEO_MAX_POLL_ERRORS", "10"))
+POLL_WORKERS = int(os.environ.get("VIDEO_POLL_WORKERS", "4"))
+
+DONE_STATUSES = {"completed", "complete", "done", "succeeded", "success", "finished", "ready"}
+FAILED_STATUSES = {"failed", "failure", "error", "cancelled", "canceled", "expired"}
+TERMINAL_STATUSES = DONE_STATUSES | FAILED_STATUSES
+
+
+def parse_status_payload(payload):
+    """
+    Backend durum yanıtını ortak bir biçime çevirir: status, progress (0-100), video_url, message.
+    Alan adları backend sürümlerine göre değişebildiği için birkaç yaygın ad denenir.
+    progress/percent her zaman yüzde (0-100) kabul edilir; 0-1 arası değer yalnızca açık bir
+    kesir alanıyla (fraction/progress_fraction) gelirse yüzdeye çevrilir.
+    """
+    status = str(payload.get("status") or payload.get("state") or "pending").lower()
+    fraction = payload.get("fraction", payload.get("progress_fraction"))
+    try:
+        if fraction is not None:
+            progress = float(fraction) * 100
+        else:
+            progress = float(payload.get("progress", payload.get("percent")))
+    except (TypeError, ValueError):
+        progress = None
+    if status in DONE_STATUSES:
+        progress = 100.0
+    video_url = payload.get("video_url") or payload.get("download_url") or payload.get("url")
+    message = payload.get("message") or payload.get("error") or ""
+    return {"status": status, "progress": progress, "video_url": video_url, "message": message}
+
+
+class VideoJobRegistry:
+    """Video işlerinin kalıcı kayıt defteri (yeniden çalıştırmalar ve yeniden başlatmalar arasında korunur)."""
+
+    def __init__(self, path=DEFAULT_JOBS_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS video_jobs (
+                video_id TEXT PRIMARY KEY,
+                prompt TEXT NOT NULL,
+                status_url TEXT,
+                status TEXT NOT NULL,
+                progress REAL,
+                message TEXT,
+                video_url TEXT,
+                estimated_time TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                next_poll_at REAL NOT NULL,
+                poll_interval REAL NOT NULL,
+                poll_errors INTEGER NOT NULL DEFAULT 0,
+                last_payload TEXT
+            )
+            """
+        )
+        self._conn.commit()
+
+    def add(self, video_id, prompt, status_url, message="", estimated_time=""):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO video_jobs (video_id, prompt, status_url, status, progress, message, "
+                "estimated_time, created_at, updated_at, next_poll_at, poll_interval) "
+                "VALUES (?, ?, ?, 'submitted', 0, ?, ?, ?, ?, ?, ?)",
+                (str(video_id), prompt, status_url, message, estimated_time, now, now, now + POLL_MIN_INTERVAL, POLL_MIN_INTERVAL),
+            )
+            self._conn.commit()
+        return self.get(video_id)
+
+    def get(self, video_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM video_jobs WHERE video_id = ?", (str(video_id),)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, limit=50):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM video_jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def due(self, now=None):
+        """Yoklama zamanı gelmiş ve henüz bitmemiş işleri döndürür."""
+        now = now or time.time()
+        placeholders = ",".join("?" for _ in TERMINAL_STATUSES)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM video_jobs WHERE status NOT IN ({placeholders}) AND status_url IS NOT NULL "
+                f"AND next_poll_at <= ? ORDER BY next_poll_at",
+                (*TERMINAL_STATUSES, now),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def active_count(self):
+        placeholders = ",".join("?" for _ in TERMINAL_STATUSES)
+        with self._lock:
+            (count,) = self._conn.execute(
+                f"SELECT COUNT(*) FROM video_jobs WHERE status NOT IN ({placeholders})", tuple(TERMINAL_STATUSES)
+            ).fetchone()
+        return count
+
+    def record_poll(self, job, parsed, payload):
+        """
+        Yoklama sonucunu kaydeder. Durum/ilerleme değiştiyse aralık en aza döner, değişmediyse
+        POLL_BACKOFF_FACTOR ile büyür (uyarlamalı geri çekilme).
+        """
+        changed = parsed["status"] != job["status"] or parsed["progress"] != job["progress"]
+        interval = POLL_MIN_INTERVAL if changed else min(job["poll_interval"] * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE video_jobs SET status = ?, progress = ?, message = ?, video_url = COALESCE(?, video_url), "
+                "updated_at = ?, next_poll_at = ?, poll_interval = ?, poll_errors = 0, last_payload = ? WHERE video_id = ?",
+                (parsed["status"], parsed["progress"], parsed["message"], parsed["video_url"], now, now + interval,
+                 interval, json.dumps(payload, ensure_ascii=False, default=str), job["video_id"]),
+            )
+            self._conn.commit()
+
+    def record_error(self, job, error):
+        """Yoklama hatasını kaydeder; çok sayıda ardışık hatada iş başarısız sayılır."""
+        errors = job["poll_errors"] + 1
+        interval = min(job["poll_interval"] * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL)
+        status = "error" if errors >= MAX_POLL_ERRORS else job["status"]
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE video_jobs SET status = ?, message = ?, updated_at = ?, next_poll_at = ?, poll_interval = ?, "
+                "poll_errors = ? WHERE video_id = ?",
+                (status, f"Durum sorgulanamadı: {error}", now, now + interval, interval, errors, job["video_id"]),
+            )
+            self._conn.commit()
+
+
+class VideoJobPoller:
+    """
+    Kayıt defterindeki aktif işleri arka planda yoklayan daemon thread.
+    fetch_status(url) -> dict fonksiyonu dışarıdan verilir; böylece yerel bir sahte backend ile
+    test edilebilir.
+    """
+
+    def __init__(self, registry, fetch_status, base_url="", tick_seconds=1.0, workers=POLL_WORKERS):
+        self.registry = registry
+        self.fetch_status = fetch_status
+        self.base_url = base_url
+        self.tick_seconds = tick_seconds
+        self.workers = max(1, workers)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="video-job-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll_once(self):
+        """
+        Zamanı gelmiş tüm işleri bir kez yoklar; yoklanan iş sayısını döndürür.
+        İşler sınırlı bir havuzda eşzamanlı yoklanır; yavaş bir status_url diğerlerini bekletmez.
+        """
+        jobs = self.registry.due()
+        if len(jobs) == 1:
+            self._poll_job(jobs[0])
+        elif jobs:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs)), thread_name_prefix="video-job-poll") as executor:
+                list(executor.map(self._poll_job, jobs))
+        return len(jobs)
+
+    def _poll_job(self, job):
+        url = urljoin(self.base_url, job["status_url"])
+        try:
+            payload = self.fetch_status(url)
+            self.registry.record_poll(job, parse_status_payload(payload), payload)
+        except Exception as e:
+            self.registry.record_error(job, e)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                # Yoklayıcı thread'i tek bir hatalı kayıt yüzünden ölmemeli
+                pass
+            self._stop.wait(self.tick_seconds)